@@ -54,14 +54,25 @@ Versiyon: 2.1 (Düzeltilmiş)
 """
 
 from mesa import Agent, Model
-from mesa.datacollection import DataCollector
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
-import random
+import heapq
+import io
+import json
+import logging
 import os
+import pickle
 import sqlite3
 from datetime import datetime
+from bisect import bisect_left
+from functools import lru_cache
+
+# Konsol çıktısı (banner, ilerleme, uyarılar) bu logger üzerinden verilir.
+# Kütüphane olarak kullanıldığında INFO mesajları yapılandırma yapılmadıkça
+# görünmez; uyarılar Python'un varsayılan işleyicisiyle yine stderr'e düşer.
+# CLI logging.basicConfig ile açar (--quiet: yalnızca uyarılar).
+logger = logging.getLogger("tr_zero")
 
 # Latin Hypercube Sampling için scipy (McKay et al. 1979)
 try:
@@ -69,8 +80,8 @@ try:
     LHS_AVAILABLE = True
 except ImportError:
     LHS_AVAILABLE = False
-    print("⚠️ scipy.stats.qmc yüklenemedi. Rastgele örnekleme kullanılacak.")
-    print("   Kurulum: pip install scipy")
+    logger.warning("⚠️ scipy.stats.qmc yüklenemedi. Rastgele örnekleme kullanılacak.")
+    logger.warning("   Kurulum: pip install scipy")
 
 # --- YENİ MODÜL ENTEGRASYONU (v4.5) ---
 try:
@@ -85,7 +96,7 @@ except ImportError:
         MODULES_AVAILABLE = True
     except ImportError:
         MODULES_AVAILABLE = False
-        print("⚠️ Enerji/Ekonomi modülleri yüklenemedi. Eskisi kullanılacak.")
+        logger.warning("⚠️ Enerji/Ekonomi modülleri yüklenemedi. Eskisi kullanılacak.")
 
 # =============================================================================
 # REVENUE RECYCLING SENARYOLARI (GELİR GERİ DÖNÜŞÜ)
@@ -113,7 +124,7 @@ try:
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
 except OSError as e:
-    print(f"⚠️ Klasör oluşturulamadı: {e}")
+    logger.warning(f"⚠️ Klasör oluşturulamadı: {e}")
     OUTPUT_DIR = SCRIPT_DIR
 
 
@@ -179,20 +190,20 @@ def load_ai_baseline():
             with open(ai_baseline_path, 'r', encoding='utf-8') as f:
                 baseline = json.load(f)
             
-            print("✅ AI Baseline yüklendi:")
-            print(f"   ├── Kaynak: {ai_baseline_path}")
-            print(f"   ├── Model R²: {baseline.get('model_r2', 'N/A'):.4f}")
-            print(f"   ├── 2025 Emisyon: {baseline['simulation_params']['initial_emission_2025']:.1f} Mt")
-            print(f"   └── Önerilen Cap: {baseline['simulation_params']['suggested_ets_cap_2026']:.1f} Mt")
+            logger.info("✅ AI Baseline yüklendi:")
+            logger.info(f"   ├── Kaynak: {ai_baseline_path}")
+            logger.info(f"   ├── Model R²: {baseline.get('model_r2', 'N/A'):.4f}")
+            logger.info(f"   ├── 2025 Emisyon: {baseline['simulation_params']['initial_emission_2025']:.1f} Mt")
+            logger.info(f"   └── Önerilen Cap: {baseline['simulation_params']['suggested_ets_cap_2026']:.1f} Mt")
             
             return baseline
             
         except Exception as e:
-            print(f"⚠️ AI Baseline yüklenemedi: {e}")
+            logger.warning(f"⚠️ AI Baseline yüklenemedi: {e}")
             return None
     else:
-        print("ℹ️ AI Baseline bulunamadı (output/ai_baseline.json)")
-        print("   Oluşturmak için: python src/ai_tahmin_v2.py")
+        logger.info("ℹ️ AI Baseline bulunamadı (output/ai_baseline.json)")
+        logger.info("   Oluşturmak için: python src/ai_tahmin_v2.py")
         return None
 
 
@@ -235,22 +246,22 @@ def load_facility_data():
             # ETS kapsamındaki tesisleri filtrele
             ets_tesisler = df_tesisler[df_tesisler['ETS_Kapsami'] == 'Evet']
             
-            print(f"✅ Tesis listesi yüklendi:")
-            print(f"   ├── Toplam tesis: {len(df_tesisler)}")
-            print(f"   ├── ETS kapsamında: {len(ets_tesisler)}")
-            print(f"   ├── Toplam kapasite: {df_tesisler['Kapasite_MW'].sum():,.0f} MW")
-            print(f"   └── Toplam emisyon: {df_tesisler['Yillik_Emisyon_tCO2'].sum()/1e6:.1f} Mt CO₂/yıl")
+            logger.info(f"✅ Tesis listesi yüklendi:")
+            logger.info(f"   ├── Toplam tesis: {len(df_tesisler)}")
+            logger.info(f"   ├── ETS kapsamında: {len(ets_tesisler)}")
+            logger.info(f"   ├── Toplam kapasite: {df_tesisler['Kapasite_MW'].sum():,.0f} MW")
+            logger.info(f"   └── Toplam emisyon: {df_tesisler['Yillik_Emisyon_tCO2'].sum()/1e6:.1f} Mt CO₂/yıl")
             
             conn.close()
             return df_tesisler
         else:
-            print("ℹ️ Tesisler tablosu bulunamadı")
-            print("   Oluşturmak için: python src/database_setup_v2.py")
+            logger.info("ℹ️ Tesisler tablosu bulunamadı")
+            logger.info("   Oluşturmak için: python src/database_setup_v2.py")
             conn.close()
             return pd.DataFrame()
             
     except Exception as e:
-        print(f"⚠️ Tesis verisi yüklenemedi: {e}")
+        logger.warning(f"⚠️ Tesis verisi yüklenemedi: {e}")
         return pd.DataFrame()
 
 
@@ -285,14 +296,135 @@ def load_province_data():
         df_iller = pd.read_sql("SELECT * FROM il_katsayilari", conn)
         conn.close()
         
-        print(f"✅ İl katsayıları yüklendi: {len(df_iller)} il/bölge")
+        logger.info(f"✅ İl katsayıları yüklendi: {len(df_iller)} il/bölge")
         
         return df_iller
         
     except Exception as e:
-        print(f"⚠️ İl verisi yüklenemedi: {e}")
+        logger.warning(f"⚠️ İl verisi yüklenemedi: {e}")
         return pd.DataFrame()
 
+
+# =============================================================================
+# PAYLAŞILAN SİMÜLASYON GİRDİLERİ
+# =============================================================================
+
+def _salt_okunur_cerceve(df):
+    """Sayısal sütunları yazmaya kapalı dizilerle yeniden kurulan DataFrame."""
+    sutunlar = {}
+    for ad in df.columns:
+        if df[ad].dtype.kind in "biufcmM":
+            dizi = df[ad].to_numpy(copy=True)
+            dizi.setflags(write=False)
+            sutunlar[ad] = dizi
+        else:
+            sutunlar[ad] = df[ad]
+    return pd.DataFrame(sutunlar, index=df.index, columns=df.columns, copy=False)
+
+
+class SimulationInputs:
+    """
+    Model koşularının paylaştığı, bir kez yüklenen salt okunur girdiler.
+    
+    Her TurkiyeETSModel'in baseline JSON'unu okuması, SQLite'tan tesis ve
+    il tablolarını çekmesi, dispatch maliyet tablosunu kurması ve Leontief
+    tersini alması yerine bunlar süreç başına bir kez hazırlanır. Monte
+    Carlo işçileri SimulationInputs.varsayilan() ile kendi süreçlerinde bir
+    kez yükler; nesne pickle edilebilir olduğundan havuza da aktarılabilir.
+    
+    Alanlar:
+    --------
+    baseline : dict veya None
+        AI baseline (output/ai_baseline.json)
+    tesisler : pd.DataFrame
+        tesisler tablosu (yoksa örnek santral)
+    il_katsayilari : dict
+        {bölge: {'enerji', 'sanayi', 'tarim'}} (veritabani_kullan=True için)
+    dispatch : EnerjiDispatchModulu veya None
+        Karbon fiyatı 0'da kurulmuş merit-order şablonu; modeller
+        dispatch_kopyasi() ile kendi kopyasını alır
+    io_model : InputOutputModel veya None
+        Leontief tersi hesaplanmış, tüm modellerce paylaşılan I-O modeli
+    
+    Alanlar yeniden atanamaz; tabloların sayısal sütunları ve I-O dizileri
+    yerinde yazmaya kapalıdır (ValueError). Modeller tablolardan türettikleri
+    kopyalar üzerinde çalışır.
+    """
+    
+    def __init__(self, baseline=None, tesisler=None, il_katsayilari=None,
+                 dispatch=None, io_model=None):
+        self.baseline = baseline
+        self.tesisler = _salt_okunur_cerceve(tesisler if tesisler is not None else pd.DataFrame())
+        self.il_katsayilari = il_katsayilari or {}
+        self.dispatch = dispatch
+        if dispatch is not None:
+            dispatch.santraller = _salt_okunur_cerceve(dispatch.santraller)
+        self.io_model = io_model
+        if io_model is not None:
+            for dizi in (io_model.A, io_model.L, io_model.uretim_carpanlari,
+                         io_model.gelir_carpanlari, io_model.istihdam_carpanlari):
+                dizi.setflags(write=False)
+        self._donduruldu = True
+    
+    def __setattr__(self, ad, deger):
+        if getattr(self, '_donduruldu', False):
+            raise AttributeError(f"❌ SimulationInputs salt okunurdur: '{ad}' değiştirilemez")
+        object.__setattr__(self, ad, deger)
+    
+    @classmethod
+    def yukle(cls, db_path=DB_PATH):
+        """Baseline, tesis ve il tablolarını diskten okuyup modülleri kurar."""
+        baseline = load_ai_baseline()
+        
+        tesisler = pd.DataFrame()
+        il_katsayilari = {}
+        if os.path.exists(db_path):
+            conn = sqlite3.connect(db_path)
+            try:
+                tesisler = pd.read_sql("SELECT * FROM tesisler", conn)
+            except Exception:
+                pass
+            try:
+                df_il = pd.read_sql("SELECT * FROM il_katsayilari", conn)
+                if not df_il.empty and 'Bolge' in df_il.columns:
+                    for _, row in df_il.iterrows():
+                        il_katsayilari[row['Bolge']] = {
+                            'enerji': row.get('Enerji_Katsayisi', 1.0),
+                            'sanayi': row.get('Sanayi_Katsayisi', 1.0),
+                            'tarim': row.get('Tarim_Katsayisi', 1.0)
+                        }
+            except Exception as e:
+                logger.warning(f"⚠️ Veritabanı yüklenemedi: {e}")
+            conn.close()
+        
+        dispatch = io_model = None
+        if MODULES_AVAILABLE:
+            # Enerji Dispatch Modülü - Santraller veritabanından veya dummy
+            df_plants = tesisler if not tesisler.empty else pd.DataFrame([
+                {"Tesis_Adi": "Ornek_Santral", "Kapasite_MW": 1000, "Yakit_Tipi": "Linyit"}
+            ])
+            dispatch = EnerjiDispatchModulu(df_plants, karbon_fiyati=0)
+            io_model = InputOutputModel()
+        
+        return cls(baseline=baseline, tesisler=tesisler, il_katsayilari=il_katsayilari,
+                   dispatch=dispatch, io_model=io_model)
+    
+    @classmethod
+    def varsayilan(cls):
+        """Süreç başına bir kez yüklenen ortak girdiler."""
+        global _VARSAYILAN_GIRDILER
+        if _VARSAYILAN_GIRDILER is None:
+            _VARSAYILAN_GIRDILER = cls.yukle()
+        return _VARSAYILAN_GIRDILER
+    
+    def dispatch_kopyasi(self):
+        """Modelin her yıl güncelleyebileceği bağımsız merit-order kopyası."""
+        return self.dispatch.kopya() if self.dispatch is not None else None
+
+
+_VARSAYILAN_GIRDILER = None
+
+
 # =============================================================================
 # SABİT DEĞERLER VE PARAMETRELER
 # =============================================================================
@@ -353,6 +485,789 @@ SEKTOR_PROFILLERI = {
     }
 }
 
+# ETS kapsamındaki tesis ajan tipleri
+TESIS_TIPLERI = ("Tesis", "IhracatciTesis")
+
+# Dizi tabanlı motorlar ve toplamlar için sektör / durum kodları
+SEKTOR_LISTESI = tuple(SEKTOR_PROFILLERI)
+SEKTOR_KODLARI = {sektor: i for i, sektor in enumerate(SEKTOR_LISTESI)}
+DURUM_KODLARI = ("Aktif", "Donusum", "Temiz", "Kapali")
+AKTIF, DONUSUM, TEMIZ, KAPALI = range(len(DURUM_KODLARI))
+
+
+# =============================================================================
+# FİNANSAL ÇEKİRDEK (NPV / ANÜİTE)
+# =============================================================================
+"""
+Tesis ve proje geliştirici kararlarında kullanılan NPV hesapları.
+
+Sabit yıllık nakit akışının bugünkü değeri kapalı formdaki anüite faktörüyle
+tek çarpıma indirgenir [Brealey et al. 2020]:
+
+    Σ_{t=1..n} C / (1+r)^t = C · (1 - (1+r)^-n) / r
+
+Faktör (oran, ömür) çifti başına bir kez hesaplanıp önbellekte tutulur.
+"""
+
+
+@lru_cache(maxsize=None)
+def annuite_faktoru(r, omur):
+    """n yıl boyunca yıllık 1$'ın r oranıyla bugünkü değeri."""
+    if r == 0:
+        return float(omur)
+    return (1 - (1 + r) ** -omur) / r
+
+
+def npv_hesapla(yatirim, yillik_nakit, r, omur):
+    """
+    NPV = -Yatırım + Yıllık Nakit × Anüite Faktörü
+    
+    Skaler veya NumPy dizileri (yayınlama ile) kabul eder.
+    """
+    return -yatirim + yillik_nakit * annuite_faktoru(r, omur)
+
+
+def mac_npv_matrisi(emisyon, efektif_fiyat, mac, potansiyel, r, omur):
+    """
+    Tesisler × MAC önlemleri için NPV matrisini toplu hesaplar.
+    
+    Parametreler:
+    -------------
+    emisyon, efektif_fiyat : (n,) dizileri - tesis emisyonu (Mt), $/ton
+    mac, potansiyel : (n, m) dizileri - önlem MAC'i ($/ton) ve azaltım oranı
+    
+    Returns:
+    --------
+    (npv, uygun) : (n, m) NPV matrisi ve MAC < efektif fiyat maskesi
+    """
+    uygun = mac < efektif_fiyat[:, None]
+    yillik_azaltim = emisyon[:, None] * potansiyel            # Mt/yıl
+    yillik_tasarruf = yillik_azaltim * efektif_fiyat[:, None] * 1e6  # $/yıl
+    # Negatif MAC = kar ediyor, yatırım maliyeti yok
+    yatirim_maliyeti = np.where(mac > 0, yillik_azaltim * np.where(uygun, mac, 0) * 1e6, 0)
+    return npv_hesapla(yatirim_maliyeti, yillik_tasarruf, r, omur), uygun
+
+
+@lru_cache(maxsize=None)
+def mac_gecis_tablosu(sektor, r, omur):
+    """
+    Bir sektör için MAC önlemi geçiş fiyatları tablosu.
+    
+    Önlem j'nin NPV'si emisyonla orantılıdır:
+        NPV_j ∝ potansiyel_j · (AF·p - max(mac_j, 0)),  yalnızca mac_j < p
+    Bu nedenle en iyi önlem yalnızca efektif fiyat p'ye bağlıdır ve ancak
+    birkaç fiyatta (mac_j eşikleri ve doğruların kesişimleri) değişir.
+    Aralıklar temsilci fiyatlarda bir kez değerlendirilir; kararda döngü
+    yerine ikili arama yapılır:
+    
+        j = kazananlar[searchsorted(kirilimlar, p, side='left')]
+    
+    Returns:
+    --------
+    (kirilimlar, kazananlar) : artan kırılım fiyatları ($/ton) ve her
+        aralığın kazanan önlem indeksi (len(kirilimlar) + 1; -1 = uygun önlem yok)
+    """
+    onlemler = list(SEKTOR_PROFILLERI[sektor].get("mac_onlemler", {}).values())
+    if not onlemler:
+        return np.empty(0), np.full(1, -1, dtype=np.int16)
+    mac = np.array([o["mac"] for o in onlemler], dtype=float)
+    potansiyel = np.array([o["potansiyel"] for o in onlemler], dtype=float)
+    af = annuite_faktoru(r, omur)
+    
+    # Aday kırılımlar: uygunluk eşikleri ve NPV doğrularının kesişimleri
+    maliyet = potansiyel * np.maximum(mac, 0)
+    adaylar = list(mac)
+    for i in range(len(onlemler)):
+        for j in range(i + 1, len(onlemler)):
+            if potansiyel[i] != potansiyel[j]:
+                adaylar.append((maliyet[i] - maliyet[j]) / (af * (potansiyel[i] - potansiyel[j])))
+    kirilimlar = np.unique(adaylar)
+    
+    # Her aralığın içinden bir temsilci fiyat
+    temsil = np.concatenate((
+        [kirilimlar[0] - 1], (kirilimlar[:-1] + kirilimlar[1:]) / 2, [kirilimlar[-1] + 1]
+    ))
+    npv, uygun = mac_npv_matrisi(
+        np.ones(temsil.size), temsil,
+        np.broadcast_to(mac, (temsil.size, mac.size)),
+        np.broadcast_to(potansiyel, (temsil.size, mac.size)), r, omur
+    )
+    npv = np.where(uygun, npv, -np.inf)
+    kazananlar = np.where(uygun.any(axis=1), np.argmax(npv, axis=1), -1).astype(np.int16)
+    
+    # Aynı kazananı paylaşan komşu aralıkları birleştir
+    degisim = kazananlar[1:] != kazananlar[:-1]
+    kirilimlar = kirilimlar[degisim]
+    kazananlar = np.concatenate(([kazananlar[0]], kazananlar[1:][degisim]))
+    kirilimlar.setflags(write=False)
+    kazananlar.setflags(write=False)
+    return kirilimlar, kazananlar
+
+
+# =============================================================================
+# İZİN PİYASASI (EMİR DEFTERİ)
+# =============================================================================
+"""
+Tesisler arası izin ticareti için tek fiyatlı çift taraflı açık artırma.
+
+Her tesis pozisyonuna göre alış veya satış emri verir:
+
+    pozisyon = ücretsiz tahsisat + izin bankası - emisyon   (Mt CO₂)
+
+Fazlası olan tesis bankadaki fazlayı taban fiyattan satar. Eksiği olan
+tesis eksiğini MAC dilimlerine böler: fiyat bir önlemin MAC'ini aşınca izin
+almak yerine azaltmayı seçeceğinden, en ucuz önlemden başlayarak dilim j'nin
+fiyat limiti mac_j'dir. Azaltılamayan kalan (Aktif olmayan tesislerde
+eksiğin tamamı) ceza fiyatından istenir [cite: EU ETS Directive, Madde 16].
+
+Emirler dizi olarak kurulur ve sıralama ile O(n log n) temizlenir; aylık
+piyasa tikinde binlerce tesis için de hızlıdır.
+
+Tam uygulamada cap'in ACIK_ARTIRMA_ORANI kadarı birincil piyasada kapalı
+zarf, tek fiyatlı açık artırmayla satılır [cite: EU Auctioning Regulation
+1031/2010]; tesisler aynı MAC alış dilimleriyle teklif verir.
+
+Denge modunda fiyat, tesislerin o fiyattaki karar kuralına göre azaltım
+sonrası toplam emisyonunu cap'e eşitleyen fiyattır (EmisyonYaniti,
+denge_fiyati); piyasa bir adım geriden gelen emisyona tepki vermez.
+"""
+
+# Tam uygulamada cap'in açık artırmayla satılan payı
+ACIK_ARTIRMA_ORANI = 0.3
+
+
+def ucretsiz_tahsisat_orani(yil):
+    """Ücretsiz tahsisat oranı: pilot dönem %100, tam uygulama %70."""
+    return 1.0 if yil < ETS_PARAMS["TAM_UYGULAMA"] else 0.7
+
+
+@lru_cache(maxsize=None)
+def sektor_mac_dilimleri():
+    """
+    Sektör × önlem MAC ($/ton) ve potansiyel tabloları; her satır MAC'e göre
+    artan sıradadır (boş hücreler: MAC = +inf, potansiyel = 0).
+    """
+    n_onlem = max(len(p["mac_onlemler"]) for p in SEKTOR_PROFILLERI.values())
+    mac = np.full((len(SEKTOR_LISTESI), n_onlem), np.inf)
+    potansiyel = np.zeros((len(SEKTOR_LISTESI), n_onlem))
+    for i, sektor in enumerate(SEKTOR_LISTESI):
+        onlemler = sorted(SEKTOR_PROFILLERI[sektor]["mac_onlemler"].values(),
+                          key=lambda o: o["mac"])
+        for j, onlem in enumerate(onlemler):
+            mac[i, j] = onlem["mac"]
+            potansiyel[i, j] = onlem["potansiyel"]
+    mac.setflags(write=False)
+    potansiyel.setflags(write=False)
+    return mac, potansiyel
+
+
+# teklif_egrileri'nin tesis alanları (TurkiyeETSModel.tesis_alanlari ile)
+TEKLIF_ALANLARI = ("emisyon", "baslangic_emisyon", "izin_bankasi", "durum", "sektor_kodu")
+
+
+def teklif_egrileri(emisyon, baslangic_emisyon, izin_bankasi, durum, sektor_kodu, yil):
+    """
+    Tesislerin alış ve satış emirlerini dizi olarak oluşturur.
+    
+    Parametreler:
+    -------------
+    emisyon, baslangic_emisyon, izin_bankasi : (n,) dizileri (Mt CO₂)
+    durum : (n,) DURUM_KODLARI indeksi - yalnızca Aktif tesis azaltım seçebilir
+    sektor_kodu : (n,) SEKTOR_KODLARI
+    
+    Returns:
+    --------
+    ((alis_sahip, alis_fiyat, alis_miktar), (satis_sahip, satis_fiyat, satis_miktar))
+        sahip: tesis indeksi (0..n-1), fiyat $/ton, miktar Mt. Taban fiyat
+        altındaki dilimler elenir, limitler tavan fiyatla sınırlanır.
+    """
+    taban, tavan = ETS_PARAMS["TABAN_FIYAT"], ETS_PARAMS["TAVAN_FIYAT"]
+    n = emisyon.size
+    pozisyon = baslangic_emisyon * ucretsiz_tahsisat_orani(yil) + izin_bankasi - emisyon
+    
+    # Satış: yalnızca bankalanmış fazla izinler
+    satis_miktar = np.minimum(np.maximum(pozisyon, 0.0), izin_bankasi)
+    satici = np.flatnonzero(satis_miktar > 0)
+    
+    # Alış: eksik, en ucuz önlemden başlayarak MAC dilimlerine bölünür
+    eksik = np.maximum(-pozisyon, 0.0)
+    mac, potansiyel = sektor_mac_dilimleri()
+    azaltim = np.where((durum == AKTIF)[:, None], emisyon[:, None] * potansiyel[sektor_kodu], 0.0)
+    kum = np.cumsum(azaltim, axis=1)
+    dilim = np.minimum(kum, eksik[:, None]) - np.minimum(kum - azaltim, eksik[:, None])
+    kalan = eksik - np.minimum(kum[:, -1], eksik)
+    
+    alis_sahip = np.concatenate((np.repeat(np.arange(n), mac.shape[1]), np.arange(n)))
+    alis_fiyat = np.concatenate((mac[sektor_kodu].ravel(),
+                                 np.full(n, float(ETS_PARAMS["CEZA_MIKTARI"]))))
+    alis_miktar = np.concatenate((dilim.ravel(), kalan))
+    gecerli = (alis_miktar > 0) & (alis_fiyat >= taban)
+    return (
+        (alis_sahip[gecerli], np.minimum(alis_fiyat[gecerli], tavan), alis_miktar[gecerli]),
+        (satici, np.full(satici.size, float(taban)), satis_miktar[satici]),
+    )
+
+
+def cift_acik_artirma(alis_fiyat, alis_miktar, satis_fiyat, satis_miktar):
+    """
+    Tek fiyatlı çift taraflı açık artırma (emir defteri eşleştirmesi), O(n log n).
+    
+    Talep T(p) = limiti p ve üstü alışların, arz A(p) = limiti p ve altı
+    satışların toplamıdır; işlem hacmi en büyük min(T, A)'dır. Hacim fiyat
+    önceliğiyle (eşitlikte emir sırasıyla) dağıtılır: en yüksek alışlar ve
+    en düşük satışlar önce dolar. Fiyat, temizleme aralığının ortasıdır:
+    
+        alt = max(dolan son satış, dolmayan en yüksek alış)
+        üst = min(dolan son alış, dolmayan en düşük satış)
+    
+    Kısmen dolan emir her iki tarafta sayılır; böylece örneğin fazla arzda
+    fiyat marjinal satıcının limitine iner.
+    
+    Returns:
+    --------
+    (fiyat, hacim, alis_dolum, satis_dolum) : işlem yoksa fiyat None
+    """
+    alis_dolum = np.zeros(alis_miktar.size)
+    satis_dolum = np.zeros(satis_miktar.size)
+    if alis_miktar.size == 0 or satis_miktar.size == 0:
+        return None, 0.0, alis_dolum, satis_dolum
+    
+    alis_sira = np.argsort(-alis_fiyat, kind="stable")  # azalan
+    satis_sira = np.argsort(satis_fiyat, kind="stable")  # artan
+    a_fiyat = alis_fiyat[alis_sira]
+    s_fiyat = satis_fiyat[satis_sira]
+    a_kum = np.concatenate(([0.0], np.cumsum(alis_miktar[alis_sira])))
+    s_kum = np.concatenate(([0.0], np.cumsum(satis_miktar[satis_sira])))
+    
+    # Aday fiyatlar: tüm limitler; T ve A basamak fonksiyonları
+    adaylar = np.unique(np.concatenate((a_fiyat, s_fiyat)))
+    talep = a_kum[np.searchsorted(-a_fiyat, -adaylar, side="right")]
+    arz = s_kum[np.searchsorted(s_fiyat, adaylar, side="right")]
+    hacimler = np.minimum(talep, arz)
+    hacim = float(hacimler.max())
+    if hacim <= 0:
+        return None, 0.0, alis_dolum, satis_dolum
+    
+    # Dolum durumu kümülatiflerden (hacim bir kümülatif değere eşittir)
+    a_tam, s_tam = a_kum[1:] <= hacim, s_kum[1:] <= hacim
+    a_dolan, s_dolan = a_fiyat[a_kum[:-1] < hacim], s_fiyat[s_kum[:-1] < hacim]
+    a_kalan, s_kalan = a_fiyat[~a_tam], s_fiyat[~s_tam]
+    alis_dolum[alis_sira] = np.where(a_tam, alis_miktar[alis_sira],
+                                     np.clip(hacim - a_kum[:-1], 0.0, None))
+    satis_dolum[satis_sira] = np.where(s_tam, satis_miktar[satis_sira],
+                                       np.clip(hacim - s_kum[:-1], 0.0, None))
+    alt = max(s_dolan[-1], a_kalan[0]) if a_kalan.size else s_dolan[-1]
+    ust = min(a_dolan[-1], s_kalan[0]) if s_kalan.size else a_dolan[-1]
+    return float(0.5 * (alt + ust)), hacim, alis_dolum, satis_dolum
+
+
+def birincil_acik_artirma(teklif_fiyat, teklif_miktar, arz, rezerv_fiyat):
+    """
+    Kapalı zarf, tek fiyatlı birincil açık artırma.
+    
+    Rezerv fiyat altındaki teklifler geçersizdir. Geçerli teklifler fiyata
+    göre azalan sıralanır; kümülatif talebin arzı karşıladığı teklifin
+    fiyatı temizleme fiyatıdır. Bu fiyatın üstündeki teklifler tam,
+    fiyattakiler kalan arzla orantılı dolar. Talep arzdan azsa tüm geçerli
+    teklifler en düşük teklif fiyatından dolar; satılmayan arz iptal edilir.
+    
+    Returns:
+    --------
+    (fiyat, dolum) : geçerli teklif yoksa fiyat None
+    """
+    dolum = np.zeros(teklif_miktar.size)
+    gecerli = np.flatnonzero((teklif_fiyat >= rezerv_fiyat) & (teklif_miktar > 0))
+    if gecerli.size == 0 or arz <= 0:
+        return None, dolum
+    fiyatlar = teklif_fiyat[gecerli]
+    sira = np.argsort(-fiyatlar)  # eşit fiyatlar orantılı dolar: kararlılık gerekmez
+    kum = np.cumsum(teklif_miktar[gecerli][sira])
+    k = np.searchsorted(kum, arz, side="left")
+    if k == kum.size:
+        dolum[gecerli] = teklif_miktar[gecerli]
+        return float(fiyatlar.min()), dolum
+    
+    fiyat = float(fiyatlar[sira[k]])
+    ustte = gecerli[fiyatlar > fiyat]
+    esit = gecerli[fiyatlar == fiyat]
+    dolum[ustte] = teklif_miktar[ustte]
+    kalan = arz - float(dolum[ustte].sum())
+    dolum[esit] = teklif_miktar[esit] * (kalan / float(teklif_miktar[esit].sum()))
+    return fiyat, dolum
+
+
+# EmisyonYaniti'nin tesis alanları (TurkiyeETSModel.tesis_alanlari ile)
+YANIT_ALANLARI = ("emisyon", "durum", "sektor_kodu", "ihracatci", "net_emisyon",
+                  "ceza_durumu", "emisyon_azalma_potansiyeli")
+
+# Denge fiyatı ikili arama adım sayısı ([taban, tavan] aralığı 2^-40 oranında daralır)
+DENGE_ITERASYONU = 40
+
+
+class EmisyonYaniti:
+    """
+    Tesislerin karbon fiyatına toplu emisyon tepkisi E(p) (Mt CO₂/yıl).
+    
+    Her tesis için EndustriyelTesis._karar_ver kuralı p fiyatında uygulanır:
+    - Temiz: emisyon değişmez; Donusum: taahhüt edilen azaltım uygulanır
+    - Aktif, teşvik eşiğini geçen teşvik duyarlı veya cezalı tesis: ilk
+      uygun MAC önlemiyle (yoksa genel iyileştirme) yatırım yapar
+    - Diğer Aktif tesisler: en iyi MAC önleminin NPV'si pozitifse yatırım
+      yapar, değilse net emisyon maliyeti limiti aşarsa kapanır
+    
+    Önlem seçimi yalnızca (sektör, SKDM) grubunun efektif fiyatına bağlı
+    olduğundan bir değerlendirme grup başına skaler arama ve tek dizi
+    geçişidir.
+    """
+    
+    def __init__(self, alanlar, ab_skdm_fiyat, tesvik_miktari, iskonto_orani, ekonomik_omur):
+        mac, potansiyel = sektor_mac_dilimleri()
+        self.ab_skdm_fiyat = ab_skdm_fiyat
+        self.iskonto_orani = iskonto_orani
+        self.ekonomik_omur = ekonomik_omur
+        self.af = annuite_faktoru(iskonto_orani, ekonomik_omur)
+        
+        emisyon = alanlar["emisyon"]
+        durum = alanlar["durum"]
+        sektor = alanlar["sektor_kodu"].astype(np.int64)
+        skdm = alanlar["ihracatci"].astype(bool) & np.array(
+            [SEKTOR_PROFILLERI[s]["skdm_kapsam"] for s in SEKTOR_LISTESI])[sektor]
+        tesvik_duyarli = np.array(
+            [SEKTOR_PROFILLERI[s]["duyarlilik"] == "Tesvik" for s in SEKTOR_LISTESI])[sektor]
+        tesvik_esigi = np.array(
+            [SEKTOR_PROFILLERI[s]["yatirim_bedeli"] * 0.6 * 1000 for s in SEKTOR_LISTESI])[sektor]
+        aktif = durum == AKTIF
+        zorunlu = aktif & np.where(tesvik_duyarli, tesvik_miktari >= tesvik_esigi,
+                                   alanlar["ceza_durumu"].astype(bool))
+        npv_adayi = aktif & ~tesvik_duyarli & ~zorunlu
+        
+        # Fiyattan bağımsız kısım: Temiz, Donusum ve yatırım yapmayan teşvik duyarlılar
+        sabit = ~zorunlu & ~npv_adayi
+        self.sabit_emisyon = float(np.where(
+            durum[sabit] == DONUSUM,
+            emisyon[sabit] * (1 - alanlar["emisyon_azalma_potansiyeli"][sabit]),
+            emisyon[sabit],
+        ).sum())
+        
+        # Fiyata duyarlı tesisler grup kodu = sektör * 2 + SKDM
+        grup = sektor * 2 + skdm
+        self.zorunlu_grup = grup[zorunlu]
+        self.zorunlu_emisyon = emisyon[zorunlu]
+        self.aday_grup = grup[npv_adayi]
+        self.aday_emisyon = emisyon[npv_adayi]
+        self.aday_net = alanlar["net_emisyon"][npv_adayi]
+        self.aday_limit = np.array(
+            [SEKTOR_PROFILLERI[s]["maliyet_limit"] for s in SEKTOR_LISTESI], dtype=float
+        )[sektor[npv_adayi]]
+    
+    def _grup_tablolari(self, fiyat):
+        """Grup başına efektif fiyat, ilk uygun ve NPV-en iyi önlem azaltım oranı."""
+        n_grup = 2 * len(SEKTOR_LISTESI)
+        efektif = np.empty(n_grup)
+        ilk_oran = np.empty(n_grup)
+        npv_oran = np.zeros(n_grup)
+        for g in range(n_grup):
+            sektor = SEKTOR_LISTESI[g // 2]
+            p = max(fiyat, self.ab_skdm_fiyat) if g % 2 else fiyat
+            efektif[g] = p
+            onlemler = list(SEKTOR_PROFILLERI[sektor]["mac_onlemler"].values())
+            uygun = [o for o in onlemler if o["mac"] < p]
+            ilk_oran[g] = uygun[0]["potansiyel"] if uygun else GENEL_ONLEM_POTANSIYEL
+            kirilimlar, kazananlar = mac_gecis_tablosu(sektor, self.iskonto_orani, self.ekonomik_omur)
+            j = kazananlar[bisect_left(kirilimlar, p)]
+            if j >= 0:
+                onlem = onlemler[j]
+                # NPV ∝ potansiyel · (AF·p - max(mac, 0)) (emisyon > 0)
+                if onlem["potansiyel"] * (self.af * p - max(onlem["mac"], 0)) > 0:
+                    npv_oran[g] = onlem["potansiyel"]
+        return efektif, ilk_oran, npv_oran
+    
+    def __call__(self, fiyat):
+        """p fiyatında azaltım sonrası toplam tesis emisyonu (Mt CO₂/yıl)."""
+        efektif, ilk_oran, npv_oran = self._grup_tablolari(fiyat)
+        zorunlu = self.zorunlu_emisyon @ (1 - ilk_oran[self.zorunlu_grup])
+        oran = npv_oran[self.aday_grup]
+        kapanan = ((oran == 0) & (self.aday_net > 0)
+                   & (self.aday_net * efektif[self.aday_grup] > self.aday_limit))
+        aday = self.aday_emisyon @ np.where(kapanan, 0.0, 1 - oran)
+        return self.sabit_emisyon + float(zorunlu) + float(aday)
+
+
+def denge_fiyati(yanit, cap, taban, tavan, iterasyon=DENGE_ITERASYONU):
+    """
+    yanit(p) <= cap sağlayan en düşük fiyat, [taban, tavan] içinde.
+    
+    E(p) basamak fonksiyonu olduğundan (önlem eşiklerinde sıçrar) ikili
+    arama kullanılır; Brent yöntemi süreksizlikte avantaj sağlamaz. Tavanda
+    da cap aşılıyorsa tavan, tabanda cap sağlanıyorsa taban döner; aksi
+    halde dönen fiyatta E <= cap, 2^-iterasyon kadar altında E > cap'tir.
+    """
+    if yanit(taban) <= cap:
+        return float(taban)
+    if yanit(tavan) > cap:
+        return float(tavan)
+    alt, ust = float(taban), float(tavan)
+    for _ in range(iterasyon):
+        orta = 0.5 * (alt + ust)
+        if yanit(orta) <= cap:
+            ust = orta
+        else:
+            alt = orta
+    return ust
+
+
+# =============================================================================
+# GERÇEK TESİS TABLOSU
+# =============================================================================
+"""
+Tesis ajanlarının tesisler tablosundan (data/tesisler.csv, veritabanındaki
+tesisler tablosu) satır başına bir tesis olarak oluşturulması.
+
+Temsili modda tesis emisyonu baz_emisyon * U(0.7, 1.3) ile çekilir. Tablo
+modunda her ETS kapsamındaki satır gerçek Kapasite_MW, Emisyon_Faktoru,
+Il ve Yillik_Emisyon değerleriyle bir tesis olur. Satırlar sütun dizileri
+olarak okunur ve vektörel modda doğrudan TesisDizisi'ne toplu eklenir.
+
+Ölçek testleri için tesis_tablosunu_genislet listeyi kopyalayıp kapasite
+ve kapasite faktörünü bozarak 10^5 tesise kadar büyütür.
+
+Yıllık emisyon [tCO₂] = Kapasite_MW × Kapasite_Faktor × 8760 × EF
+"""
+
+# Modelin ihtiyaç duyduğu tesisler tablosu sütunları
+TESIS_SUTUNLARI = ("Tesis_ID", "Il", "Yakit_Tipi", "Kapasite_MW",
+                   "Kapasite_Faktor", "Emisyon_Faktoru_tCO2_MWh")
+
+# Yakıt tipi → sektör (listede olmayanlar elektrik üretimi, "Enerji")
+# BOF gazı entegre demir-çelik, petrokok çimento/rafineri tesisleridir.
+YAKIT_SEKTORLERI = {"BOF_Gaz": "Sanayi", "Petkok": "Sanayi"}
+
+SAAT_YIL = 8760
+
+
+def tesis_tablosu_yukle(girdiler=None):
+    """
+    ETS kapsamındaki tesis satırlarını döndürür.
+
+    Öncelik SimulationInputs.tesisler (veritabanı tablosu); boşsa
+    data/tesisler.csv okunur. ETS_Kapsami 'Hayir' olan satırlar çıkarılır.
+    """
+    tablo = girdiler.tesisler if girdiler is not None else pd.DataFrame()
+    if tablo.empty:
+        yol = os.path.join(DATA_DIR, "tesisler.csv")
+        if not os.path.exists(yol):
+            raise ValueError(f"❌ Tesis tablosu bulunamadı: veritabanı boş ve {yol} yok")
+        tablo = pd.read_csv(yol, comment='#')
+    if "ETS_Kapsami" in tablo.columns:
+        tablo = tablo[tablo["ETS_Kapsami"] != "Hayir"]
+    return tablo.reset_index(drop=True)
+
+
+def tesis_sutunlari(tablo):
+    """
+    Tablodan model sütun dizilerini çıkarır.
+
+    Returns:
+    --------
+    dict : il (str), sektor_kodu (int8), emisyon (Mt CO₂/yıl),
+           kapasite_mw, emisyon_faktoru (tCO₂/MWh)
+    """
+    eksik = [s for s in TESIS_SUTUNLARI if s not in tablo.columns]
+    if eksik:
+        raise ValueError(
+            f"❌ Tesis tablosunda eksik sütun: {eksik}. "
+            f"Gerekli sütunlar: {list(TESIS_SUTUNLARI)}"
+        )
+    kapasite = tablo["Kapasite_MW"].to_numpy(dtype=float)
+    ef = tablo["Emisyon_Faktoru_tCO2_MWh"].to_numpy(dtype=float)
+    if "Yillik_Emisyon_tCO2" in tablo.columns:
+        ton = tablo["Yillik_Emisyon_tCO2"].to_numpy(dtype=float)
+    else:
+        ton = kapasite * tablo["Kapasite_Faktor"].to_numpy(dtype=float) * SAAT_YIL * ef
+    sektorler = tablo["Yakit_Tipi"].map(YAKIT_SEKTORLERI).fillna("Enerji")
+    return {
+        "il": tablo["Il"].astype(str).to_numpy(),
+        "sektor_kodu": sektorler.map(SEKTOR_KODLARI).to_numpy(dtype=np.int8),
+        "emisyon": ton / 1e6,
+        "kapasite_mw": kapasite,
+        "emisyon_faktoru": ef,
+    }
+
+
+def tesis_tablosunu_genislet(tablo, n, seed=0, oynama=0.3):
+    """
+    Tesis listesini n satıra büyüten sentetik genişletici (ölçek testi).
+
+    Özgün satırlar korunur; eklenen kopyalar rastgele seçilen satırların
+    Kapasite_MW ve Kapasite_Faktor değerleri U(1-oynama, 1+oynama) ile
+    çarpılarak üretilir, yıllık emisyon aynı oranla ölçeklenir (kapasite
+    faktörü 0 olan satırlarda çekilen çarpanla). Kopyaların
+    Tesis_ID'si '<özgün>_K<sıra>' biçimindedir.
+    """
+    if n <= len(tablo):
+        return tablo.iloc[:n].reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+    k = n - len(tablo)
+    kopya = tablo.iloc[rng.integers(0, len(tablo), k)].reset_index(drop=True)
+    kapasite_carpani = rng.uniform(1 - oynama, 1 + oynama, k)
+    kf = kopya["Kapasite_Faktor"].to_numpy(dtype=float)
+    kf_carpani = rng.uniform(1 - oynama, 1 + oynama, k)
+    yeni_kf = np.minimum(kf * kf_carpani, 1.0)
+    kopya["Kapasite_MW"] = kopya["Kapasite_MW"].to_numpy(dtype=float) * kapasite_carpani
+    kopya["Kapasite_Faktor"] = yeni_kf
+    if "Yillik_Emisyon_tCO2" in kopya.columns:
+        kopya["Yillik_Emisyon_tCO2"] = (kopya["Yillik_Emisyon_tCO2"].to_numpy(dtype=float)
+                                        * kapasite_carpani
+                                        * np.divide(yeni_kf, kf, out=kf_carpani, where=kf > 0))
+    kopya["Tesis_ID"] = (kopya["Tesis_ID"].astype(str) + "_K"
+                         + pd.Series(np.arange(1, k + 1)).astype(str))
+    return pd.concat([tablo, kopya], ignore_index=True)
+
+
+# =============================================================================
+# AJAN KAYIT DEFTERİ
+# =============================================================================
+
+class AjanKayitDefteri:
+    """
+    Tip ve durum bazlı canlı ajan koleksiyonları.
+
+    Model, her ajanı oluşturulduğu anda `ajan_tipi` sınıf özniteliğine göre
+    kaydeder; tesislerin `durum` değişiklikleri de buraya bildirilir. Böylece
+    piyasa operatörü, MRV ve raporlayıcılar `model.agents` üzerinde tam tarama
+    yapmadan yalnızca ilgili ajanlara erişir.
+
+    Koleksiyonlar oluşturulma sırasını korur (dict anahtarları sıralı küme
+    olarak kullanılır); rastgele çekiliş yapan döngüler (ör. MRV denetimi)
+    bu sayede tam taramayla aynı sırada ilerler.
+    """
+
+    def __init__(self):
+        self._tipler = {}    # ajan_tipi -> {ajan: None}
+        self._durumlar = {}  # durum -> {ajan: None}
+
+    def ekle(self, ajan):
+        """Ajanı tip koleksiyonuna ekler."""
+        tip = getattr(ajan, 'ajan_tipi', None)
+        if tip is not None:
+            self._tipler.setdefault(tip, {})[ajan] = None
+
+    def cikar(self, ajan):
+        """Ajanı tüm koleksiyonlardan çıkarır."""
+        self._tipler.get(getattr(ajan, 'ajan_tipi', None), {}).pop(ajan, None)
+        self._durumlar.get(getattr(ajan, 'durum', None), {}).pop(ajan, None)
+
+    def durum_degisti(self, ajan, eski, yeni):
+        """Durum geçişini durum koleksiyonlarına yansıtır."""
+        if eski is not None:
+            self._durumlar.get(eski, {}).pop(ajan, None)
+        self._durumlar.setdefault(yeni, {})[ajan] = None
+
+    def tip(self, *tipler):
+        """
+        Verilen tiplerdeki ajanları oluşturulma sırasıyla döndürür.
+
+        Birden fazla tip istendiğinde koleksiyonlar `unique_id` sırasına göre
+        birleştirilir (tam taramadaki sıranın aynısı).
+        """
+        if len(tipler) == 1:
+            return list(self._tipler.get(tipler[0], ()))
+        return list(heapq.merge(
+            *(self._tipler.get(t, ()) for t in tipler),
+            key=lambda a: a.unique_id
+        ))
+
+    def sayi(self, *tipler):
+        """Verilen tiplerdeki ajan sayısı."""
+        return sum(len(self._tipler.get(t, ())) for t in tipler)
+
+    def durumda(self, durum):
+        """Belirli durumdaki tesisleri döndürür."""
+        return list(self._durumlar.get(durum, ()))
+
+    def durum_sayisi(self, durum):
+        """Belirli durumdaki tesis sayısı."""
+        return len(self._durumlar.get(durum, ()))
+
+    def tesisler(self):
+        """ETS kapsamındaki tüm tesisler (Tesis + IhracatciTesis)."""
+        return self.tip(*TESIS_TIPLERI)
+
+
+class EmisyonToplamlari:
+    """
+    Artımlı emisyon ve durum toplamları.
+
+    Toplam, il ve sektör bazlı emisyonlar, CBAM maliyeti ve durum sayıları
+    her yıl baştan taranmak yerine, bir ajanın `emisyon`, `durum` veya
+    `cbam_maliyeti` değeri değiştiği anda farkı (delta) eklenerek güncellenir.
+    Raporlayıcılar ve piyasa operatörü bu değerleri O(1) okur.
+
+    Kapalı tesislerin emisyonu 0'dır; bu nedenle açık emisyon toplamı tüm
+    tesislerin toplamına eşittir. Ardışık farklardan kalan kayan nokta
+    artığı, açık ajanı kalmayan il/sektör okunurken 0 olarak raporlanır.
+
+    İl indeksi: ajanlar oluşturulurken `il_kodu(city)` ile tam sayı il kodu
+    alır; güncellemeler ve il bazlı sorgular bu kodlarla çalışır. İl
+    emisyon dizisi her değişiklikten sonra en fazla bir kez hesaplanır ve
+    il bazlı tüm raporlayıcılar bu tek sonuçtan okur.
+
+    Tam tarama karşılaştırması: TurkiyeETSModel.toplamlari_dogrula()
+    """
+
+    def __init__(self, iller):
+        self.iller = list(iller)
+        self._il_indeksi = {il: i for i, il in enumerate(self.iller)}
+        n_il, n_sektor = len(self.iller), len(SEKTOR_LISTESI)
+
+        self.hane_emisyon = 0.0   # ton CO₂
+        self.cbam_maliyeti = 0.0  # Milyon $
+        self.durum_sayilari = dict.fromkeys(DURUM_KODLARI, 0)
+
+        # Ham toplamlar ve açık ajan sayıları (okunurken artık temizlenir)
+        self._tesis_emisyon = 0.0
+        self._il_emisyon = np.zeros(n_il)
+        self._sektor_emisyon = np.zeros(n_sektor)
+        self._tesis_acik = 0
+        self._il_acik = np.zeros(n_il, dtype=np.int64)
+        self._sektor_acik = np.zeros(n_sektor, dtype=np.int64)
+
+        # il_emisyon önbelleği: her güncellemede sürüm artar
+        self._surum = 0
+        self._il_onbellek = (-1, None)
+
+    def il_kodu(self, city):
+        """İl adının indeksi (model.iller dışındaysa -1)."""
+        return self._il_indeksi.get(city, -1)
+
+    @property
+    def tesis_emisyon(self):
+        """Açık tesislerin emisyonu (Mt CO₂)."""
+        return self._tesis_emisyon if self._tesis_acik else 0.0
+
+    @property
+    def toplam_emisyon(self):
+        """Açık tesis + hanehalkı emisyonu."""
+        return self.tesis_emisyon + self.hane_emisyon
+
+    @property
+    def il_emisyon(self):
+        """İl bazlı emisyon dizisi (tesis + hanehalkı), model.iller sırasıyla."""
+        surum, dizi = self._il_onbellek
+        if surum != self._surum:
+            dizi = np.where(self._il_acik > 0, self._il_emisyon, 0.0)
+            dizi.flags.writeable = False
+            self._il_onbellek = (self._surum, dizi)
+        return dizi
+
+    @property
+    def sektor_emisyon(self):
+        """Sektör bazlı açık tesis emisyonu, SEKTOR_LISTESI sırasıyla."""
+        return np.where(self._sektor_acik > 0, self._sektor_emisyon, 0.0)
+
+    def il(self, city):
+        """Bir ilin toplam emisyonu."""
+        i = self.il_kodu(city)
+        return float(self.il_emisyon[i]) if i >= 0 else 0
+
+    def il_sozlugu(self):
+        """{il_adi: emisyon} sözlüğü (il_bazli_emisyon_hesapla formatı)."""
+        return dict(zip(self.iller, self.il_emisyon.tolist()))
+
+    def durum_sayisi(self, durum):
+        """Belirli durumdaki tesis sayısı."""
+        return self.durum_sayilari.get(durum, 0)
+
+    # -------------------------------------------------------------------------
+    # TEKİL (NESNE MODU) GÜNCELLEMELER
+    # -------------------------------------------------------------------------
+
+    def tesis_emisyon_degisti(self, il_kodu, sektor_kodu, delta):
+        """Bir tesisin emisyon farkını toplamlara ekler."""
+        self._surum += 1
+        self._tesis_emisyon += delta
+        self._sektor_emisyon[sektor_kodu] += delta
+        if il_kodu >= 0:
+            self._il_emisyon[il_kodu] += delta
+
+    def hane_emisyon_degisti(self, il_kodu, delta):
+        """Bir hanenin emisyon farkını toplamlara ekler."""
+        self._surum += 1
+        self.hane_emisyon += delta
+        if il_kodu >= 0:
+            self._il_emisyon[il_kodu] += delta
+
+    def hane_eklendi(self, il_kodu):
+        """Yeni haneyi açık ajan sayısına ekler (haneler kapanmaz)."""
+        self._surum += 1
+        if il_kodu >= 0:
+            self._il_acik[il_kodu] += 1
+
+    def cbam_degisti(self, delta):
+        """CBAM maliyeti farkını ekler."""
+        self.cbam_maliyeti += delta
+
+    def durum_degisti(self, il_kodu, sektor_kodu, eski, yeni):
+        """Tesis durum geçişini durum ve açık ajan sayılarına yansıtır."""
+        self._surum += 1
+        if eski is not None:
+            self.durum_sayilari[eski] = self.durum_sayilari.get(eski, 0) - 1
+        self.durum_sayilari[yeni] = self.durum_sayilari.get(yeni, 0) + 1
+
+        fark = int(yeni != "Kapali") - int(eski is not None and eski != "Kapali")
+        if fark:
+            self._tesis_acik += fark
+            self._sektor_acik[sektor_kodu] += fark
+            if il_kodu >= 0:
+                self._il_acik[il_kodu] += fark
+
+    # -------------------------------------------------------------------------
+    # TOPLU (VEKTÖREL MOD) GÜNCELLEMELER
+    # -------------------------------------------------------------------------
+
+    def tesis_deltalari(self, il_kodu, sektor_kodu, delta):
+        """Satır bazlı tesis emisyon farklarını il/sektör bazında ekler."""
+        if delta.size == 0:
+            return
+        self._surum += 1
+        self._tesis_emisyon += float(delta.sum())
+        self._il_emisyon += np.bincount(il_kodu, weights=delta, minlength=len(self.iller))
+        self._sektor_emisyon += np.bincount(sektor_kodu, weights=delta,
+                                            minlength=len(SEKTOR_LISTESI))
+
+    def hane_deltalari(self, il_kodu, delta, yeni=False):
+        """Satır bazlı hane emisyon farklarını il bazında ekler."""
+        if delta.size == 0:
+            return
+        self._surum += 1
+        self.hane_emisyon += float(delta.sum())
+        self._il_emisyon += np.bincount(il_kodu, weights=delta, minlength=len(self.iller))
+        if yeni:
+            self._il_acik += np.bincount(il_kodu, minlength=len(self.iller))
+
+    def durum_deltalari(self, il_kodu, sektor_kodu, eski, yeni):
+        """Satır bazlı durum kodu geçişlerini sayılara yansıtır (eski < 0: yeni satır)."""
+        degisen = eski != yeni
+        if not degisen.any():
+            return
+        self._surum += 1
+        il_kodu, sektor_kodu = il_kodu[degisen], sektor_kodu[degisen]
+        eski, yeni = eski[degisen], yeni[degisen]
+        n_durum, n_il, n_sektor = len(DURUM_KODLARI), len(self.iller), len(SEKTOR_LISTESI)
+
+        onceki = eski >= 0
+        fark = (np.bincount(yeni, minlength=n_durum)
+                - np.bincount(eski[onceki], minlength=n_durum))
+        for durum, d in zip(DURUM_KODLARI, fark.tolist()):
+            self.durum_sayilari[durum] += d
+
+        acik_fark = (yeni != KAPALI).astype(np.int64) - (onceki & (eski != KAPALI))
+        self._tesis_acik += int(acik_fark.sum())
+        self._il_acik += np.bincount(il_kodu, weights=acik_fark, minlength=n_il).astype(np.int64)
+        self._sektor_acik += np.bincount(sektor_kodu, weights=acik_fark,
+                                         minlength=n_sektor).astype(np.int64)
+
+
 # =============================================================================
 # AJAN SINIFLARI
 # =============================================================================
@@ -361,24 +1276,45 @@ class PiyasaOperatoru(Agent):
     """
     ETS Piyasa Operatörü - Cap & Trade mekanizmasını yönetir. 
     
+    Fiyat model.piyasa_mekanizmasi'na göre belirlenir:
+    - "formul": emisyon/cap oranından kapalı form kural; açık artırma
+      yapılmaz, gelir %30 hacmin piyasa fiyatından satıldığı varsayımıyla
+      hesaplanır
+    - "emir_defteri": tam uygulamada önce cap'in %30'u birincil açık
+      artırmayla satılır, ardından tesisler arası tek fiyatlı çift taraflı
+      açık artırma yapılır; kazanılan ve el değiştiren izinler tesislerin
+      izin bankalarına yazılır, gelir açık artırma fiyatındandır
+    - "denge": tesislerin bu fiyata tepkisiyle oluşacak azaltım sonrası
+      emisyonu cap'e eşitleyen fiyat (gelir "formul" gibi hesaplanır)
+    
     Referanslar:
     - [cite:  Yu et al. 2020] Piyasa-clearing mekanizması
     - [cite: EU ETS Directive] Cap azaltma kuralları
     """
     
+    ajan_tipi = "PiyasaOperatoru"
+    toplu_adim_siniri = True  # Vektörel modda adımdan önce bekleyen satırlar çalıştırılır
+    
     def __init__(self, model, baslangic_cap, azalma_orani):
         super().__init__(model)
-        self.ajan_tipi = "PiyasaOperatoru"
         self.cap = baslangic_cap  # Mt CO₂
         self.azalma_orani = azalma_orani  # yıllık oran (0-1 arası)
         self.piyasa_fiyati = ETS_PARAMS["TABAN_FIYAT"]  # $/ton
         self.fiyat_gecmisi = []
         self.toplam_gelir = 0  # Milyon $
+        self.islem_hacmi = 0.0  # Mt, son temizlemede el değiştiren izin
+        self.acik_artirma_fiyati = 0.0  # $/ton, son birincil açık artırma
+        self.acik_artirma_geliri = 0.0  # Milyon $, bu tikin açık artırma geliri
         
     def step(self):
-        """Her yıl için piyasa operatörü adımı."""
-        # Cap azaltma sadece ETS aktif olduğunda
-        if self. model.yil >= ETS_PARAMS["PILOT_BASLANGIC"]: 
+        """
+        Piyasa operatörü adımı (yıllık veya yıl içi tik).
+        
+        Cap yıl başında azaltılır; fiyat her adımda yeniden belirlenir ve
+        açık artırma geliri adımın kapsadığı süreyle orantılıdır.
+        """
+        # Cap azaltma sadece ETS aktif olduğunda (yılda bir kez)
+        if self. model.yil >= ETS_PARAMS["PILOT_BASLANGIC"] and self.model.yil_basi: 
             self.cap *= (1 - self.azalma_orani)
         
         # Toplam Emisyon Hesaplama
@@ -386,18 +1322,12 @@ class PiyasaOperatoru(Agent):
         
         # Fiyat Belirleme (Arz-Talep Modeli) - Sadece ETS aktifse
         if self.model.yil >= ETS_PARAMS["PILOT_BASLANGIC"] and self.cap > 0 and toplam_emisyon > 0:
-            # Emisyon/Cap oranına göre fiyat belirleme
-            arz_talep_orani = toplam_emisyon / self.cap
-            
-            # Fiyat formülü: Oran > 1 ise fiyat hızla artar
-            if arz_talep_orani > 1:
-                self.piyasa_fiyati = ETS_PARAMS["TABAN_FIYAT"] * (arz_talep_orani ** 2)
+            if self.model.piyasa_mekanizmasi == "emir_defteri":
+                self.piyasa_fiyati = self._emir_defteri_temizle()
+            elif self.model.piyasa_mekanizmasi == "denge":
+                self.piyasa_fiyati = self._denge_fiyati_coz()
             else:
-                self.piyasa_fiyati = ETS_PARAMS["TABAN_FIYAT"] * (arz_talep_orani ** 0.5)
-            
-            # Taban ve tavan sınırları
-            self.piyasa_fiyati = max(ETS_PARAMS["TABAN_FIYAT"], 
-                                    min(ETS_PARAMS["TAVAN_FIYAT"], self.piyasa_fiyati))
+                self.piyasa_fiyati = self._formul_fiyati(toplam_emisyon)
         else:
             # ETS öncesi dönem - fiyat sıfır
             self.piyasa_fiyati = 0
@@ -407,19 +1337,22 @@ class PiyasaOperatoru(Agent):
         self.fiyat_gecmisi.append(self.piyasa_fiyati)
         
         # Açık artırma geliri hesapla (Tam uygulama döneminde)
-        if self.model.yil >= ETS_PARAMS["TAM_UYGULAMA"] and self.piyasa_fiyati > 0:
-            acik_artirma_orani = 0.3  # %30 açık artırma
-            acik_artirma_miktari = self.cap * acik_artirma_orani
-            yil_geliri = acik_artirma_miktari * self.piyasa_fiyati
-            self.toplam_gelir += yil_geliri
+        if self.model.piyasa_mekanizmasi != "emir_defteri":
+            acik_artirma_miktari = self.cap * ACIK_ARTIRMA_ORANI  # %30 açık artırma
+            donem_geliri = (acik_artirma_miktari * self.piyasa_fiyati
+                            * self.model.adim_suresi(self.ajan_tipi))
+        else:
+            donem_geliri = self.acik_artirma_geliri
+        if self.model.yil >= ETS_PARAMS["TAM_UYGULAMA"] and donem_geliri > 0:
+            self.toplam_gelir += donem_geliri
             
             # --- GELİR GERİ DÖNÜŞÜ (REVENUE RECYCLING) ---
             recycling_config = self.model.rev_recycling
-            transfer_miktari = yil_geliri * recycling_config["transfer_ratio"]
+            transfer_miktari = donem_geliri * recycling_config["transfer_ratio"]
             
             if recycling_config["recycling"] == "hanehalki_transfer":
                 # Hanehalkına eşit dağıtım
-                haneler = [a for a in self.model.agents if hasattr(a, 'ajan_tipi') and a.ajan_tipi == "Hanehalki"]
+                haneler = self.model.kayit.tip("Hanehalki")
                 if haneler:
                     pay_basina = transfer_miktari / len(haneler)
                     for h in haneler:
@@ -432,7 +1365,7 @@ class PiyasaOperatoru(Agent):
                 
             elif recycling_config["recycling"] == "firma_destegi":
                 # Endüstriyel tesislere teknoloji desteği
-                tesisler = [a for a in self.model.agents if hasattr(a, 'ajan_tipi') and a.ajan_tipi == "EndustriyelTesis"]
+                tesisler = self.model.kayit.tip("EndustriyelTesis")
                 if tesisler:
                     pay_basina = transfer_miktari / len(tesisler)
                     for t in tesisler:
@@ -441,11 +1374,82 @@ class PiyasaOperatoru(Agent):
     
     def _toplam_emisyon_hesapla(self):
         """Aktif tesislerin toplam emisyonunu hesaplar."""
-        return sum(
-            agent.emisyon for agent in self.model.agents
-            if hasattr(agent, 'ajan_tipi') and agent.ajan_tipi in ["Tesis", "IhracatciTesis"] 
-            and agent.durum != "Kapali"
+        return self.model._acik_tesis_emisyonu()
+    
+    def _formul_fiyati(self, toplam_emisyon):
+        """Emisyon/Cap oranına göre taban/tavan sınırlı fiyat."""
+        arz_talep_orani = toplam_emisyon / self.cap
+        
+        # Fiyat formülü: Oran > 1 ise fiyat hızla artar
+        if arz_talep_orani > 1:
+            fiyat = ETS_PARAMS["TABAN_FIYAT"] * (arz_talep_orani ** 2)
+        else:
+            fiyat = ETS_PARAMS["TABAN_FIYAT"] * (arz_talep_orani ** 0.5)
+        
+        # Taban ve tavan sınırları
+        return max(ETS_PARAMS["TABAN_FIYAT"], min(ETS_PARAMS["TAVAN_FIYAT"], fiyat))
+    
+    def _denge_fiyati_coz(self):
+        """Azaltım sonrası tesis emisyonunu cap'e eşitleyen taban/tavan içi fiyat."""
+        model = self.model
+        _, alanlar = model.tesis_alanlari(YANIT_ALANLARI)
+        yanit = EmisyonYaniti(alanlar, model.ab_skdm_fiyat, model.tesvik_miktari,
+                              model.iskonto_orani, model.ekonomik_omur)
+        return denge_fiyati(yanit, self.cap, ETS_PARAMS["TABAN_FIYAT"], ETS_PARAMS["TAVAN_FIYAT"])
+    
+    def _emir_defteri_temizle(self):
+        """
+        Birincil açık artırma ve emir defterini temizler; taban/tavan sınırlı
+        piyasa fiyatını döndürür.
+        
+        Tam uygulamada her piyasa tikinde cap × ACIK_ARTIRMA_ORANI × tik
+        süresi kadar izin taban (rezerv) fiyatla açık artırılır; kazanılan
+        izinler ikincil piyasadan önce bankalara yazılır. İkincil piyasada
+        işlem olmazsa fiyat bu tikin açık artırma fiyatı, o da yoksa en
+        yüksek alış limitidir (alış yoksa taban fiyat).
+        """
+        model = self.model
+        taban, tavan = ETS_PARAMS["TABAN_FIYAT"], ETS_PARAMS["TAVAN_FIYAT"]
+        satirlar, alanlar = model.tesis_alanlari(TEKLIF_ALANLARI + ("bankalanan", "son_adim_yili"))
+        n = alanlar["emisyon"].size
+        # Karıştırmada operatörden önce adım atan tesisler bu yılı bankalamıştır;
+        # pozisyonlar herkes için bankalama öncesi bankadan kurulur, böylece
+        # temizleme operatörün sıradaki yerine bağlı olmaz.
+        bankalandi = alanlar.pop("son_adim_yili") == model.yil
+        alanlar["izin_bankasi"] = alanlar["izin_bankasi"] - np.where(
+            bankalandi, alanlar.pop("bankalanan"), 0.0)
+        
+        # 1. Birincil açık artırma (alış dilimleri teklif olarak)
+        self.acik_artirma_geliri = 0.0
+        acik_artirma_fiyati = None
+        if model.yil >= ETS_PARAMS["TAM_UYGULAMA"]:
+            arz = self.cap * ACIK_ARTIRMA_ORANI * model.adim_suresi(self.ajan_tipi)
+            (teklif_sahip, teklif_fiyat, teklif_miktar), _ = teklif_egrileri(yil=model.yil, **alanlar)
+            acik_artirma_fiyati, dolum = birincil_acik_artirma(teklif_fiyat, teklif_miktar, arz, taban)
+            if acik_artirma_fiyati is not None:
+                kazanilan = np.bincount(teklif_sahip, weights=dolum, minlength=n)
+                model.izin_transferi(satirlar, kazanilan, bankalandi)
+                alanlar["izin_bankasi"] = alanlar["izin_bankasi"] + kazanilan
+                self.acik_artirma_fiyati = acik_artirma_fiyati
+                # Mt × $/ton = Milyon $
+                self.acik_artirma_geliri = acik_artirma_fiyati * float(dolum.sum())
+        
+        # 2. İkincil piyasa (tesisler arası)
+        (alis_sahip, alis_fiyat, alis_miktar), (satis_sahip, satis_fiyat, satis_miktar) = \
+            teklif_egrileri(yil=model.yil, **alanlar)
+        fiyat, self.islem_hacmi, alis_dolum, satis_dolum = cift_acik_artirma(
+            alis_fiyat, alis_miktar, satis_fiyat, satis_miktar
         )
+        if self.islem_hacmi > 0:
+            transfer = (np.bincount(alis_sahip, weights=alis_dolum, minlength=n)
+                        - np.bincount(satis_sahip, weights=satis_dolum, minlength=n))
+            model.izin_transferi(satirlar, transfer, bankalandi)
+        if fiyat is None:
+            if acik_artirma_fiyati is not None:
+                fiyat = acik_artirma_fiyati
+            else:
+                fiyat = float(alis_fiyat.max()) if alis_fiyat.size else taban
+        return max(taban, min(tavan, fiyat))
 
 
 class EndustriyelTesis(Agent):
@@ -464,20 +1468,47 @@ class EndustriyelTesis(Agent):
     - [cite: EU ETS Directive] Tahsisat kuralları
     """
     
-    def __init__(self, model, sektor, city="Istanbul"):
+    ajan_tipi = "Tesis"
+    
+    # Sabit sektör parametreleri (maliyet_limit, yatirim_bedeli, duyarlilik)
+    # örnekte kopyalanmaz; paylaşılan profil sözlüğünden okunur.
+    __slots__ = (
+        "sektor", "city", "profil", "il_kodu", "sektor_kodu", "_emisyon",
+        "baslangic_emisyon", "ihracatci", "_durum", "yatirim_durumu",
+        "kalan_yatirim_suresi", "emisyon_azalma_potansiyeli", "ucretsiz_tahsisat",
+        "izin_bankasi", "net_emisyon", "bankalanan", "ceza_durumu", "ceza_miktari",
+        "_yatirim_onlemi_kaydet", "_son_adim_yili", "kapasite_mw", "emisyon_faktoru",
+    )
+    
+    def __init__(self, model, sektor, city="Istanbul", emisyon=None, ihracatci=None,
+                 kapasite_mw=0.0, emisyon_faktoru=0.0):
+        """
+        emisyon (Mt CO₂/yıl) ve ihracatci verilirse (tesisler tablosundan)
+        rastgele çekiliş yapılmaz; verilmezse temsili tesis üretilir.
+        """
         super().__init__(model)
-        self.ajan_tipi = "Tesis"
         self.sektor = sektor
         self.city = city
         self.profil = SEKTOR_PROFILLERI. get(sektor, SEKTOR_PROFILLERI["Sanayi"])
         
+        # Tam sayı il/sektör kodları (il bazlı toplamlar için)
+        self.il_kodu = model.toplamlar.il_kodu(city) if hasattr(model, 'toplamlar') else -1
+        self.sektor_kodu = SEKTOR_KODLARI.get(sektor, SEKTOR_KODLARI["Sanayi"])
+        
+        # Gerçek santral verisi (temsili tesislerde 0)
+        self.kapasite_mw = kapasite_mw  # MW
+        self.emisyon_faktoru = emisyon_faktoru  # tCO₂/MWh
+        
         # Emisyon (heterojen) - il katsayısı ile çarpılır
-        il_katsayi = model.il_katsayilari. get(city, {}).get(sektor. lower(), 1.0) if hasattr(model, 'il_katsayilari') else 1.0
-        self.emisyon = self.profil["baz_emisyon"] * np.random.uniform(0.7, 1.3) * il_katsayi  # Mt CO₂/yıl
+        if emisyon is None:
+            il_katsayi = model.il_katsayilari. get(city, {}).get(sektor. lower(), 1.0) if hasattr(model, 'il_katsayilari') else 1.0
+            akis = model.akislar["tesis"]
+            emisyon = self.profil["baz_emisyon"] * akis.uniform(0.7, 1.3) * il_katsayi  # Mt CO₂/yıl
+            # SKDM:  İhracatçı mı? 
+            ihracatci = akis.random() < self.profil["ihracat_orani"]
+        self.emisyon = emisyon
         self.baslangic_emisyon = self.emisyon
-        
-        # SKDM:  İhracatçı mı? 
-        self.ihracatci = random.random() < self.profil["ihracat_orani"]
+        self.ihracatci = ihracatci
         
         # Durum
         self.durum = "Aktif"  # Aktif, Donusum, Temiz, Kapali
@@ -485,24 +1516,73 @@ class EndustriyelTesis(Agent):
         self.kalan_yatirim_suresi = 0
         self.emisyon_azalma_potansiyeli = 0
         
-        # Maliyet parametreleri
-        self.maliyet_limit = self.profil["maliyet_limit"]  # Milyon $/yıl
-        self. yatirim_bedeli = self. profil["yatirim_bedeli"]  # Milyon $
-        self. duyarlilik = self.profil["duyarlilik"]
-        
         # ETS mekanizmaları (YENİ)
         self.ucretsiz_tahsisat = 0  # tCO₂/yıl
         self.izin_bankasi = 0  # tCO₂ (birikmiş izinler)
         self.net_emisyon = 0  # tCO₂ (tahsisat sonrası)
+        self.bankalanan = 0.0  # son bankalamada bankaya eklenen (-: kullanılan)
         
         # Ceza takibi (YENİ)
         self.ceza_durumu = False
         self.ceza_miktari = 0.0  # Milyon $
         
+        # Son çalışılan yıl (0 = henüz çalışmadı); uykudan uyanınca atlanan
+        # yıllar _uykuyu_yakala ile işlenir
+        self._son_adim_yili = 0
+    
+    @property
+    def maliyet_limit(self):
+        """İşletme kapanma eşiği (Milyon $/yıl)."""
+        return self.profil["maliyet_limit"]
+    
+    @property
+    def yatirim_bedeli(self):
+        """Temiz teknoloji yatırım bedeli (Milyon $)."""
+        return self.profil["yatirim_bedeli"]
+    
+    @property
+    def duyarlilik(self):
+        """Politika duyarlılığı ("Vergi" / "Tesvik")."""
+        return self.profil["duyarlilik"]
+    
+    # Aktif değilken adımı fiyata bağlı değil, uyutulabilir (bkz. IhracatciAjani)
+    fiyat_abonesi = False
+    
+    @property
+    def durum(self):
+        """Tesis durumu: Aktif, Donusum, Temiz, Kapali."""
+        return self._durum
+    
+    @durum.setter
+    def durum(self, yeni):
+        # Geçişi modelin kayıt defterine bildir (durum bazlı koleksiyonlar)
+        eski = getattr(self, '_durum', None)
+        self._durum = yeni
+        kayit = getattr(self.model, 'kayit', None)
+        if kayit is not None:
+            kayit.durum_degisti(self, eski, yeni)
+        toplamlar = getattr(self.model, 'toplamlar', None)
+        if toplamlar is not None:
+            toplamlar.durum_degisti(self.il_kodu, self.sektor_kodu, eski, yeni)
+    
+    @property
+    def emisyon(self):
+        """Yıllık emisyon (Mt CO₂/yıl); değişiklikler model toplamlarına yansır."""
+        return self._emisyon
+    
+    @emisyon.setter
+    def emisyon(self, yeni):
+        eski = getattr(self, '_emisyon', 0)
+        self._emisyon = yeni
+        toplamlar = getattr(self.model, 'toplamlar', None)
+        if toplamlar is not None:
+            toplamlar.tesis_emisyon_degisti(self.il_kodu, self.sektor_kodu, yeni - eski)
+        
     def step(self):
         """Her yıl için tesis karar adımı."""
         if self.durum == "Kapali":
             return
+        self._uykuyu_yakala()
         
         # 1. Efektif Karbon Fiyatı (SKDM dahil)
         if self.ihracatci and self.profil["skdm_kapsam"]:
@@ -511,30 +1591,7 @@ class EndustriyelTesis(Agent):
             efektif_fiyat = self.model.karbon_fiyati
         
         # 2. ÜCRETSİZ TAHSİSAT HESAPLA (YENİ)
-        if self.model.yil >= ETS_PARAMS["PILOT_BASLANGIC"]:
-            if self.model.yil < ETS_PARAMS["TAM_UYGULAMA"]: 
-                ucretsiz_oran = 1.0  # Pilot dönem %100
-            else:
-                ucretsiz_oran = 0.7  # Tam uygulama %70
-            
-            self.ucretsiz_tahsisat = self.baslangic_emisyon * ucretsiz_oran
-            
-            # BANKALAMA MEKANİZMASI (YENİ)
-            fazla_tahsisat = self.ucretsiz_tahsisat - self.emisyon
-            
-            if fazla_tahsisat > 0:
-                # Fazla izni bankala
-                self.izin_bankasi += fazla_tahsisat
-                self.net_emisyon = 0
-            else:
-                # Önce bankadan kullan
-                eksik = abs(fazla_tahsisat)
-                bankadan_kullan = min(eksik, self.izin_bankasi)
-                self.izin_bankasi -= bankadan_kullan
-                self.net_emisyon = eksik - bankadan_kullan
-        else:
-            # ETS öncesi dönem
-            self.net_emisyon = 0
+        self._bankala(self.model.yil)
         
         # 3. Yatırım süreci devam ediyor mu?
         if self. kalan_yatirim_suresi > 0:
@@ -555,6 +1612,52 @@ class EndustriyelTesis(Agent):
                 self. durum = "Kapali"
                 self.emisyon = 0
     
+    def _uykuyu_yakala(self):
+        """
+        Uyurken atlanan yılların (Donusum/Temiz) bankalama ve yatırım geri
+        sayımını işler. Uyuyan tesisin emisyonu değişmediğinden sonuç her yıl
+        çalışmış olmasıyla aynıdır; tamamlanma yılında zaten uyandırılır.
+        """
+        self._yillari_yakala()
+        self._son_adim_yili = self.model.yil
+    
+    def _yillari_yakala(self):
+        """Atlanan yılları geçen yıla kadar işler (emir defteri de kullanır)."""
+        if self._son_adim_yili and self._son_adim_yili < self.model.yil - 1:
+            for yil in range(self._son_adim_yili + 1, self.model.yil):
+                self._bankala(yil)
+                if self.kalan_yatirim_suresi > 0:
+                    self.kalan_yatirim_suresi -= 1
+            self._son_adim_yili = self.model.yil - 1
+    
+    def _bankala(self, yil):
+        """Yılın ücretsiz tahsisatı ve izin bankalama mekanizması."""
+        if yil >= ETS_PARAMS["PILOT_BASLANGIC"]:
+            # Pilot dönem %100, tam uygulama %70
+            ucretsiz_oran = ucretsiz_tahsisat_orani(yil)
+            
+            self.ucretsiz_tahsisat = self.baslangic_emisyon * ucretsiz_oran
+            
+            # BANKALAMA MEKANİZMASI (YENİ)
+            fazla_tahsisat = self.ucretsiz_tahsisat - self.emisyon
+            
+            if fazla_tahsisat > 0:
+                # Fazla izni bankala
+                self.izin_bankasi += fazla_tahsisat
+                self.net_emisyon = 0
+                self.bankalanan = fazla_tahsisat
+            else:
+                # Önce bankadan kullan
+                eksik = abs(fazla_tahsisat)
+                bankadan_kullan = min(eksik, self.izin_bankasi)
+                self.izin_bankasi -= bankadan_kullan
+                self.net_emisyon = eksik - bankadan_kullan
+                self.bankalanan = -bankadan_kullan
+        else:
+            # ETS öncesi dönem
+            self.net_emisyon = 0
+            self.bankalanan = 0.0
+    
     def _karar_ver(self, efektif_fiyat):
         """
         Geliştirilmiş karar algoritması - Hibrit ve Dinamik Yapı. 
@@ -581,21 +1684,23 @@ class EndustriyelTesis(Agent):
         
         # --- GELİŞTİRİLMİŞ KARAR MEKANİZMASI ---
         
-        # NPV Parametreleri
-        r = 0.08  # İskonto oranı (Türkiye risk primi dahil)
-        ekonomik_omur = 10  # Yatırım ekonomik ömrü (yıl)
+        # NPV Parametreleri (model parametreleri)
+        r = self.model.iskonto_orani  # İskonto oranı (Türkiye risk primi dahil)
+        ekonomik_omur = self.model.ekonomik_omur  # Yatırım ekonomik ömrü (yıl)
         
-        # Her MAC önlemi için NPV hesapla
-        mac_onlemler = self. profil. get("mac_onlemler", {})
+        # 1. MAC Kontrolü + en iyi önlem: sektörün geçiş fiyatı tablosundan
+        # (önlem sıralaması yalnızca efektif fiyata bağlı, döngü gerekmez)
+        kirilimlar, kazananlar = mac_gecis_tablosu(
+            SEKTOR_LISTESI[self.sektor_kodu], r, ekonomik_omur
+        )
+        j = kazananlar[bisect_left(kirilimlar, efektif_fiyat)]
         en_iyi_npv = -9999
         en_iyi_onlem = None
         
-        for onlem_adi, onlem in mac_onlemler.items():
-            # 1. MAC Kontrolü
-            if onlem["mac"] >= efektif_fiyat: 
-                continue  # Bu önlem karbon fiyatından pahalı, atla
+        if j >= 0:
+            onlem_adi, onlem = list(self.profil["mac_onlemler"].items())[j]
             
-            # 2. NPV Hesabı (her önlem için özel)
+            # 2. NPV Hesabı (kazanan önlem için)
             yillik_azaltim = self.emisyon * onlem["potansiyel"]  # tCO₂/yıl
             yillik_tasarruf = yillik_azaltim * efektif_fiyat * 1e6  # $/yıl (Mt -> ton)
             
@@ -605,15 +1710,9 @@ class EndustriyelTesis(Agent):
             else:
                 yatirim_maliyeti = 0  # Negatif MAC = kar ediyor
             
-            # NPV Formülü: -Yatırım + Σ(Tasarruf / (1+r)^t)
-            npv = -yatirim_maliyeti
-            for t in range(1, ekonomik_omur + 1):
-                npv += yillik_tasarruf / ((1 + r) ** t)
-            
-            # En iyi NPV'yi kaydet
-            if npv > en_iyi_npv: 
-                en_iyi_npv = npv
-                en_iyi_onlem = (onlem_adi, onlem)
+            # NPV Formülü: -Yatırım + Σ(Tasarruf / (1+r)^t) = -Yatırım + Tasarruf × AF
+            en_iyi_npv = npv_hesapla(yatirim_maliyeti, yillik_tasarruf, r, ekonomik_omur)
+            en_iyi_onlem = (onlem_adi, onlem)
         
         # Yatırım kararı:  En iyi NPV pozitifse
         if en_iyi_npv > 0:
@@ -667,19 +1766,50 @@ class IhracatciAjani(EndustriyelTesis):
     - [cite:  OECD 2024] Sınır karbon ayarlaması etkileri
     """
     
-    def __init__(self, model, sektor, city="Istanbul"):
-        super().__init__(model, sektor, city=city)
-        self.ajan_tipi = "IhracatciTesis"
-        self.ihracat_payi = self.profil["ihracat_orani"]
+    ajan_tipi = "IhracatciTesis"
+    
+    __slots__ = ("_cbam_maliyeti", "rekabet_gucu_indeksi")
+    
+    def __init__(self, model, sektor, city="Istanbul", **tesis_verisi):
+        """tesis_verisi: tablodan gelen EndustriyelTesis alanları (emisyon, ihracatci, ...)."""
+        super().__init__(model, sektor, city=city, **tesis_verisi)
         self.cbam_maliyeti = 0.0  # Milyon $/yıl
         self. rekabet_gucu_indeksi = 1.0  # 0-1 arası
+    
+    @property
+    def ihracat_payi(self):
+        """Sektörün ihracat oranı."""
+        return self.profil["ihracat_orani"]
+    
+    @property
+    def fiyat_abonesi(self):
+        """CBAM maliyeti adımdaki fiyatlara bağlı: Aktif olmasa da uyutulmaz."""
+        return self.ihracatci and self.profil["skdm_kapsam"]
+    
+    @property
+    def cbam_maliyeti(self):
+        """CBAM maliyeti (Milyon $/yıl); değişiklikler model toplamlarına yansır."""
+        return self._cbam_maliyeti
+    
+    @cbam_maliyeti.setter
+    def cbam_maliyeti(self, yeni):
+        eski = getattr(self, '_cbam_maliyeti', 0.0)
+        self._cbam_maliyeti = yeni
+        toplamlar = getattr(self.model, 'toplamlar', None)
+        if toplamlar is not None:
+            toplamlar.cbam_degisti(yeni - eski)
         
     def step(self):
         """İhracatçı ajan adımı - CBAM maliyeti hesaplar."""
         if self.durum == "Kapali":
             return
+        self._cbam_hesapla()
         
-        # CBAM Maliyeti Hesaplama
+        # Üst sınıfın step metodunu çağır
+        super().step()
+    
+    def _cbam_hesapla(self):
+        """CBAM maliyeti ve rekabet gücü (uyurken fiyat değişiminde de çağrılır)."""
         if self.ihracatci and self.profil["skdm_kapsam"]:
             # CBAM maliyeti = Emisyon × AB SKDM fiyatı
             self.cbam_maliyeti = self.emisyon * self.model.ab_skdm_fiyat  # Milyon $
@@ -694,9 +1824,6 @@ class IhracatciAjani(EndustriyelTesis):
             self._rekabet_gucu_hesapla()
         else:
             self.cbam_maliyeti = 0.0
-        
-        # Üst sınıfın step metodunu çağır
-        super().step()
     
     def _rekabet_gucu_hesapla(self):
         """CBAM maliyetine göre rekabet gücü indeksini hesaplar."""
@@ -707,6 +1834,394 @@ class IhracatciAjani(EndustriyelTesis):
             self.rekabet_gucu_indeksi = 1.0
 
 
+# =============================================================================
+# VEKTÖREL TESİS MOTORU (STRUCT-OF-ARRAYS)
+# =============================================================================
+"""
+Vektörel Tesis Motoru
+=====================
+
+On binlerce tesisli üretim koşuları için EndustriyelTesis / IhracatciAjani
+durumunu her alan için ayrı, bitişik NumPy dizilerinde tutar. Tahsisat,
+bankalama, yatırım geri sayımı, MAC/NPV kararı ve kapanma eşiği tüm tesisler
+üzerinde tek bir toplu adımda çalışır.
+
+Karar kuralları EndustriyelTesis.step / _karar_ver / _yatirim_baslat ile
+birebir aynıdır; aynı seed ile nesne tabanlı modelin sonuçlarını üretir.
+"""
+
+
+# Vektörel adım sırası kodları: kod = satir * 3 + tur
+SLOT_AJAN, SLOT_TESIS, SLOT_HANE = range(3)
+
+# _yatirim_baslat'taki "genel_iyilestirme" geri dönüş önlemi
+GENEL_ONLEM = -2
+GENEL_ONLEM_SURE = 3
+GENEL_ONLEM_POTANSIYEL = 0.20
+
+
+def _sirali_toplam(degerler):
+    """
+    Soldan sağa sıralı toplam.
+
+    np.sum ikili (pairwise) toplama yapar; Python'un sum() sırasıyla aynı
+    sonucu (bit düzeyinde) vermek için kümülatif toplamın son elemanı alınır.
+    """
+    degerler = np.asarray(degerler, dtype=float)
+    if degerler.size == 0:
+        return 0
+    return float(np.cumsum(degerler)[-1])
+
+
+class TesisDizisi:
+    """
+    EndustriyelTesis ve IhracatciAjani için struct-of-arrays durum deposu.
+
+    Her satır bir tesistir; satır sırası nesne modelindeki oluşturulma
+    sırasıyla aynıdır (Enerji, Sanayi, Tarım, İhracatçı).
+
+    Alanlar:
+    --------
+    emisyon, baslangic_emisyon : Mt CO₂/yıl
+    durum : int8 (DURUM_KODLARI indeksi)
+    kalan_yatirim_suresi : yıl
+    izin_bankasi, ucretsiz_tahsisat, net_emisyon : Mt CO₂
+    bankalanan : son bankalamada bankaya eklenen (-: kullanılan) izin, Mt CO₂
+    ceza_durumu : bool
+    cbam_maliyeti : Milyon $/yıl
+    son_adim_yili : uykudan uyanan satırların atlanan yılları için
+    kapasite_mw, emisyon_faktoru : tesisler tablosundan (temsili tesislerde 0)
+    """
+
+    ALANLAR = {
+        "sektor_kodu": np.int8,
+        "il_kodu": np.int32,
+        "ihracatci_tesis": np.bool_,   # IhracatciAjani satırı mı?
+        "ihracatci": np.bool_,         # İhraç yapıyor mu? (SKDM)
+        "emisyon": np.float64,
+        "baslangic_emisyon": np.float64,
+        "durum": np.int8,
+        "kalan_yatirim_suresi": np.int16,
+        "emisyon_azalma_potansiyeli": np.float64,
+        "yatirim_onlemi": np.int16,    # sektör önlem indeksi, -1 yok
+        "ucretsiz_tahsisat": np.float64,
+        "izin_bankasi": np.float64,
+        "net_emisyon": np.float64,
+        "bankalanan": np.float64,
+        "ceza_durumu": np.bool_,
+        "son_adim_yili": np.int16,     # son çalışılan yıl (0 = henüz yok)
+        "ceza_miktari": np.float64,
+        "cbam_maliyeti": np.float64,
+        "rekabet_gucu_indeksi": np.float64,
+        "kapasite_mw": np.float64,
+        "emisyon_faktoru": np.float64,     # tCO₂/MWh
+    }
+
+    def __init__(self, kapasite=0, toplamlar=None, iskonto_orani=0.08, ekonomik_omur=10):
+        self.n = 0
+        self.toplamlar = toplamlar  # EmisyonToplamlari (varsa deltalar bildirilir)
+        self.iskonto_orani = iskonto_orani
+        self.ekonomik_omur = ekonomik_omur
+        for alan, dtype in self.ALANLAR.items():
+            setattr(self, alan, np.zeros(kapasite, dtype=dtype))
+        self._sektor_tablolari_olustur()
+
+    def _sektor_tablolari_olustur(self):
+        """Sektör profillerini satır bazlı erişim için dizilere açar."""
+        n_onlem = max(len(p["mac_onlemler"]) for p in SEKTOR_PROFILLERI.values())
+        s = len(SEKTOR_LISTESI)
+        self.s_maliyet_limit = np.empty(s)
+        self.s_yatirim_bedeli = np.empty(s)
+        self.s_tesvik_duyarli = np.zeros(s, dtype=bool)
+        self.s_skdm_kapsam = np.zeros(s, dtype=bool)
+        # Önlem tabloları: geçersiz hücrelerde MAC = +inf (hiç seçilmez)
+        self.s_mac = np.full((s, n_onlem), np.inf)
+        self.s_potansiyel = np.zeros((s, n_onlem))
+        self.s_sure = np.zeros((s, n_onlem), dtype=np.int16)
+        for i, sektor in enumerate(SEKTOR_LISTESI):
+            profil = SEKTOR_PROFILLERI[sektor]
+            self.s_maliyet_limit[i] = profil["maliyet_limit"]
+            self.s_yatirim_bedeli[i] = profil["yatirim_bedeli"]
+            self.s_tesvik_duyarli[i] = profil["duyarlilik"] == "Tesvik"
+            self.s_skdm_kapsam[i] = profil["skdm_kapsam"]
+            for j, onlem in enumerate(profil.get("mac_onlemler", {}).values()):
+                self.s_mac[i, j] = onlem["mac"]
+                self.s_potansiyel[i, j] = onlem["potansiyel"]
+                self.s_sure[i, j] = onlem["sure"]
+
+    # -------------------------------------------------------------------------
+    # OLUŞTURMA
+    # -------------------------------------------------------------------------
+
+    def _buyut(self, yeni_kapasite):
+        for alan in self.ALANLAR:
+            eski = getattr(self, alan)
+            yeni = np.zeros(yeni_kapasite, dtype=eski.dtype)
+            yeni[:self.n] = eski[:self.n]
+            setattr(self, alan, yeni)
+
+    def ekle(self, sektor, il_kodu, emisyon, ihracatci, ihracatci_tesis=False):
+        """Yeni tesis satırı ekler ve satır indeksini döndürür."""
+        if self.n == len(self.emisyon):
+            self._buyut(max(16, 2 * self.n))
+        i = self.n
+        self.n += 1
+        self.sektor_kodu[i] = SEKTOR_KODLARI.get(sektor, SEKTOR_KODLARI["Sanayi"])
+        self.il_kodu[i] = il_kodu
+        self.ihracatci_tesis[i] = ihracatci_tesis
+        self.ihracatci[i] = ihracatci
+        self.emisyon[i] = emisyon
+        self.baslangic_emisyon[i] = emisyon
+        self.durum[i] = AKTIF
+        self.yatirim_onlemi[i] = -1
+        self.rekabet_gucu_indeksi[i] = 1.0
+        return i
+
+    def toplu_ekle(self, sektor_kodu, il_kodu, emisyon, ihracatci, kapasite_mw, emisyon_faktoru,
+                   ihracatci_tesis=False):
+        """
+        Tesisler tablosu satırlarını tek seferde ekler ve eklenen satır
+        indekslerini döndürür. ihracatci_tesis (skaler veya satır dizisi)
+        IhracatciAjani satırlarını işaretler.
+        """
+        k = len(emisyon)
+        if self.n + k > len(self.emisyon):
+            self._buyut(self.n + k)
+        satirlar = np.arange(self.n, self.n + k)
+        self.n += k
+        self.sektor_kodu[satirlar] = sektor_kodu
+        self.il_kodu[satirlar] = il_kodu
+        self.ihracatci_tesis[satirlar] = ihracatci_tesis
+        self.ihracatci[satirlar] = ihracatci
+        self.emisyon[satirlar] = emisyon
+        self.baslangic_emisyon[satirlar] = emisyon
+        self.kapasite_mw[satirlar] = kapasite_mw
+        self.emisyon_faktoru[satirlar] = emisyon_faktoru
+        self.durum[satirlar] = AKTIF
+        self.yatirim_onlemi[satirlar] = -1
+        self.rekabet_gucu_indeksi[satirlar] = 1.0
+        return satirlar
+
+    def tamamla(self):
+        """
+        Oluşturmayı tamamlar: dizileri tesis sayısına kırpar ve başlangıç
+        emisyon/durum değerlerini toplamlara bildirir.
+        """
+        if len(self.emisyon) != self.n:
+            for alan in self.ALANLAR:
+                setattr(self, alan, getattr(self, alan)[:self.n].copy())
+        if self.toplamlar is not None:
+            self.toplamlar.tesis_deltalari(self.il_kodu, self.sektor_kodu, self.emisyon)
+            self.toplamlar.durum_deltalari(self.il_kodu, self.sektor_kodu,
+                                           np.full(self.n, -1, dtype=np.int8), self.durum)
+
+    # -------------------------------------------------------------------------
+    # TOPLU ADIM
+    # -------------------------------------------------------------------------
+
+    def adim(self, idx, karbon_fiyati, ab_skdm_fiyat, tesvik_miktari, yil):
+        """
+        Verilen satırlar için bir yıllık tesis adımını toplu olarak çalıştırır.
+
+        IhracatciAjani.step (CBAM) + EndustriyelTesis.step ile aynı sıra:
+        CBAM → efektif fiyat → tahsisat/bankalama → yatırım geri sayımı → karar.
+        """
+        idx = idx[self.durum[idx] != KAPALI]
+        if idx.size == 0:
+            return
+        self._uykuyu_yakala(idx, yil)
+        if self.toplamlar is not None:
+            eski = (self.emisyon[idx], self.durum[idx], self.cbam_maliyeti[idx])
+        sektor = self.sektor_kodu[idx]
+        skdm = self.ihracatci[idx] & self.s_skdm_kapsam[sektor]
+        
+        # 0. CBAM (sadece IhracatciAjani satırları)
+        ihr = self.ihracatci_tesis[idx]
+        self._cbam_hesapla(idx[ihr & skdm], karbon_fiyati, ab_skdm_fiyat)
+        self.cbam_maliyeti[idx[ihr & ~skdm]] = 0.0
+        
+        # 1. Efektif Karbon Fiyatı (SKDM dahil)
+        efektif_fiyat = np.where(skdm, max(karbon_fiyati, ab_skdm_fiyat), karbon_fiyati)
+        
+        # 2. Ücretsiz tahsisat ve bankalama
+        self._bankala(idx, yil)
+        
+        # 3. Yatırım geri sayımı
+        yatirimda = self.kalan_yatirim_suresi[idx] > 0
+        sayan = idx[yatirimda]
+        self.kalan_yatirim_suresi[sayan] -= 1
+        biten = sayan[self.kalan_yatirim_suresi[sayan] == 0]
+        self.emisyon[biten] *= (1 - self.emisyon_azalma_potansiyeli[biten])
+        self.durum[biten] = TEMIZ
+        self.ceza_durumu[biten] = False
+        
+        # 4. Karar mekanizması (sadece Aktif tesisler)
+        karar = ~yatirimda & (self.durum[idx] == AKTIF)
+        self._karar_ver(idx[karar], efektif_fiyat[karar], tesvik_miktari)
+        
+        # 5. Toplamlara farkları bildir
+        if self.toplamlar is not None:
+            il_kodu = self.il_kodu[idx]
+            self.toplamlar.tesis_deltalari(il_kodu, sektor, self.emisyon[idx] - eski[0])
+            self.toplamlar.durum_deltalari(il_kodu, sektor, eski[1], self.durum[idx])
+            self.toplamlar.cbam_degisti(float((self.cbam_maliyeti[idx] - eski[2]).sum()))
+
+    def _uykuyu_yakala(self, idx, yil):
+        """EndustriyelTesis._uykuyu_yakala (toplu): atlanan yılları işler."""
+        self._yillari_yakala(idx, yil)
+        self.son_adim_yili[idx] = yil
+
+    def _yillari_yakala(self, idx, yil):
+        """EndustriyelTesis._yillari_yakala (toplu): geçen yıla kadar."""
+        son = self.son_adim_yili[idx]
+        geride = idx[(son > 0) & (son < yil - 1)]
+        if geride.size:
+            son = self.son_adim_yili[geride]
+            for y in range(int(son.min()) + 1, yil):
+                satir = geride[son < y]
+                self._bankala(satir, y)
+                sayan = satir[self.kalan_yatirim_suresi[satir] > 0]
+                self.kalan_yatirim_suresi[sayan] -= 1
+            self.son_adim_yili[geride] = yil - 1
+
+    def _bankala(self, idx, yil):
+        """Ücretsiz tahsisat ve bankalama (EndustriyelTesis._bankala, toplu)."""
+        if yil >= ETS_PARAMS["PILOT_BASLANGIC"]:
+            tahsisat = self.baslangic_emisyon[idx] * ucretsiz_tahsisat_orani(yil)
+            self.ucretsiz_tahsisat[idx] = tahsisat
+            fazla = tahsisat - self.emisyon[idx]
+            banka = self.izin_bankasi[idx]
+            eksik = np.where(fazla > 0, 0.0, np.abs(fazla))
+            bankadan_kullan = np.minimum(eksik, banka)
+            self.izin_bankasi[idx] = np.where(fazla > 0, banka + fazla, banka - bankadan_kullan)
+            self.net_emisyon[idx] = np.where(fazla > 0, 0.0, eksik - bankadan_kullan)
+            self.bankalanan[idx] = np.where(fazla > 0, fazla, -bankadan_kullan)
+        else:
+            self.net_emisyon[idx] = 0
+            self.bankalanan[idx] = 0
+
+    def abone_mi(self, idx):
+        """Satırların CBAM'ı fiyatlara bağlı mı (SKDM kapsamlı IhracatciAjani)."""
+        return (self.ihracatci_tesis[idx] & self.ihracatci[idx]
+                & self.s_skdm_kapsam[self.sektor_kodu[idx]])
+
+    def _cbam_hesapla(self, idx, karbon_fiyati, ab_skdm_fiyat):
+        """IhracatciAjani.step CBAM maliyeti ve rekabet gücü indeksi."""
+        cbam = self.emisyon[idx] * ab_skdm_fiyat
+        if karbon_fiyati > 0:
+            cbam = cbam - np.minimum(cbam, self.emisyon[idx] * karbon_fiyati)
+        self.cbam_maliyeti[idx] = cbam
+        maliyet_esik = 50  # Milyon $
+        self.rekabet_gucu_indeksi[idx] = np.where(
+            cbam > 0, np.maximum(0.3, 1.0 - (cbam / maliyet_esik) * 0.1), 1.0
+        )
+
+    def _karar_ver(self, idx, efektif_fiyat, tesvik_miktari):
+        """EndustriyelTesis._karar_ver + _yatirim_baslat (toplu)."""
+        if idx.size == 0:
+            return
+        sektor = self.sektor_kodu[idx]
+        
+        # Teşvik duyarlı sektörler (Tarım): sadece teşvik eşiğine bakılır
+        tesvik_duyarli = self.s_tesvik_duyarli[sektor]
+        tesvik_yatirim = tesvik_duyarli & (
+            tesvik_miktari >= self.s_yatirim_bedeli[sektor] * 0.6 * 1000
+        )
+        
+        # Ceza aldıysa zorla yatırım
+        cezali = ~tesvik_duyarli & self.ceza_durumu[idx]
+        
+        # MAC + NPV (her önlem için, sözlük sırasıyla)
+        npv_adayi = ~tesvik_duyarli & ~cezali
+        en_iyi_npv, en_iyi_onlem = self._en_iyi_npv(
+            idx[npv_adayi], sektor[npv_adayi], efektif_fiyat[npv_adayi]
+        )
+        npv_yatirim = np.zeros(idx.size, dtype=bool)
+        npv_yatirim[npv_adayi] = en_iyi_npv > 0
+        secilen = np.full(idx.size, -1, dtype=np.int16)
+        secilen[npv_adayi] = en_iyi_onlem
+        
+        # Kapanma eşiği: net emisyon maliyeti limiti geçerse
+        net = self.net_emisyon[idx]
+        kapat = (npv_adayi & ~npv_yatirim & (net > 0)
+                 & (net * efektif_fiyat > self.s_maliyet_limit[sektor]))
+        
+        kapanan = idx[kapat]
+        self.durum[kapanan] = KAPALI
+        self.emisyon[kapanan] = 0
+        
+        # Yatırım başlat: NPV'den gelen önlem, yoksa ilk uygun MAC önlemi
+        yatirim = tesvik_yatirim | cezali | npv_yatirim
+        geri_donus = yatirim & ~npv_yatirim
+        if geri_donus.any():
+            uygun = self.s_mac[sektor[geri_donus]] < efektif_fiyat[geri_donus, None]
+            ilk = np.argmax(uygun, axis=1)
+            secilen[geri_donus] = np.where(uygun.any(axis=1), ilk, GENEL_ONLEM)
+        self._yatirim_baslat(idx[yatirim], sektor[yatirim], secilen[yatirim])
+
+    def _en_iyi_npv(self, idx, sektor, efektif_fiyat):
+        """
+        Her satır için en iyi MAC önleminin NPV'si ve önlem indeksi.
+
+        Önlem sektörün geçiş fiyatı tablosundan (mac_gecis_tablosu) ikili
+        aramayla bulunur; NPV yalnızca kazanan önlem için hesaplanır.
+        """
+        en_iyi_onlem = np.full(idx.size, -1, dtype=np.int16)
+        for kod in np.unique(sektor):
+            satir = sektor == kod
+            kirilimlar, kazananlar = mac_gecis_tablosu(
+                SEKTOR_LISTESI[kod], self.iskonto_orani, self.ekonomik_omur
+            )
+            en_iyi_onlem[satir] = kazananlar[np.searchsorted(kirilimlar, efektif_fiyat[satir], side='left')]
+        
+        # NPV yalnızca kazanan önlem için
+        bulundu = en_iyi_onlem >= 0
+        j = np.where(bulundu, en_iyi_onlem, 0)
+        mac = self.s_mac[sektor, j]
+        yillik_azaltim = self.emisyon[idx] * self.s_potansiyel[sektor, j]
+        yillik_tasarruf = yillik_azaltim * efektif_fiyat * 1e6
+        yatirim_maliyeti = np.where(bulundu & (mac > 0), yillik_azaltim * np.where(bulundu, mac, 0) * 1e6, 0)
+        npv = npv_hesapla(yatirim_maliyeti, yillik_tasarruf, self.iskonto_orani, self.ekonomik_omur)
+        return np.where(bulundu, npv, -9999.0), en_iyi_onlem
+
+    def _yatirim_baslat(self, idx, sektor, onlem):
+        """Seçilen önlemle dönüşüm sürecini başlatır."""
+        genel = onlem == GENEL_ONLEM
+        j = np.where(genel, 0, onlem)
+        self.yatirim_onlemi[idx] = onlem
+        self.kalan_yatirim_suresi[idx] = np.where(genel, GENEL_ONLEM_SURE, self.s_sure[sektor, j])
+        self.emisyon_azalma_potansiyeli[idx] = np.where(
+            genel, GENEL_ONLEM_POTANSIYEL, self.s_potansiyel[sektor, j]
+        )
+        self.durum[idx] = DONUSUM
+
+    # -------------------------------------------------------------------------
+    # MRV VE RAPORLAMA
+    # -------------------------------------------------------------------------
+
+    def denetle(self, mrv):
+        """MRVAjani.step denetimi (oluşturulma sırasıyla, tek toplu çekiliş)."""
+        idx = np.flatnonzero(self.durum != KAPALI)
+        denetlenen, uyumsuz, eksik_orani = mrv.denetim_cekilisi(len(idx))
+        mrv.toplam_denetim += int(np.count_nonzero(denetlenen))
+        for k in np.flatnonzero(uyumsuz):
+            i = idx[k]
+            mrv.uyumsuz_tesis_sayisi += 1
+            eksik_emisyon = self.emisyon[i] * eksik_orani[k]  # Mt
+            ceza = eksik_emisyon * mrv.ceza_miktari  # Milyon $
+            mrv.toplam_ceza += ceza
+            self.ceza_durumu[i] = True
+            self.ceza_miktari[i] = ceza
+
+    def acik(self):
+        """Kapalı olmayan tesis maskesi."""
+        return self.durum != KAPALI
+
+    def durum_sayisi(self, durum):
+        """Belirli durumdaki tesis sayısı."""
+        return int(np.count_nonzero(self.durum == DURUM_KODLARI.index(durum)))
+
+
 class MRVAjani(Agent):
     """
     MRV (İzleme, Raporlama, Doğrulama) Ajanı - Denetim ve ceza mekanizmasını yönetir.
@@ -721,9 +2236,11 @@ class MRVAjani(Agent):
     - [cite: Zhou et al. 2016] Uyum mekanizması modellemesi
     """
     
+    ajan_tipi = "MRV"
+    toplu_adim_siniri = True
+    
     def __init__(self, model):
         super().__init__(model)
-        self.ajan_tipi = "MRV"
         self. denetim_olasiligi = 0.2  # %20 rastgele denetim
         self.ceza_miktari = ETS_PARAMS["CEZA_MIKTARI"]  # $/ton CO₂
         self.toplam_denetim = 0
@@ -734,27 +2251,59 @@ class MRVAjani(Agent):
         """MRV denetim adımı - Tesisleri rastgele denetle ve gerekirse ceza kes."""
         self. uyumsuz_tesis_sayisi = 0
         
-        for agent in self.model.agents:
-            # Sadece tesis ajanlarını denetle
-            if hasattr(agent, 'ajan_tipi') and agent.ajan_tipi in ["Tesis", "IhracatciTesis"]:
-                if agent.durum != "Kapali":
-                    # Rastgele denetim kontrolü
-                    if random.random() < self.denetim_olasiligi: 
-                        self.toplam_denetim += 1
-                        
-                        # Raporlanan vs Gerçek emisyon kontrolü simülasyonu
-                        # %5 uyumsuzluk olasılığı (eksik raporlama)
-                        if random.random() < 0.05:
-                            self.uyumsuz_tesis_sayisi += 1
-                            
-                            # Ceza hesapla:  Eksik raporlanan emisyon × ceza birim fiyatı
-                            eksik_emisyon = agent.emisyon * np.random.uniform(0.05, 0.15)  # Mt
-                            ceza = eksik_emisyon * self. ceza_miktari  # Milyon $
-                            self.toplam_ceza += ceza
-                            
-                            # EKLEME: Tesise ceza durumunu bildir
-                            agent.ceza_durumu = True
-                            agent.ceza_miktari = ceza
+        # Vektörel modda tesisler TesisDizisi satırlarıdır
+        if self.model.tesis_dizisi is not None:
+            self.model.tesis_dizisi.denetle(self)
+            return
+        
+        # Sadece açık tesis ajanlarını denetle
+        acik = [agent for agent in self.model.kayit.tesisler() if agent.durum != "Kapali"]
+        denetlenen, uyumsuz, eksik_orani = self.denetim_cekilisi(len(acik))
+        self.toplam_denetim += int(np.count_nonzero(denetlenen))
+        
+        for k in np.flatnonzero(uyumsuz):
+            agent = acik[k]
+            self.uyumsuz_tesis_sayisi += 1
+            
+            # Ceza hesapla:  Eksik raporlanan emisyon × ceza birim fiyatı
+            eksik_emisyon = agent.emisyon * eksik_orani[k]  # Mt
+            ceza = eksik_emisyon * self. ceza_miktari  # Milyon $
+            self.toplam_ceza += ceza
+            
+            # EKLEME: Tesise ceza durumunu bildir
+            agent.ceza_durumu = True
+            agent.ceza_miktari = ceza
+    
+    def denetim_cekilisi(self, n):
+        """
+        n açık tesis için tüm denetim rastgeleliğini tek çağrıda çeker.
+        
+        Tesis başına üç sayı: denetim (olasılık denetim_olasiligi), uyumsuzluk
+        (%5, eksik raporlama) ve eksik raporlanan emisyon oranı U(0.05, 0.15).
+        Çekiliş sayısı sonuçtan bağımsız olduğundan nesne ve dizi modları aynı
+        akışı aynı şekilde tüketir.
+        
+        Returns: (denetlenen, uyumsuz, eksik_orani) dizileri
+        """
+        u = self.model.akislar["mrv"].random((n, 3))
+        denetlenen = u[:, 0] < self.denetim_olasiligi
+        uyumsuz = denetlenen & (u[:, 1] < 0.05)
+        eksik_orani = 0.05 + 0.1 * u[:, 2]
+        return denetlenen, uyumsuz, eksik_orani
+
+
+# Gelir grubuna göre elektrik tüketimi (kWh/yıl) ve fiyat elastikiyeti
+GELIR_GRUPLARI = ("dusuk", "orta", "yuksek")
+HANE_TUKETIM_ARALIGI = {
+    "dusuk": (1500, 2500),
+    "orta": (2500, 4000),
+    "yuksek": (4000, 6000)
+}
+HANE_ELASTIKIYET = {  # Labandeira et al. 2017
+    "dusuk": -0.6,
+    "orta": -0.4,
+    "yuksek": -0.25
+}
 
 
 class Hanehalki(Agent):
@@ -766,34 +2315,49 @@ class Hanehalki(Agent):
     - [cite: TÜİK 2024] Hanehalkı enerji tüketimi istatistikleri
     """
     
+    ajan_tipi = "Hanehalki"
+    
+    __slots__ = ("city", "il_kodu", "gelir_grubu", "tuketim", "_emisyon",
+                 "baslangic_emisyon", "durum")
+    
     def __init__(self, model, city="Istanbul"):
         super().__init__(model)
-        self.ajan_tipi = "Hanehalki"
         self.city = city
+        toplamlar = getattr(model, 'toplamlar', None)
+        self.il_kodu = toplamlar.il_kodu(city) if toplamlar is not None else -1
+        if toplamlar is not None:
+            toplamlar.hane_eklendi(self.il_kodu)
         
-        # Gelir grubu ve tüketim parametreleri
-        self.gelir_grubu = random.choice(["dusuk", "orta", "yuksek"])
+        # Gelir grubu ve tüketim parametreleri (HaneDizisi ile aynı çekiliş)
+        u_grup, u_tuketim = model.akislar["hanehalki"].random(2)
+        self.gelir_grubu = GELIR_GRUPLARI[int(u_grup * len(GELIR_GRUPLARI))]
         
         # Gelir grubuna göre elektrik tüketimi (kWh/yıl)
-        tuketim_aralik = {
-            "dusuk": (1500, 2500),
-            "orta": (2500, 4000),
-            "yuksek": (4000, 6000)
-        }
-        min_t, max_t = tuketim_aralik[self.gelir_grubu]
-        self. tuketim = np.random.uniform(min_t, max_t)  # kWh/yıl
+        min_t, max_t = HANE_TUKETIM_ARALIGI[self.gelir_grubu]
+        self. tuketim = min_t + (max_t - min_t) * u_tuketim  # kWh/yıl
         
         # Emisyon hesabı:  kWh -> MWh -> ton CO₂
         self.emisyon = (self.tuketim / 1000) * model. EMISYON_FAKTORU_TR  # ton CO₂/yıl
         self.baslangic_emisyon = self.emisyon
         self.durum = "Aktif"
-        
-        # Fiyat elastikiyesi (Labandeira et al. 2017)
-        self.elastikiyet = {
-            "dusuk": -0.6,
-            "orta": -0.4,
-            "yuksek": -0.25
-        }[self.gelir_grubu]
+    
+    @property
+    def elastikiyet(self):
+        """Fiyat elastikiyeti, gelir grubuna göre (Labandeira et al. 2017)."""
+        return HANE_ELASTIKIYET[self.gelir_grubu]
+    
+    @property
+    def emisyon(self):
+        """Yıllık emisyon (ton CO₂/yıl); değişiklikler model toplamlarına yansır."""
+        return self._emisyon
+    
+    @emisyon.setter
+    def emisyon(self, yeni):
+        eski = getattr(self, '_emisyon', 0)
+        self._emisyon = yeni
+        toplamlar = getattr(self.model, 'toplamlar', None)
+        if toplamlar is not None:
+            toplamlar.hane_emisyon_degisti(self.il_kodu, yeni - eski)
     
     def step(self):
         """Hanehalkı tüketim ve emisyon güncelleme adımı."""
@@ -810,6 +2374,60 @@ class Hanehalki(Agent):
         else:
             self.emisyon = (self.tuketim / 1000) * self.model.EMISYON_FAKTORU_TR
 
+
+class HaneDizisi:
+    """
+    Dizi tabanlı hanehalkı nüfusu (milyonlarca hane için).
+    
+    Hanehalki ajanının durumunu hane başına birkaç baytlık dizilerde tutar:
+    gelir grubu kodu (int8), il kodu (int16), tüketim ve emisyon (float64).
+    Yıllık güncelleme tek bir vektörel işlemdir; elastikiyet gelir grubu
+    kodundan tabloyla okunur. Haneler hiç kapanmadığından durum tutulmaz.
+    
+    Aynı seed ile Hanehalki ajanlarıyla aynı sonuçları üretir.
+    """
+    
+    TUKETIM_ALT = np.array([HANE_TUKETIM_ARALIGI[g][0] for g in GELIR_GRUPLARI], dtype=float)
+    TUKETIM_UST = np.array([HANE_TUKETIM_ARALIGI[g][1] for g in GELIR_GRUPLARI], dtype=float)
+    ELASTIKIYET = np.array([HANE_ELASTIKIYET[g] for g in GELIR_GRUPLARI])
+    
+    def __init__(self, model, n):
+        """
+        n hane oluşturur; rastgele sayılar Hanehalki ile aynı akışlardan aynı
+        sırayla, tek toplu çağrıyla çekilir (il: konum, gelir grubu ve
+        tüketim: hanehalki akışı).
+        """
+        self.il_kodu = model.il_indeksleri(n).astype(np.int16)
+        u = model.akislar["hanehalki"].random((n, 2))
+        gelir_grubu = (u[:, 0] * len(GELIR_GRUPLARI)).astype(np.int8)
+        self.gelir_grubu = gelir_grubu
+        alt, ust = self.TUKETIM_ALT[gelir_grubu], self.TUKETIM_UST[gelir_grubu]
+        self.tuketim = alt + (ust - alt) * u[:, 1]  # kWh/yıl
+        self.emisyon = (self.tuketim / 1000) * model.EMISYON_FAKTORU_TR  # ton CO₂/yıl
+        
+        self.toplamlar = getattr(model, 'toplamlar', None)
+        if self.toplamlar is not None:
+            self.toplamlar.hane_deltalari(self.il_kodu, self.emisyon, yeni=True)
+    
+    @property
+    def n(self):
+        return len(self.tuketim)
+    
+    def adim(self, idx, karbon_fiyati, emisyon_faktoru):
+        """Verilen hanelerin emisyonunu güncel fiyat ve şebeke faktörüyle günceller."""
+        eski = self.emisyon[idx]
+        if karbon_fiyati > 0:
+            fiyat_orani = karbon_fiyati / 100  # 100 $/ton referans
+            fiyat_etkisi = np.maximum(0.5, 1 + (self.ELASTIKIYET * fiyat_orani))
+            self.emisyon[idx] = (
+                (self.tuketim[idx] / 1000) * emisyon_faktoru * fiyat_etkisi[self.gelir_grubu[idx]]
+            )
+        else:
+            self.emisyon[idx] = (self.tuketim[idx] / 1000) * emisyon_faktoru
+        
+        if self.toplamlar is not None:
+            self.toplamlar.hane_deltalari(self.il_kodu[idx], self.emisyon[idx] - eski)
+
 # =============================================================================
 # ULAŞIM SEKTÖRÜ AJANI 
 # =============================================================================
@@ -886,6 +2504,14 @@ class UlasimAgent(Agent):
     >>> print(karayolu.emisyon_miktari)  # Mt CO₂
     """
     
+    ajan_tipi = "Ulasim"
+    
+    __slots__ = (
+        "ulasim_tipi", "city", "yakit_tuketimi", "emisyon_faktoru", "modal_share",
+        "ev_yatirim_esik", "aciklama", "emisyon_miktari", "baslangic_emisyon",
+        "ev_pay", "max_ev_pay", "ev_buyume_hizi", "durum", "yatirim_sayisi",
+    )
+    
     def __init__(self, model, ulasim_tipi, city="Ulusal"):
         """
         Ulaşım ajanı başlatıcı. 
@@ -897,7 +2523,6 @@ class UlasimAgent(Agent):
         - İl bazlı katsayı uygulanır (varsa)
         """
         super().__init__(model)
-        self.ajan_tipi = "Ulasim"
         self.ulasim_tipi = ulasim_tipi
         self.city = city
         
@@ -1160,11 +2785,21 @@ class ProjeGelistirici(Agent):
     - [cite:  IRENA 2024] Yenilenebilir enerji maliyetleri
     """
     
+    ajan_tipi = "ProjeGelistirici"
+    
+    # Proje tipleri: MW, $/MW, kapasite faktörü, yıl
+    PROJE_TIPLERI = {
+        "GES": {"kapasite": 10, "yatirim": 7e5, "kf": 0.18, "omur": 25},
+        "RES": {"kapasite": 20, "yatirim": 1.2e6, "kf": 0.35, "omur": 25}
+    }
+    
+    __slots__ = ("sermaye", "risk_primi", "projeler", "toplam_kapasite")
+    
     def __init__(self, model):
         super().__init__(model)
-        self.ajan_tipi = "ProjeGelistirici"
-        self.sermaye = np.random.uniform(10e6, 100e6)  # Milyon $
-        self.risk_primi = np.random.uniform(0.08, 0.15)
+        akis = model.akislar["yatirimci"]
+        self.sermaye = akis.uniform(10e6, 100e6)  # Milyon $
+        self.risk_primi = akis.uniform(0.08, 0.15)
         self.projeler = []
         self.toplam_kapasite = 0  # MW
         
@@ -1173,12 +2808,7 @@ class ProjeGelistirici(Agent):
         karbon_fiyati = self.model.karbon_fiyati
         tesvik = self.model.tesvik_miktari
         
-        proje_tipleri = {
-            "GES": {"kapasite": 10, "yatirim": 7e5, "kf": 0.18, "omur": 25},  # MW, $/MW, kapasite faktörü, yıl
-            "RES": {"kapasite": 20, "yatirim": 1.2e6, "kf": 0.35, "omur": 25}
-        }
-        
-        for proje_tipi, params in proje_tipleri. items():
+        for proje_tipi, params in self.PROJE_TIPLERI.items():
             toplam_yatirim = params["kapasite"] * params["yatirim"]  # $
             
             if self.sermaye >= toplam_yatirim:
@@ -1209,11 +2839,7 @@ class ProjeGelistirici(Agent):
         
         yillik_gelir = enerji_geliri + karbon_geliri + tesvik_geliri
         
-        npv = -yatirim
-        for t in range(1, omur + 1):
-            npv += yillik_gelir / ((1 + self.risk_primi) ** t)
-        
-        return npv
+        return npv_hesapla(yatirim, yillik_gelir, self.risk_primi, omur)
 
 
 # =============================================================================
@@ -1285,6 +2911,9 @@ class SebekeOperatoru(Agent):
         Bölge adı (varsayılan: "Ulusal")
     """
     
+    ajan_tipi = "SebekeOperatoru"
+    toplu_adim_siniri = True  # EMISYON_FAKTORU_TR hanelerce okunur
+    
     def __init__(self, model, bolge="Ulusal"):
         """
         Şebeke operatörü başlatıcı.
@@ -1292,7 +2921,6 @@ class SebekeOperatoru(Agent):
         Kaynak: TEİAŞ 10 Yıllık Yatırım Planı (2024)
         """
         super().__init__(model)
-        self.ajan_tipi = "SebekeOperatoru"
         self.bolge = bolge
         
         # ===================================================================
@@ -1482,6 +3110,38 @@ class FinansKurumu(Agent):
         "kamu", "ozel", "kalkinma" (varsayılan: "ozel")
     """
     
+    ajan_tipi = "FinansKurumu"
+    
+    # Banka tiplerine göre özellikler (BDDK 2024)
+    BANKA_PROFILLERI = {
+        "kamu": {
+            "likidite": 50e9,        # 50 Milyar TL
+            "risk_istahi": 0.6,      # Orta risk
+            "baz_faiz": 0.35,        # %35 (yüksek enflasyon ortamı)
+            "yesil_indirim": 0.05,   # Yeşil projeler için %5 indirim
+            "kredi_limiti": 10e9     # Proje başına maks 10 Milyar TL
+        },
+        "ozel": {
+            "likidite": 30e9,
+            "risk_istahi": 0.4,
+            "baz_faiz": 0.40,
+            "yesil_indirim": 0.03,
+            "kredi_limiti": 5e9
+        },
+        "kalkinma": {
+            "likidite": 100e9,       # Kalkınma bankaları daha büyük
+            "risk_istahi": 0.7,      # Daha yüksek risk toleransı
+            "baz_faiz": 0.25,        # Daha düşük faiz
+            "yesil_indirim": 0.10,   # Yeşil projeler için %10 indirim
+            "kredi_limiti": 20e9
+        }
+    }
+    
+    __slots__ = (
+        "banka_tipi", "likidite", "risk_istahi", "baz_faiz", "yesil_indirim",
+        "kredi_limiti", "aktif_krediler", "toplam_kredi_hacmi", "npl_orani", "durum",
+    )
+    
     def __init__(self, model, banka_tipi="ozel"):
         """
         Finans kurumu başlatıcı.
@@ -1489,39 +3149,13 @@ class FinansKurumu(Agent):
         Kaynak: BDDK Türk Bankacılık Sektörü Temel Göstergeleri (2024)
         """
         super().__init__(model)
-        self.ajan_tipi = "FinansKurumu"
         self.banka_tipi = banka_tipi
         
         # ===================================================================
         # FİNANSAL PARAMETRELER (BDDK 2024 verileri)
         # ===================================================================
         
-        # Banka tiplerine göre özellikler
-        banka_profilleri = {
-            "kamu": {
-                "likidite": 50e9,        # 50 Milyar TL
-                "risk_istahi": 0.6,      # Orta risk
-                "baz_faiz": 0.35,        # %35 (yüksek enflasyon ortamı)
-                "yesil_indirim": 0.05,   # Yeşil projeler için %5 indirim
-                "kredi_limiti": 10e9     # Proje başına maks 10 Milyar TL
-            },
-            "ozel": {
-                "likidite": 30e9,
-                "risk_istahi": 0.4,
-                "baz_faiz": 0.40,
-                "yesil_indirim": 0.03,
-                "kredi_limiti": 5e9
-            },
-            "kalkinma": {
-                "likidite": 100e9,       # Kalkınma bankaları daha büyük
-                "risk_istahi": 0.7,      # Daha yüksek risk toleransı
-                "baz_faiz": 0.25,        # Daha düşük faiz
-                "yesil_indirim": 0.10,   # Yeşil projeler için %10 indirim
-                "kredi_limiti": 20e9
-            }
-        }
-        
-        profil = banka_profilleri.get(banka_tipi, banka_profilleri["ozel"])
+        profil = self.BANKA_PROFILLERI.get(banka_tipi, self.BANKA_PROFILLERI["ozel"])
         
         self.likidite = profil["likidite"]           # TL
         self.risk_istahi = profil["risk_istahi"]     # 0-1 arası
@@ -1538,30 +3172,34 @@ class FinansKurumu(Agent):
     
     def step(self):
         """
-        Finans kurumu yıllık adım fonksiyonu.
+        Finans kurumu adım fonksiyonu (yıllık veya çeyreklik).
         
         Adımlar:
         --------
         1. Mevcut kredilerin takibi (geri ödeme, temerrüt)
         2. Likidite güncelleme
         3. Risk parametreleri güncelleme
+        
+        Geri ödemeler, vade düşümü ve NPL artışı adımın kapsadığı süreyle
+        (yıl) orantılıdır.
         """
         if self.durum != "Aktif":
             return
+        sure = self.model.adim_suresi(self.ajan_tipi)
         
-        # Yıllık kredi geri ödemeleri (basitleştirilmiş)
+        # Dönem kredi geri ödemeleri (basitleştirilmiş)
         for kredi in self.aktif_krediler:
             if kredi["kalan_vade"] > 0:
-                yillik_odeme = kredi["tutar"] / kredi["vade"]
-                self.likidite += yillik_odeme * (1 + kredi["faiz"])
-                kredi["kalan_vade"] -= 1
+                donem_odemesi = kredi["tutar"] / kredi["vade"] * sure
+                self.likidite += donem_odemesi * (1 + kredi["faiz"])
+                kredi["kalan_vade"] -= sure
         
         # Kapanan kredileri listeden çıkar
         self.aktif_krediler = [k for k in self.aktif_krediler if k["kalan_vade"] > 0]
         
         # NPL oranı güncelleme (karbon fiyatı arttıkça riskli sektörlerde artabilir)
         if self.model.karbon_fiyati > 50:
-            self.npl_orani = min(0.10, self.npl_orani + 0.005)
+            self.npl_orani = min(0.10, self.npl_orani + 0.005 * sure)
     
     def kredi_basvurusu_degerlendir(self, proje_tipi, tutar, proje_npv, vade=10):
         """
@@ -1670,6 +3308,19 @@ class Belediye(Agent):
         Şehir adı
     """
     
+    ajan_tipi = "Belediye"
+    
+    BUYUKSEHIRLER = frozenset([
+        "Istanbul", "Ankara", "Izmir", "Bursa", "Antalya", "Adana",
+        "Konya", "Gaziantep", "Kocaeli", "Mersin", "Kayseri", "Eskisehir"
+    ])
+    
+    __slots__ = (
+        "city", "belediye_tipi", "butce", "transit_capacity", "yesil_alan_orani",
+        "iklim_butcesi", "yerel_tesvik", "bina_retrofit_orani",
+        "yillik_emisyon_azaltimi", "transit_yatirim_toplam", "durum",
+    )
+    
     def __init__(self, model, city):
         """
         Belediye başlatıcı.
@@ -1677,7 +3328,6 @@ class Belediye(Agent):
         Kaynak: TÜİK Belediye İstatistikleri, İBB/ABB Faaliyet Raporları
         """
         super().__init__(model)
-        self.ajan_tipi = "Belediye"
         self.city = city
         
         # ===================================================================
@@ -1685,21 +3335,17 @@ class Belediye(Agent):
         # ===================================================================
         # Kaynak: TÜİK Belediye Bütçe İstatistikleri (2024)
         
-        buyuksehirler = [
-            "Istanbul", "Ankara", "Izmir", "Bursa", "Antalya", "Adana",
-            "Konya", "Gaziantep", "Kocaeli", "Mersin", "Kayseri", "Eskisehir"
-        ]
-        
-        if city in buyuksehirler:
+        akis = model.akislar["belediye"]
+        if city in self.BUYUKSEHIRLER:
             self.belediye_tipi = "buyuksehir"
-            self.butce = np.random.uniform(20e9, 100e9)  # 20-100 Milyar TL
-            self.transit_capacity = np.random.uniform(0.2, 0.4)  # %20-40 modal share
-            self.yesil_alan_orani = np.random.uniform(0.05, 0.15)  # %5-15
+            self.butce = akis.uniform(20e9, 100e9)  # 20-100 Milyar TL
+            self.transit_capacity = akis.uniform(0.2, 0.4)  # %20-40 modal share
+            self.yesil_alan_orani = akis.uniform(0.05, 0.15)  # %5-15
         else:
             self.belediye_tipi = "standart"
-            self.butce = np.random.uniform(1e9, 10e9)   # 1-10 Milyar TL
-            self.transit_capacity = np.random.uniform(0.05, 0.15)
-            self.yesil_alan_orani = np.random.uniform(0.02, 0.08)
+            self.butce = akis.uniform(1e9, 10e9)   # 1-10 Milyar TL
+            self.transit_capacity = akis.uniform(0.05, 0.15)
+            self.yesil_alan_orani = akis.uniform(0.02, 0.08)
         
         # ===================================================================
         # İKLİM POLİTİKALARI
@@ -1830,7 +3476,7 @@ class EkonomikEtkiModulu:
         
         # Yeni I-O Modeli Entegrasyonu
         if MODULES_AVAILABLE:
-            self.io_model = InputOutputModel()
+            self.io_model = model.girdiler.io_model
         else:
             self.io_model = None
     
@@ -1858,8 +3504,7 @@ class EkonomikEtkiModulu:
         """
         # 1. Yatırım toplamlarını hesapla
         toplam_yatirim = sum([
-            getattr(a, 'yatirim_bedeli', 0) for a in self.model.agents
-            if hasattr(a, 'durum') and a.durum == "Donusum"
+            bedel for _, bedel in self.model._donusum_yatirimlari()
         ])
         
         # 2. Sektörel yatırım dağılımı
@@ -1879,11 +3524,7 @@ class EkonomikEtkiModulu:
         istihdam_etkisi = yesil_etki['toplam_istihdam_yaratilan']
         
         # 5. Karbon maliyeti (negatif etki)
-        toplam_emisyon = sum([
-            a.emisyon for a in self.model.agents
-            if hasattr(a, 'ajan_tipi') and a.ajan_tipi in ["Tesis", "IhracatciTesis"]
-            and getattr(a, 'durum', 'Aktif') != "Kapali"
-        ])
+        toplam_emisyon = self.model._acik_tesis_emisyonu()
         karbon_maliyeti = toplam_emisyon * self.model.karbon_fiyati * 1e6  # Mt × $/ton → USD
         
         # 6. Net refah etkisi
@@ -1909,20 +3550,19 @@ class EkonomikEtkiModulu:
         """
         gdp_etkisi = 0
         istihdam_etkisi = 0
+        donusumdekiler = self.model._donusum_yatirimlari()
         
         # 1. Sektörel yatırımları topla
         for sektor, params in self.sektor_carpanlari.items():
             # Sektördeki yatırımlar
             sektor_yatirim = sum([
-                getattr(a, 'yatirim_bedeli', 0) for a in self.model.agents
-                if hasattr(a, 'sektor') and a.sektor == sektor
-                and hasattr(a, 'durum') and a.durum == "Donusum"
+                bedel for a_sektor, bedel in donusumdekiler
+                if a_sektor == sektor
             ])
             
             if sektor_yatirim == 0:
                 sektor_yatirim = sum([
-                    getattr(a, 'yatirim_bedeli', 0) for a in self.model.agents
-                    if hasattr(a, 'durum') and a.durum == "Donusum"
+                    bedel for _, bedel in donusumdekiler
                 ]) * 0.05  # Varsayılan pay
             
             # GDP etkisi (çarpan ile)
@@ -1934,11 +3574,7 @@ class EkonomikEtkiModulu:
             istihdam_etkisi += sektor_istihdam
         
         # 2. Karbon maliyeti (negatif etki)
-        toplam_emisyon = sum([
-            a.emisyon for a in self.model.agents
-            if hasattr(a, 'ajan_tipi') and a.ajan_tipi in ["Tesis", "IhracatciTesis"]
-            and getattr(a, 'durum', 'Aktif') != "Kapali"
-        ])
+        toplam_emisyon = self.model._acik_tesis_emisyonu()
         karbon_maliyeti = toplam_emisyon * self.model.karbon_fiyati * 1e6
         
         # 3. Net refah etkisi
@@ -2003,188 +3639,691 @@ Referanslar:
      selecting values of input variables. Technometrics, 21(2), 239-245.
 """
 
+# Monte Carlo koşularında toplanan sütunlar (diğer raporlayıcılar çalıştırılmaz)
+MC_RAPORLAYICILARI = ("Toplam_Emisyon", "Karbon_Fiyati", "Temiz_Tesis", "GDP_Etkisi_USD")
+
+# Monte Carlo koşu süresi (2025-2035)
+MC_BASLANGIC_YILI = 2025
+MC_YIL_SAYISI = 11
 
-def monte_carlo_analizi(n_runs=100, seed=42):
+# Parametre sınırları (7 boyutlu parametre uzayı)
+MC_PARAMETRE_SINIRLARI = {
+    'cap_azalma': (0.02, 0.05),      # Yıllık tavan azalma oranı
+    'karbon_fiyati': (40, 150),      # $/tCO2
+    'tesvik': (20000, 150000),       # $/MW
+    'baslangic_cap': (70, 90),       # Mt
+    'ekonomik_buyume': (0.02, 0.05), # %
+    'teknoloji_maliyeti': (600000, 1200000),  # $/MW
+    'yakit_fiyat_soku': (0.8, 1.5)   # Çarpan
+}
+
+
+def mc_kosu_seed(seed, run):
     """
-    Monte Carlo belirsizlik analizi gerçekleştirir.
-    
-    Bu fonksiyon, model parametrelerini rastgele değiştirerek
-    sonuçların belirsizlik aralığını hesaplar.
-    
-    Parametreler:
-    -------------
-    n_runs : int
-        Monte Carlo iterasyon sayısı (varsayılan: 100)
-    seed : int
-        Rastgele sayı üreteci seed'i (tekrarlanabilirlik için)
-    
-    Değiştirilen Parametreler:
-    --------------------------
-    1. cap_azalma_orani: U(0.02, 0.05) - Yıllık tavan azalma oranı
-    2. ab_skdm_fiyat: U(60, 120) - AB SKDM fiyatı ($/ton)
-    3. tesvik_miktari: U(30000, 100000) - Yenilenebilir teşviği ($/MW)
-    4. baslangic_cap: U(70, 90) - Başlangıç emisyon tavanı (Mt)
-    
-    Returns:
-    --------
-    tuple : (df_results, percentiles, uncertainty_stats)
-        - df_results: Tüm iterasyonların sonuçları
-        - percentiles: 5., 50., 95. yüzdelikler
-        - uncertainty_stats: Ortalama ve standart sapma
+    Ana seed ve koşu indeksinden deterministik koşu seed'i türetir.
     
-    Örnek Kullanım:
-    ---------------
-    >>> results, percentiles, stats = monte_carlo_analizi(n_runs=100)
-    >>> print(f"2035 Emisyon: {percentiles.loc[0.5, 'final_emission']:.1f} Mt")
-    >>> print(f"Belirsizlik: [{percentiles.loc[0.05, 'final_emission']:.1f}, "
-    ...       f"{percentiles.loc[0.95, 'final_emission']:.1f}] Mt")
+    Koşu seed'i yalnızca (seed, run) çiftine bağlıdır; işçi sayısı, parça
+    boyutu veya toplam koşu sayısı sonucu değiştirmez.
+    """
+    return int(np.random.SeedSequence([seed, run]).generate_state(1)[0])
+
+
+def _mc_tek_kosu(run, params, kosu_seed, yorunge_degiskenleri=()):
     """
-    np.random.seed(seed)
-    random.seed(seed)
+    Tek bir Monte Carlo koşusunu çalıştırır ve son yıl değerlerini döndürür.
     
-    results = []
+    yorunge_degiskenleri verilirse bu raporlayıcıların yıllık değerleri
+    'yorunge' anahtarında (yıl × değişken, float32) döner.
+    """
+    (cap_azalma, karbon_fiyati, tesvik, baslangic_cap,
+     ekonomik_buyume, teknoloji_maliyeti, yakit_fiyat_soku) = params
     
-    print(f"\n🎲 Monte Carlo Analizi Başlatılıyor ({n_runs} iterasyon)...")
-    print("=" * 60)
+    # Modeli oluştur ve çalıştır
+    model = TurkiyeETSModel(
+        n_enerji=20,      # Daha az ajan (hız için)
+        n_sanayi=15,
+        n_tarim=10,
+        n_hanehalki=25,
+        baslangic_cap=baslangic_cap,
+        cap_azalma_orani=cap_azalma,
+        ab_skdm_fiyat=karbon_fiyati,
+        tesvik_miktari=tesvik,
+        random_seed=kosu_seed,
+        raporlayicilar=set(MC_RAPORLAYICILARI) | set(yorunge_degiskenleri),
+        verbose=False
+    )
     
-    # =================================================================
-    # LATIN HYPERCUBE SAMPLİNG (LHS) - McKay et al. (1979)
-    # =================================================================
-    # LHS, parametre uzayını daha verimli tarar ve daha az iterasyonla
-    # daha iyi kapsama sağlar.
-    #
-    # Referans: McKay, M.D., Beckman, R.J., & Conover, W.J. (1979).
-    # A comparison of three methods for selecting values of input 
-    # variables in the analysis of output from a computer code.
-    # Technometrics, 21(2), 239-245.
-    # =================================================================
+    # Parametre şoklarını uygula
+    model.vergi_artis_orani *= (1 + ekonomik_buyume) # Büyüme emisyon artsını tetikler
     
-    # Parametre sınırları (7 boyutlu parametre uzayı)
-    param_bounds = {
-        'cap_azalma': (0.02, 0.05),      # Yıllık tavan azalma oranı
-        'karbon_fiyati': (40, 150),      # $/tCO2
-        'tesvik': (20000, 150000),       # $/MW
-        'baslangic_cap': (70, 90),       # Mt
-        'ekonomik_buyume': (0.02, 0.05), # %
-        'teknoloji_maliyeti': (600000, 1200000),  # $/MW
-        'yakit_fiyat_soku': (0.8, 1.5)   # Çarpan
-    }
+    # 11 yıllık simülasyon (2025-2035)
+    for _ in range(MC_YIL_SAYISI):
+        model.step()
     
-    n_params = len(param_bounds)
+    # Sonuçları topla
+    df = model.datacollector.get_model_vars_dataframe()
     
-    # LHS örnekleme
-    if LHS_AVAILABLE:
-        print("   ✓ Latin Hypercube Sampling kullanılıyor")
-        sampler = qmc.LatinHypercube(d=n_params, seed=seed)
-        lhs_samples = sampler.random(n=n_runs)  # [0,1] aralığında
-        
-        # Parametre sınırlarına ölçekle
-        l_bounds = [v[0] for v in param_bounds.values()]
-        u_bounds = [v[1] for v in param_bounds.values()]
-        scaled_samples = qmc.scale(lhs_samples, l_bounds, u_bounds)
-    else:
-        print("   ⚠️ LHS yok, rastgele uniform örnekleme kullanılıyor")
-        # Fallback: Rastgele uniform örnekleme
-        scaled_samples = np.column_stack([
-            np.random.uniform(bounds[0], bounds[1], n_runs)
-            for bounds in param_bounds.values()
-        ])
+    sonuc = {
+        'run': run,
+        'seed': kosu_seed,
+        'cap_azalma': cap_azalma,
+        'karbon_fiyati': karbon_fiyati,
+        'tesvik': tesvik,
+        'ekonomik_buyume': ekonomik_buyume,
+        'teknoloji_maliyeti': teknoloji_maliyeti,
+        'yakit_fiyat_soku': yakit_fiyat_soku,
+        'final_emission': df['Toplam_Emisyon'].iloc[-1],
+        'final_price': df['Karbon_Fiyati'].iloc[-1],
+        'temiz_tesis': df['Temiz_Tesis'].iloc[-1] if 'Temiz_Tesis' in df.columns else 0,
+        'gdp_etkisi': df['GDP_Etkisi_USD'].iloc[-1] if 'GDP_Etkisi_USD' in df.columns else 0
+    }
+    if yorunge_degiskenleri:
+        sonuc['yorunge'] = np.column_stack([
+            model.datacollector.sutun(ad) for ad in yorunge_degiskenleri
+        ]).astype(np.float32)
+    return sonuc
+
+
+def _mc_parca_calistir(parca, yorunge_degiskenleri=()):
+    """
+    Bir koşu parçasını çalıştırır (süreç havuzu işçisi).
     
-    for run in range(n_runs):
-        # LHS örneklerinden parametreleri al
-        params = scaled_samples[run]
-        cap_azalma = params[0]
-        karbon_fiyati = params[1]
-        tesvik = params[2]
-        baslangic_cap = params[3]
-        ekonomik_buyume = params[4]
-        teknoloji_maliyeti = params[5]
-        yakit_fiyat_soku = params[6]
-        
+    parca: [(run, parametre_vektörü, koşu_seed'i), ...]
+    Returns: (sonuçlar, hatalar) - hatalar parametre vektörüyle birlikte
+    """
+    sonuclar, hatalar = [], []
+    for run, params, kosu_seed in parca:
         try:
-            # Modeli oluştur ve çalıştır
-            model = TurkiyeETSModel(
-                n_enerji=20,      # Daha az ajan (hız için)
-                n_sanayi=15,
-                n_tarim=10,
-                n_hanehalki=25,
-                baslangic_cap=baslangic_cap,
-                cap_azalma_orani=cap_azalma,
-                ab_skdm_fiyat=karbon_fiyati,
-                tesvik_miktari=tesvik,
-                random_seed=run
-            )
-            
-            # Parametre şoklarını uygula
-            model.vergi_artis_orani *= (1 + ekonomik_buyume) # Büyüme emisyon artsını tetikler
-            
-            # 11 yıllık simülasyon (2025-2035)
-            for _ in range(11):
-                model.step()
-            
-            # Sonuçları topla
-            df = model.datacollector.get_model_vars_dataframe()
-            
-            results.append({
+            sonuclar.append(_mc_tek_kosu(run, params, kosu_seed, yorunge_degiskenleri))
+        except Exception as e:
+            hatalar.append({
                 'run': run,
-                'cap_azalma': cap_azalma,
-                'karbon_fiyati': karbon_fiyati,
-                'tesvik': tesvik,
-                'ekonomik_buyume': ekonomik_buyume,
-                'teknoloji_maliyeti': teknoloji_maliyeti,
-                'yakit_fiyat_soku': yakit_fiyat_soku,
-                'final_emission': df['Toplam_Emisyon'].iloc[-1],
-                'final_price': df['Karbon_Fiyati'].iloc[-1],
-                'temiz_tesis': df['Temiz_Tesis'].iloc[-1] if 'Temiz_Tesis' in df.columns else 0,
-                'gdp_etkisi': df['GDP_Etkisi_USD'].iloc[-1] if 'GDP_Etkisi_USD' in df.columns else 0
+                'seed': kosu_seed,
+                **dict(zip(MC_PARAMETRE_SINIRLARI, params)),
+                'hata': f"{type(e).__name__}: {e}"
             })
+    return sonuclar, hatalar
 
-            
-            # İlerleme göster
-            if (run + 1) % 10 == 0:
-                print(f"   ✓ {run + 1}/{n_runs} iterasyon tamamlandı")
-                
-        except Exception as e:
-            print(f"   ⚠️ Run {run} hata: {str(e)[:50]}")
-            continue
+
+def _mc_parcalari_calistir(gorevler, workers=1, parca_boyutu=None, yorunge_degiskenleri=(),
+                           havuz=None):
+    """
+    Görevleri parçalara bölüp sırayla veya süreç havuzunda çalıştırır.
     
-    # Sonuçları DataFrame'e dönüştür
-    df_results = pd.DataFrame(results)
+    Parçalar tamamlandıkça (sonuçlar, hatalar) çiftlerini üretir; sıra
+    işçi sayısına göre değişebilir, sonuçlar koşu indeksinden sıralanmalıdır.
+    havuz verilirse (uyarlamalı modda partiler arası) yeni havuz açılmaz.
+    """
+    if parca_boyutu is None:
+        parca_boyutu = max(1, -(-len(gorevler) // (max(1, workers) * 4)))
+    parcalar = [gorevler[i:i + parca_boyutu] for i in range(0, len(gorevler), parca_boyutu)]
+    
+    if workers <= 1:
+        for parca in parcalar:
+            yield _mc_parca_calistir(parca, yorunge_degiskenleri)
+        return
+    
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    if havuz is None:
+        with ProcessPoolExecutor(max_workers=workers) as havuz:
+            yield from _mc_parcalari_calistir(gorevler, workers, parca_boyutu,
+                                              yorunge_degiskenleri, havuz)
+        return
+    for gelecek in as_completed([havuz.submit(_mc_parca_calistir, p, yorunge_degiskenleri) for p in parcalar]):
+        yield gelecek.result()
+
+
+class MonteCarloDeposu:
+    """
+    Monte Carlo sonuçları için yalnızca-ekleme (append-only) disk deposu.
+    
+    Her parça tamamlandığında satırları kosular.csv'ye ekler, ardından
+    tamamlanan koşu indekslerini manifest.json'a atomik olarak yazar.
+    Süreç çökerse manifest'teki koşular korunur; devam=True ile açılan
+    depo bu koşuları atlar. Manifest'e yazılmadan kalan yarım satırlar
+    okuma sırasında ayıklanır.
+    
+    Dosyalar:
+        manifest.json - seed, n_runs, parametre sınırları, (uyarlamalı modda)
+                        parti boyutu, tamamlanan koşular
+        kosular.csv   - koşu başına bir satır (son yıl değerleri)
+        hatalar.csv   - başarısız koşular (devamda yeniden denenir)
+        yorungeler.npy - (isteğe bağlı) koşu × yıl × değişken float32 dizisi;
+                         np.load(..., mmap_mode='r') ile kopyalamadan okunur,
+                         tamamlanmamış koşular NaN
+    """
     
-    if len(df_results) == 0:
-        print("❌ Hiçbir iterasyon başarılı olmadı!")
-        return None, None, None
+    def __init__(self, dizin, seed, n_runs, devam=False, yorunge_degiskenleri=(),
+                 parti_boyutu=None):
+        self.dizin = dizin
+        self.manifest_yolu = os.path.join(dizin, "manifest.json")
+        self.kosu_yolu = os.path.join(dizin, "kosular.csv")
+        self.hata_yolu = os.path.join(dizin, "hatalar.csv")
+        self.yorunge_yolu = os.path.join(dizin, "yorungeler.npy")
+        self.meta = {
+            'seed': int(seed),
+            'n_runs': int(n_runs),
+            'parametre_sinirlari': {k: list(v) for k, v in MC_PARAMETRE_SINIRLARI.items()},
+            'yorunge_degiskenleri': list(yorunge_degiskenleri),
+            'yillar': list(range(MC_BASLANGIC_YILI, MC_BASLANGIC_YILI + MC_YIL_SAYISI)),
+            # Uyarlamalı mod: her partinin LHS örneklemi parti sınırlarına bağlı
+            # (sabit modda None; eski manifest'lerde anahtar yok, yine None okunur)
+            'parti_boyutu': None if parti_boyutu is None else int(parti_boyutu),
+        }
+        os.makedirs(dizin, exist_ok=True)
+        
+        self.tamamlanan = set()
+        if devam and os.path.exists(self.manifest_yolu):
+            with open(self.manifest_yolu, encoding='utf-8') as f:
+                manifest = json.load(f)
+            for anahtar, deger in self.meta.items():
+                if manifest.get(anahtar) != deger:
+                    raise ValueError(
+                        f"❌ Devam edilemiyor: depodaki '{anahtar}' ({manifest.get(anahtar)}) "
+                        f"bu koşuyla uyuşmuyor ({deger})"
+                    )
+            self.tamamlanan = set(manifest['tamamlanan'])
+            for yol in (self.kosu_yolu, self.hata_yolu):
+                self._yarim_satiri_kes(yol)
+        else:
+            for yol in (self.kosu_yolu, self.hata_yolu, self.yorunge_yolu):
+                if os.path.exists(yol):
+                    os.remove(yol)
+            self._manifest_yaz()
+        
+        # Yörüngeler: diskte bellek eşlemli dizi, koşu başına yalnızca bir satır yazılır
+        self.yorungeler = None
+        if yorunge_degiskenleri:
+            sekil = (int(n_runs), MC_YIL_SAYISI, len(yorunge_degiskenleri))
+            if os.path.exists(self.yorunge_yolu):
+                self.yorungeler = np.lib.format.open_memmap(self.yorunge_yolu, mode='r+')
+            else:
+                self.yorungeler = np.lib.format.open_memmap(
+                    self.yorunge_yolu, mode='w+', dtype=np.float32, shape=sekil
+                )
+                self.yorungeler[:] = np.nan
+    
+    def _manifest_yaz(self):
+        gecici = self.manifest_yolu + ".tmp"
+        with open(gecici, 'w', encoding='utf-8') as f:
+            json.dump({**self.meta, 'tamamlanan': sorted(self.tamamlanan)}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(gecici, self.manifest_yolu)
+    
+    @staticmethod
+    def _yarim_satiri_kes(yol, blok=4096):
+        """
+        Çökme anında yarım kalan son satırı (satır sonu olmadan) dosyadan
+        keser; kesilmezse devamda eklenen ilk satır onunla birleşir.
+        """
+        if not os.path.exists(yol):
+            return
+        with open(yol, 'rb+') as f:
+            son = f.seek(0, os.SEEK_END)
+            konum = son
+            while konum > 0:
+                bas = max(0, konum - blok)
+                f.seek(bas)
+                parca = f.read(konum - bas)
+                if konum == son and parca.endswith(b'\n'):
+                    return
+                i = parca.rfind(b'\n')
+                if i >= 0:
+                    f.truncate(bas + i + 1)
+                    return
+                konum = bas
+            f.truncate(0)
+    
+    @staticmethod
+    def _ekle(yol, satirlar, sutunlar):
+        yeni = not os.path.exists(yol) or os.path.getsize(yol) == 0
+        with open(yol, 'a', encoding='utf-8', newline='') as f:
+            pd.DataFrame(satirlar, columns=sutunlar).to_csv(f, header=yeni, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def parca_yaz(self, sonuclar, hatalar):
+        """Bir parçanın sonuçlarını ekler ve manifest'i günceller."""
+        yorungeler = [r.pop('yorunge', None) for r in sonuclar]
+        if self.yorungeler is not None and sonuclar:
+            for r, yorunge in zip(sonuclar, yorungeler):
+                self.yorungeler[r['run'], :len(yorunge)] = yorunge
+            self.yorungeler.flush()
+        if sonuclar:
+            self._ekle(self.kosu_yolu, sonuclar, list(sonuclar[0]))
+        if hatalar:
+            self._ekle(self.hata_yolu, hatalar, ['run', 'seed', *MC_PARAMETRE_SINIRLARI, 'hata'])
+        if sonuclar:
+            self.tamamlanan.update(r['run'] for r in sonuclar)
+            self._manifest_yaz()
+    
+    def sonuclari_oku(self, sutunlar=None):
+        """
+        Tamamlanan koşuları koşu indeksine göre sıralı okur.
+        
+        sutunlar verilirse yalnızca o sütunlar yüklenir (istatistikler için
+        tüm tabloyu belleğe almadan).
+        """
+        if not os.path.exists(self.kosu_yolu):
+            return pd.DataFrame(columns=['run', *(sutunlar or [])])
+        usecols = None if sutunlar is None else ['run', *[s for s in sutunlar if s != 'run']]
+        df = pd.read_csv(self.kosu_yolu, usecols=usecols, float_precision='round_trip')
+        df = df[df['run'].isin(self.tamamlanan)].drop_duplicates('run', keep='last')
+        return df.sort_values('run').reset_index(drop=True)
+    
+    def hatalari_oku(self):
+        """Devamda da başarısız kalan koşular (sonradan başaranlar hariç)."""
+        sutunlar = ['run', 'seed', *MC_PARAMETRE_SINIRLARI, 'hata']
+        if not os.path.exists(self.hata_yolu):
+            return pd.DataFrame(columns=sutunlar)
+        df = pd.read_csv(self.hata_yolu, float_precision='round_trip')
+        df = df[~df['run'].isin(self.tamamlanan)].drop_duplicates('run', keep='last')
+        return df.sort_values('run').reset_index(drop=True)
+    
+    def istatistikler(self):
+        """
+        Yüzdelikleri ve belirsizlik istatistiklerini depodan hesaplar.
+        
+        Yalnızca gereken sütunlar okunur.
+        
+        Returns: (percentiles, uncertainty_stats) ya da depo boşsa (None, None)
+        """
+        df = self.sonuclari_oku(['final_emission', 'final_price', 'temiz_tesis'])
+        if len(df) == 0:
+            return None, None
+        percentiles = df[['final_emission', 'final_price', 'temiz_tesis']].quantile([0.05, 0.5, 0.95])
+        uncertainty_stats = {
+            'final_emission': {
+                'mean': df['final_emission'].mean(),
+                'std': df['final_emission'].std(),
+                'min': df['final_emission'].min(),
+                'max': df['final_emission'].max()
+            },
+            'final_price': {
+                'mean': df['final_price'].mean(),
+                'std': df['final_price'].std()
+            }
+        }
+        return percentiles, uncertainty_stats
+
+
+def mc_yorungeleri_ac(depo_dizini):
+    """
+    Depodaki yörünge dizisini kopyalamadan, salt okunur açar (dashboard için).
     
-    # Yüzdelikleri hesapla
-    percentiles = df_results[['final_emission', 'final_price', 'temiz_tesis']].quantile([0.05, 0.5, 0.95])
+    Returns: (dizi, meta) - dizi koşu × yıl × değişken float32 memmap,
+    meta manifest içeriği (yorunge_degiskenleri, yillar, tamamlanan, ...)
+    """
+    with open(os.path.join(depo_dizini, "manifest.json"), encoding='utf-8') as f:
+        meta = json.load(f)
+    yol = os.path.join(depo_dizini, "yorungeler.npy")
+    if not meta.get('yorunge_degiskenleri') or not os.path.exists(yol):
+        raise ValueError(f"❌ Depoda yörünge kaydı yok: {depo_dizini}")
+    return np.load(yol, mmap_mode='r'), meta
+
+
+def mc_yorunge_yuzdelikleri(depo_dizini, degisken, q=(0.05, 0.5, 0.95)):
+    """
+    Bir değişkenin yıl bazlı yüzdeliklerini (fan grafiği) hesaplar.
     
-    # İstatistikler
-    uncertainty_stats = {
-        'final_emission': {
-            'mean': df_results['final_emission'].mean(),
-            'std': df_results['final_emission'].std(),
-            'min': df_results['final_emission'].min(),
-            'max': df_results['final_emission'].max()
-        },
-        'final_price': {
-            'mean': df_results['final_price'].mean(),
-            'std': df_results['final_price'].std()
-        }
+    Dizi yıl yıl okunur; bellekte aynı anda yalnızca koşu sayısı kadar
+    değer bulunur. Tamamlanmamış (NaN) koşular yok sayılır.
+    
+    Returns: DataFrame (index=q, sütunlar=yıllar)
+    """
+    dizi, meta = mc_yorungeleri_ac(depo_dizini)
+    if degisken not in meta['yorunge_degiskenleri']:
+        raise ValueError(
+            f"❌ Geçersiz değişken: {degisken}. "
+            f"Geçerli seçenekler: {meta['yorunge_degiskenleri']}"
+        )
+    v = meta['yorunge_degiskenleri'].index(degisken)
+    sonuc = {
+        yil: np.nanquantile(np.asarray(dizi[:, t, v], dtype=np.float64), q)
+        for t, yil in enumerate(meta['yillar'])
     }
+    return pd.DataFrame(sonuc, index=list(q))
+
+
+def mc_ilk_esik_yili(depo_dizini, degisken, esik, blok=4096):
+    """
+    Her koşuda değişkenin ilk kez esik değerine ulaştığı yılı bulur.
+    
+    Örn. fiyatın tavana ilk değdiği yıl:
+    >>> mc_ilk_esik_yili(dizin, "Karbon_Fiyati", ETS_PARAMS["TAVAN_FIYAT"])
+    
+    Koşular blok blok okunur. Eşiğe hiç ulaşılmayan koşular NaN döner.
+    
+    Returns: Series (index=run)
+    """
+    dizi, meta = mc_yorungeleri_ac(depo_dizini)
+    if degisken not in meta['yorunge_degiskenleri']:
+        raise ValueError(
+            f"❌ Geçersiz değişken: {degisken}. "
+            f"Geçerli seçenekler: {meta['yorunge_degiskenleri']}"
+        )
+    v = meta['yorunge_degiskenleri'].index(degisken)
+    yillar = np.asarray(meta['yillar'], dtype=float)
+    
+    sonuc = np.full(len(dizi), np.nan)
+    for bas in range(0, len(dizi), blok):
+        parca = np.asarray(dizi[bas:bas + blok, :, v])
+        ulasti = parca >= esik
+        herhangi = ulasti.any(axis=1)
+        sonuc[bas:bas + blok][herhangi] = yillar[ulasti.argmax(axis=1)[herhangi]]
+    
+    tamamlanan = sorted(meta['tamamlanan'])
+    return pd.Series(sonuc[tamamlanan], index=pd.Index(tamamlanan, name='run'), name=degisken)
+
+
+# Uyarlamalı Monte Carlo: hassasiyet hedefi verilebilen son yıl çıktıları
+MC_HEDEF_DEGISKENLERI = ('final_emission', 'final_price', 'temiz_tesis', 'gdp_etkisi')
+MC_YUZDELIKLERI = (0.05, 0.5, 0.95)
+
+
+def _mc_ornekle(n, seed):
+    """
+    MC_PARAMETRE_SINIRLARI içinde n parametre vektörü örnekler (LHS ya da uniform).
+    
+    seed bir tam sayı ya da np.random.Generator olabilir.
+    """
+    l_bounds = [v[0] for v in MC_PARAMETRE_SINIRLARI.values()]
+    u_bounds = [v[1] for v in MC_PARAMETRE_SINIRLARI.values()]
+    if LHS_AVAILABLE:
+        sampler = qmc.LatinHypercube(d=len(MC_PARAMETRE_SINIRLARI), seed=seed)
+        return qmc.scale(sampler.random(n=n), l_bounds, u_bounds)
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(alt, ust, n) for alt, ust in zip(l_bounds, u_bounds)
+    ])
+
+
+def bootstrap_yuzdelik_araligi(degerler, q=MC_YUZDELIKLERI, guven=0.95, n_bootstrap=500,
+                               rng=None, blok=64):
+    """
+    Yüzdelik tahminleri için yüzdelik bootstrap güven aralığı hesaplar.
+    
+    Örneklem n_bootstrap kez yerine koyarak yeniden çekilir ve her
+    yeniden örneklemin yüzdelikleri hesaplanır (Efron & Tibshirani, 1993,
+    An Introduction to the Bootstrap, Bölüm 13). Yeniden örneklemler
+    bellek için blok blok işlenir.
+    
+    Returns: (tahmin, alt, ust) - her biri len(q) uzunluğunda dizi
+    """
+    x = np.asarray(degerler, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    q = np.asarray(q, dtype=np.float64)
+    if len(x) < 2:
+        bos = np.full(len(q), np.nan)
+        return bos, bos.copy(), bos.copy()
+    rng = np.random.default_rng(rng)
+    
+    tahminler = np.empty((n_bootstrap, len(q)))
+    for bas in range(0, n_bootstrap, blok):
+        m = min(blok, n_bootstrap - bas)
+        orneklem = x[rng.integers(0, len(x), size=(m, len(x)))]
+        tahminler[bas:bas + m] = np.quantile(orneklem, q, axis=1).T
+    
+    alfa = (1 - guven) / 2
+    alt, ust = np.quantile(tahminler, [alfa, 1 - alfa], axis=0)
+    return np.quantile(x, q), alt, ust
+
+
+def _mc_hassasiyet(depo, hedefler, son_kosu, rng, guven=0.95, n_bootstrap=500):
+    """
+    Depodaki koşulardan (run < son_kosu) hedef değişkenlerin yüzdelik
+    tahminlerini ve bootstrap aralıklarının en büyük yarı genişliğini hesaplar.
+    
+    Devamda sonraki partilerin koşuları depoda olsa bile her kontrol yalnızca
+    kendi partisine kadar olan koşuları görür; durma noktası değişmez.
+    
+    Returns: ({degisken: {'yuzdelikler': [...], 'yari_genislik': float}}, n)
+    """
+    df = depo.sonuclari_oku(list(hedefler))
+    df = df[df['run'] < son_kosu]
+    sonuc = {}
+    for degisken in hedefler:
+        tahmin, alt, ust = bootstrap_yuzdelik_araligi(
+            df[degisken].to_numpy(), guven=guven, n_bootstrap=n_bootstrap, rng=rng
+        )
+        yari = (ust - alt) / 2
+        sonuc[degisken] = {
+            'yuzdelikler': tahmin.tolist(),
+            'yari_genislik': float(np.max(yari)) if np.isfinite(yari).all() else float('inf'),
+        }
+    return sonuc, len(df)
+
+
+def monte_carlo_analizi(n_runs=100, seed=42, workers=1, depo_dizini=None, devam=False,
+                        yorunge_degiskenleri=(), hedef_yari_genislik=None, parti_boyutu=None,
+                        guven_duzeyi=0.95, bootstrap_sayisi=500):
+    """
+    Monte Carlo belirsizlik analizi gerçekleştirir.
+    
+    Bu fonksiyon, model parametrelerini rastgele değiştirerek
+    sonuçların belirsizlik aralığını hesaplar.
+    
+    Parametreler:
+    -------------
+    n_runs : int
+        Monte Carlo iterasyon sayısı (varsayılan: 100)
+    seed : int
+        Rastgele sayı üreteci seed'i (tekrarlanabilirlik için). Her koşunun
+        seed'i mc_kosu_seed(seed, run) ile türetilir.
+    workers : int
+        Paralel süreç sayısı (1 = tek süreç). Sonuçlar işçi sayısından
+        bağımsızdır.
+    depo_dizini : str
+        Sonuçların parça parça yazıldığı depo dizini
+        (varsayılan: OUTPUT_DIR/monte_carlo_depo)
+    devam : bool
+        True ise depodaki manifest'te tamamlanmış görünen koşular atlanır
+    yorunge_degiskenleri : tuple
+        Yıllık değerleri depoda yorungeler.npy'ye (koşu × yıl × değişken)
+        yazılacak raporlayıcılar (boş = yalnızca son yıl değerleri)
+    hedef_yari_genislik : dict
+        Uyarlamalı mod: {değişken: hedef} (örn. {'final_emission': 1.0,
+        'final_price': 2.0}). Koşular partiler halinde çalıştırılır; her
+        partiden sonra 5., 50. ve 95. yüzdeliklerin bootstrap güven
+        aralıkları hesaplanır ve tüm değişkenlerde en büyük yarı genişlik
+        hedefin altına indiğinde durulur. n_runs bu modda üst bütçedir.
+    parti_boyutu : int
+        Uyarlamalı modda parti başına koşu (varsayılan: min(n_runs, 50)).
+        Her parti kendi LHS örneklemini çeker (k. parti: seed [seed, k]).
+    guven_duzeyi : float
+        Yüzdeliklerin bootstrap güven düzeyi (varsayılan: 0.95)
+    bootstrap_sayisi : int
+        Bootstrap yeniden örneklem sayısı (varsayılan: 500)
+    
+    Değiştirilen Parametreler:
+    --------------------------
+    1. cap_azalma_orani: U(0.02, 0.05) - Yıllık tavan azalma oranı
+    2. ab_skdm_fiyat: U(60, 120) - AB SKDM fiyatı ($/ton)
+    3. tesvik_miktari: U(30000, 100000) - Yenilenebilir teşviği ($/MW)
+    4. baslangic_cap: U(70, 90) - Başlangıç emisyon tavanı (Mt)
+    
+    Returns:
+    --------
+    tuple : (df_results, percentiles, uncertainty_stats)
+        - df_results: Tüm iterasyonların sonuçları
+        - percentiles: 5., 50., 95. yüzdelikler
+        - uncertainty_stats: Ortalama ve standart sapma
+        Başarısız koşular parametre vektörleriyle df_results.attrs['hatalar']
+        içinde döner. Uyarlamalı modda df_results.attrs['uyarlamali'] durma
+        nedenini ('hedef' | 'butce') ve parti bazlı hassasiyet geçmişini içerir.
+    
+    Örnek Kullanım:
+    ---------------
+    >>> results, percentiles, stats = monte_carlo_analizi(n_runs=100)
+    >>> print(f"2035 Emisyon: {percentiles.loc[0.5, 'final_emission']:.1f} Mt")
+    >>> print(f"Belirsizlik: [{percentiles.loc[0.05, 'final_emission']:.1f}, "
+    ...       f"{percentiles.loc[0.95, 'final_emission']:.1f}] Mt")
+    >>> # Uyarlamalı: emisyon yüzdelikleri ±1 Mt'a inene kadar (en çok 5000 koşu)
+    >>> results, percentiles, stats = monte_carlo_analizi(
+    ...     n_runs=5000, hedef_yari_genislik={'final_emission': 1.0})
+    """
+    if depo_dizini is None:
+        depo_dizini = os.path.join(OUTPUT_DIR, "monte_carlo_depo")
+    yorunge_degiskenleri = tuple(yorunge_degiskenleri)
+    hedefler = dict(hedef_yari_genislik or {})
+    gecersiz = sorted(set(hedefler) - set(MC_HEDEF_DEGISKENLERI))
+    if gecersiz:
+        raise ValueError(
+            f"❌ Geçersiz hedef değişkeni: {gecersiz}. "
+            f"Geçerli seçenekler: {list(MC_HEDEF_DEGISKENLERI)}"
+        )
+    uyarlamali = bool(hedefler)
+    if uyarlamali:
+        parti_boyutu = min(n_runs, 50) if parti_boyutu is None else int(parti_boyutu)
+        if parti_boyutu < 1:
+            raise ValueError(f"❌ Geçersiz parti boyutu: {parti_boyutu} (en az 1 olmalı)")
+    depo = MonteCarloDeposu(depo_dizini, seed, n_runs, devam=devam,
+                            yorunge_degiskenleri=yorunge_degiskenleri,
+                            parti_boyutu=parti_boyutu if uyarlamali else None)
+    
+    logger.info(f"\n🎲 Monte Carlo Analizi Başlatılıyor ({n_runs} iterasyon)...")
+    logger.info("=" * 60)
+    
+    # =================================================================
+    # LATIN HYPERCUBE SAMPLİNG (LHS) - McKay et al. (1979)
+    # =================================================================
+    # LHS, parametre uzayını daha verimli tarar ve daha az iterasyonla
+    # daha iyi kapsama sağlar.
+    #
+    # Referans: McKay, M.D., Beckman, R.J., & Conover, W.J. (1979).
+    # A comparison of three methods for selecting values of input 
+    # variables in the analysis of output from a computer code.
+    # Technometrics, 21(2), 239-245.
+    # =================================================================
+    
+    # LHS örnekleme
+    if LHS_AVAILABLE:
+        logger.info("   ✓ Latin Hypercube Sampling kullanılıyor")
+    else:
+        logger.warning("   ⚠️ LHS yok, rastgele uniform örnekleme kullanılıyor")
+    
+    # Partiler: sabit modda tek parti. Uyarlamalı modda koşu sayısı önceden
+    # bilinmediğinden her parti kendi LHS'ini çeker; durulan her noktada
+    # çekilmiş koşular tam partilerden oluşur ve katmanlı kalır.
+    if uyarlamali:
+        partiler = [(bas, min(bas + parti_boyutu, n_runs))
+                    for bas in range(0, n_runs, parti_boyutu)]
+        logger.info(f"   🎯 Uyarlamalı mod: parti boyutu {parti_boyutu}, hedef yarı genişlik "
+                    + ", ".join(f"{d} ≤ {h:g}" for d, h in hedefler.items()))
+    else:
+        partiler = [(0, n_runs)]
+    
+    if depo.tamamlanan:
+        logger.info(f"   ✓ Devam: {len(depo.tamamlanan)} koşu depoda, "
+                    f"{n_runs - len(depo.tamamlanan)} koşu kaldı")
+    if workers > 1:
+        logger.info(f"   ✓ {workers} paralel süreç kullanılıyor")
+    if yorunge_degiskenleri:
+        logger.info(f"   ✓ Yıllık yörüngeler kaydediliyor: {', '.join(yorunge_degiskenleri)}")
+    
+    # Uyarlamalı modda süreç havuzu partiler arasında yeniden kullanılır
+    havuz = None
+    if uyarlamali and workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        havuz = ProcessPoolExecutor(max_workers=workers)
+    
+    gecmis, durma_nedeni = [], 'butce'
+    tamamlanan = len(depo.tamamlanan)
+    try:
+        for parti_no, (bas, bit) in enumerate(partiler):
+            ornekler = _mc_ornekle(
+                bit - bas, np.random.default_rng([seed, parti_no]) if uyarlamali else seed
+            )
+            
+            # Görevler: (koşu, parametre vektörü, türetilmiş koşu seed'i)
+            # Devamda manifest'te tamamlanmış koşular atlanır
+            gorevler = [
+                (run, ornekler[run - bas].tolist(), mc_kosu_seed(seed, run))
+                for run in range(bas, bit) if run not in depo.tamamlanan
+            ]
+            
+            # Her parça bittiğinde diske yazılır; bellekte sonuç biriktirilmez
+            for parca_sonuclari, parca_hatalari in _mc_parcalari_calistir(
+                    gorevler, workers=workers, yorunge_degiskenleri=yorunge_degiskenleri,
+                    havuz=havuz):
+                depo.parca_yaz(parca_sonuclari, parca_hatalari)
+                
+                # İlerleme göster
+                onceki, tamamlanan = tamamlanan, tamamlanan + len(parca_sonuclari) + len(parca_hatalari)
+                if tamamlanan // 10 > onceki // 10 or tamamlanan == n_runs:
+                    logger.info(f"   ✓ {tamamlanan}/{n_runs} iterasyon tamamlandı")
+            
+            if not uyarlamali:
+                continue
+            
+            # Sıralı durma: yüzdeliklerin bootstrap aralıkları hedefe indi mi?
+            hassasiyet, n_basarili = _mc_hassasiyet(
+                depo, hedefler, bit, np.random.default_rng([seed, parti_no, 1]),
+                guven=guven_duzeyi, n_bootstrap=bootstrap_sayisi
+            )
+            gecmis.append({
+                'parti': parti_no,
+                'n': n_basarili,
+                **{d: h['yari_genislik'] for d, h in hassasiyet.items()},
+            })
+            logger.info(
+                f"   🎯 Parti {parti_no + 1}/{len(partiler)} (n={n_basarili}): "
+                + ", ".join(f"{d} ±{h['yari_genislik']:.3g} (hedef {hedefler[d]:g})"
+                            for d, h in hassasiyet.items())
+            )
+            if all(hassasiyet[d]['yari_genislik'] <= hedefler[d] for d in hedefler):
+                durma_nedeni = 'hedef'
+                logger.info(f"   ✅ Hassasiyet hedefine {n_basarili} koşuda ulaşıldı "
+                            f"(bütçe: {n_runs})")
+                break
+        else:
+            if uyarlamali:
+                logger.warning(f"   ⚠️ Bütçe ({n_runs} koşu) tükendi, hassasiyet hedefine ulaşılamadı")
+    finally:
+        if havuz is not None:
+            havuz.shutdown()
+    
+    # Başarısız koşular: parametre vektörleriyle raporla
+    df_hatalar = depo.hatalari_oku()
+    if len(df_hatalar) > 0:
+        logger.warning(f"\n   ⚠️ {len(df_hatalar)} koşu başarısız oldu:")
+        for h in df_hatalar.to_dict('records'):
+            parametreler = ", ".join(f"{ad}={h[ad]:.4g}" for ad in MC_PARAMETRE_SINIRLARI)
+            logger.warning(f"      Run {h['run']} (seed={h['seed']}): {h['hata'][:80]}")
+            logger.warning(f"         [{parametreler}]")
+    
+    # Yüzdelikler ve istatistikler depodan hesaplanır
+    percentiles, uncertainty_stats = depo.istatistikler()
+    if percentiles is None:
+        logger.error("❌ Hiçbir iterasyon başarılı olmadı!")
+        return None, None, None
+    
+    df_results = depo.sonuclari_oku()
+    df_results.attrs['hatalar'] = df_hatalar
+    df_results.attrs['depo_dizini'] = depo_dizini
+    if uyarlamali:
+        df_results.attrs['uyarlamali'] = {
+            'durma_nedeni': durma_nedeni,
+            'hedef_yari_genislik': hedefler,
+            'guven_duzeyi': guven_duzeyi,
+            'parti_boyutu': parti_boyutu,
+            'gecmis': gecmis,
+        }
     
     # Sonuç özeti
-    print("\n" + "=" * 60)
-    print("📊 MONTE CARLO SONUÇ ÖZETİ")
-    print("=" * 60)
-    print(f"Toplam başarılı iterasyon: {len(df_results)}")
-    print(f"\n2035 Emisyon Tahmini:")
-    print(f"   Ortalama: {uncertainty_stats['final_emission']['mean']:.1f} Mt")
-    print(f"   Std. Sapma: {uncertainty_stats['final_emission']['std']:.1f} Mt")
-    print(f"   %90 Güven Aralığı: [{percentiles.loc[0.05, 'final_emission']:.1f}, "
+    logger.info("\n" + "=" * 60)
+    logger.info("📊 MONTE CARLO SONUÇ ÖZETİ")
+    logger.info("=" * 60)
+    logger.info(f"Toplam başarılı iterasyon: {len(df_results)}")
+    logger.info(f"\n2035 Emisyon Tahmini:")
+    logger.info(f"   Ortalama: {uncertainty_stats['final_emission']['mean']:.1f} Mt")
+    logger.info(f"   Std. Sapma: {uncertainty_stats['final_emission']['std']:.1f} Mt")
+    logger.info(f"   %90 Güven Aralığı: [{percentiles.loc[0.05, 'final_emission']:.1f}, "
           f"{percentiles.loc[0.95, 'final_emission']:.1f}] Mt")
-    print(f"\n2035 Karbon Fiyatı:")
-    print(f"   Ortalama: ${uncertainty_stats['final_price']['mean']:.1f}/ton")
-    print(f"   %90 Güven Aralığı: [${percentiles.loc[0.05, 'final_price']:.1f}, "
+    logger.info(f"\n2035 Karbon Fiyatı:")
+    logger.info(f"   Ortalama: ${uncertainty_stats['final_price']['mean']:.1f}/ton")
+    logger.info(f"   %90 Güven Aralığı: [${percentiles.loc[0.05, 'final_price']:.1f}, "
           f"${percentiles.loc[0.95, 'final_price']:.1f}]/ton")
     
     return df_results, percentiles, uncertainty_stats
@@ -2208,8 +4347,9 @@ def il_bazli_emisyon_hesapla(model):
     """
     Tüm iller için emisyon değerlerini hesaplar.
     
-    Bu fonksiyon, modeldeki tüm ajanların 'city' özelliğini kullanarak
-    il bazlı emisyon toplamlarını hesaplar.
+    Ajanlar oluşturulurken 'city' özelliğinden bir tam sayı il kodu alır;
+    il bazlı toplamlar bu kodlarla artımlı tutulduğundan ajan taraması
+    yapılmaz (ajan sayısından bağımsız, O(il)).
     
     Parametreler:
     -------------
@@ -2226,17 +4366,193 @@ def il_bazli_emisyon_hesapla(model):
     >>> print(il_emisyonlari["Istanbul"])  # İstanbul'un toplam emisyonu
     45.2
     """
-    il_emisyonlari = {}
+    # Tesis + hanehalkı emisyonları, ajanların oluşturulurken aldığı il
+    # koduyla model.toplamlar içinde artımlı tutulur (il taraması yok)
+    return model.toplamlar.il_sozlugu()
+
+
+# =============================================================================
+# SÜTUNLU VERİ TOPLAYICI
+# =============================================================================
+
+class SutunluVeriToplayici:
+    """
+    Mesa DataCollector yerine sütun bazlı, önceden ayrılmış veri toplayıcı.
     
-    for il in model.iller:
-        il_emisyonlari[il] = sum([
-            a.emisyon for a in model.agents
-            if hasattr(a, 'city') and a.city == il 
-            and hasattr(a, 'emisyon')  # Sadece emisyon özelliği olanlar
-            and hasattr(a, 'durum') and a.durum != "Kapali"
-        ])
+    Her sayısal raporlayıcı için yıl sayısı kadar önceden ayrılmış bir NumPy
+    dizisi tutulur; toplama sırasında liste/sözlük oluşturulmaz. Değeri bir
+    (fonksiyon, sütun_adları) çifti olan raporlayıcılar (ör. il emisyonları)
+    yıl × sütun boyutlu 2-B dizide saklanır ve DataFrame'de JSON sütunu
+    olarak verilir (dashboard uyumu).
+    
+    Parametreler:
+    -------------
+    model_reporters : dict
+        {sütun_adı: fonksiyon(model)} veya {sütun_adı: (fonksiyon, sütunlar)}
+    aktif : iterable veya None
+        Toplanacak raporlayıcı adları (None = hepsi). Monte Carlo gibi toplu
+        koşular yalnızca ihtiyaç duydukları sütunların maliyetini öder.
+    kapasite : int
+        Önceden ayrılacak yıl sayısı (aşılırsa diziler iki katına büyür)
+    """
+    
+    def __init__(self, model_reporters, aktif=None, kapasite=11):
+        if aktif is not None:
+            aktif = set(aktif)
+            bilinmeyen = aktif - set(model_reporters)
+            if bilinmeyen:
+                raise ValueError(
+                    f"❌ Geçersiz raporlayıcı: {sorted(bilinmeyen)}. "
+                    f"Geçerli seçenekler: {list(model_reporters)}"
+                )
+        self.model_reporters = {
+            ad: r for ad, r in model_reporters.items() if aktif is None or ad in aktif
+        }
+        self.n = 0
+        self._kapasite = max(1, kapasite)
+        self._sutunlar = {}    # ad -> dizi (ilk toplamada oluşturulur)
+        self._matris_adlari = {}  # ad -> sütun adları
+    
+    def __getstate__(self):
+        # Raporlayıcılar modele bağlı lambda'lardır: yalnızca adları saklanır,
+        # model geri yüklenirken raporlayicilari_bagla ile yeniden bağlanır.
+        durum = dict(self.__dict__)
+        durum['model_reporters'] = list(self.model_reporters)
+        return durum
+    
+    def raporlayicilari_bagla(self, model_reporters):
+        """Geri yüklenen toplayıcıya aynı adlı raporlayıcı fonksiyonlarını bağlar."""
+        self.model_reporters = {ad: model_reporters[ad] for ad in self.model_reporters}
+    
+    def rezerve(self, yil_sayisi):
+        """En az yil_sayisi ek satır için yer ayırır."""
+        gerekli = self.n + yil_sayisi
+        if gerekli > self._kapasite:
+            self._buyut(gerekli)
+    
+    def _buyut(self, kapasite):
+        self._kapasite = kapasite
+        for ad, dizi in self._sutunlar.items():
+            yeni = np.zeros((kapasite,) + dizi.shape[1:], dtype=dizi.dtype)
+            yeni[:self.n] = dizi[:self.n]
+            self._sutunlar[ad] = yeni
+    
+    @staticmethod
+    def _dtype(deger):
+        """İlk değerden sütun tipi (pandas çıkarımıyla uyumlu)."""
+        if isinstance(deger, (bool, np.bool_)):
+            return np.bool_
+        if isinstance(deger, (int, np.integer)):
+            return np.int64
+        if isinstance(deger, (float, np.floating)):
+            return np.float64
+        return object
+    
+    def collect(self, model):
+        """Aktif raporlayıcıları çalıştırıp değerleri bir sonraki satıra yazar."""
+        if self.n == self._kapasite:
+            self._buyut(2 * self._kapasite)
+        t = self.n
+        for ad, raporlayici in self.model_reporters.items():
+            if isinstance(raporlayici, tuple):
+                fonksiyon, sutun_adlari = raporlayici
+                deger = np.asarray(fonksiyon(model), dtype=float)
+                if ad not in self._sutunlar:
+                    self._matris_adlari[ad] = list(sutun_adlari)
+                    self._sutunlar[ad] = np.zeros((self._kapasite, len(deger)))
+            else:
+                deger = raporlayici(model)
+                if ad not in self._sutunlar:
+                    self._sutunlar[ad] = np.zeros(self._kapasite, dtype=self._dtype(deger))
+                elif (self._sutunlar[ad].dtype == np.int64
+                      and not isinstance(deger, (int, np.integer))):
+                    # Tam sayı sütununa ondalıklı değer geldi: float'a yükselt
+                    self._sutunlar[ad] = self._sutunlar[ad].astype(np.float64)
+            self._sutunlar[ad][t] = deger
+        self.n += 1
+    
+    def sutun(self, ad):
+        """Bir raporlayıcının toplanan değerleri (yıl boyunca)."""
+        return self._sutunlar[ad][:self.n]
+    
+    def matris(self, ad):
+        """2-B raporlayıcının yıl × sütun dizisi ve sütun adları."""
+        return self._sutunlar[ad][:self.n], self._matris_adlari[ad]
+    
+    def get_model_vars_dataframe(self):
+        """
+        Mesa DataCollector ile aynı biçimde DataFrame döndürür.
+        
+        2-B raporlayıcılar {sütun: değer} JSON metni olarak verilir.
+        """
+        veri = {}
+        for ad in self.model_reporters:
+            if ad not in self._sutunlar:
+                continue
+            if ad in self._matris_adlari:
+                dizi, sutun_adlari = self.matris(ad)
+                veri[ad] = [json.dumps(dict(zip(sutun_adlari, satir))) for satir in dizi.tolist()]
+            else:
+                veri[ad] = self.sutun(ad)
+        return pd.DataFrame(veri)
+
+
+# =============================================================================
+# ÇOK ORANLI ZAMANLAYICI
+# =============================================================================
+
+class CokOranliZamanlayici:
+    """
+    Ajan gruplarını farklı sıklıklarla çalıştıran yıl içi zamanlayıcı.
+    
+    Bir yıl alt_adim_sayisi tike bölünür (1: yıllık, 4: çeyreklik, 12: aylık).
+    Her ajan tipi yılda frekanslar[tip] kez çalışır (varsayılan 1 = yıllık);
+    tik t'de yalnızca t % periyot == 0 olan tipler etkinleştirilir. Yıl başı
+    tikinde (t = 0) tüm gruplar çalışır, bu nedenle alt_adim_sayisi=1 klasik
+    yıllık adımla aynıdır.
+    
+    Parametreler:
+    -------------
+    alt_adim_sayisi : int
+        Yıl başına tik sayısı (ALT_ADIM_SECENEKLERI'nden)
+    frekanslar : dict
+        {ajan_tipi: yılda çalışma sayısı}; tik sayısından sık olamaz
+    """
+    
+    ALT_ADIM_SECENEKLERI = (1, 4, 12)
+    
+    def __init__(self, alt_adim_sayisi=1, frekanslar=None):
+        if alt_adim_sayisi not in self.ALT_ADIM_SECENEKLERI:
+            raise ValueError(
+                f"❌ Geçersiz alt_adim_sayisi: {alt_adim_sayisi}. "
+                f"Geçerli seçenekler: {list(self.ALT_ADIM_SECENEKLERI)}"
+            )
+        self.alt_adim_sayisi = alt_adim_sayisi
+        self.periyotlar = {}  # ajan_tipi -> periyot (tik)
+        for tip, frekans in (frekanslar or {}).items():
+            if frekans not in self.ALT_ADIM_SECENEKLERI:
+                raise ValueError(
+                    f"❌ Geçersiz frekans ({tip}): {frekans}. "
+                    f"Geçerli seçenekler: {list(self.ALT_ADIM_SECENEKLERI)}"
+                )
+            self.periyotlar[tip] = alt_adim_sayisi // min(frekans, alt_adim_sayisi)
+        # Tik başına vadesi gelen yıl içi tipler (t = 0'da herkes çalışır)
+        self._vadesi_gelenler = [
+            frozenset(tip for tip, p in self.periyotlar.items() if t % p == 0)
+            for t in range(alt_adim_sayisi)
+        ]
+    
+    def periyot(self, ajan_tipi):
+        """Tipin iki çalışması arasındaki tik sayısı."""
+        return self.periyotlar.get(ajan_tipi, self.alt_adim_sayisi)
     
-    return il_emisyonlari
+    def sure(self, ajan_tipi):
+        """Tipin bir adımının kapsadığı süre (yıl)."""
+        return self.periyot(ajan_tipi) / self.alt_adim_sayisi
+    
+    def vadesi_gelen_tipler(self, tik):
+        """Yıl içi tik'te (> 0) çalışacak ajan tipleri."""
+        return self._vadesi_gelenler[tik]
 
 
 # =============================================================================
@@ -2264,6 +4580,17 @@ class TurkiyeETSModel(Model):
     # Türkiye ortalama emisyon faktörü [Kaynak: Enerji Bakanlığı 2024]
     EMISYON_FAKTORU_TR = 0.442  # ton CO₂/MWh
     
+    # Yıl içinde çalışabilen ajan tipleri ve varsayılan yıllık çalışma
+    # sayıları (alt_adim_sayisi > 1 iken). Adımları süreyle ölçeklenen
+    # tiplerdir; tesisler, yatırımcılar ve diğerleri yıllık kalır.
+    AJAN_FREKANSLARI = {"PiyasaOperatoru": 12, "Hanehalki": 12, "FinansKurumu": 4}
+    
+    # Karbon fiyatı belirleme seçenekleri (bkz. PiyasaOperatoru)
+    PIYASA_MEKANIZMALARI = ("formul", "emir_defteri", "denge")
+    
+    # Tesis ajanlarının kaynağı (bkz. tesis_tablosu_yukle)
+    TESIS_KAYNAKLARI = ("temsili", "tablo")
+    
     def __init__(self,
                  n_enerji=40,
                  n_sanayi=30,
@@ -2278,23 +4605,152 @@ class TurkiyeETSModel(Model):
                  vergi_artis_orani=5,  # %
                  senaryo_tipi="Siki_ETS",
                  veritabani_kullan=False,
-                 random_seed=None):
-        """Model başlatıcı."""
+                 random_seed=None,
+                 vektorel_tesisler=False,
+                 vektorel_haneler=False,
+                 toplam_kontrolu=False,
+                 raporlayicilar=None,
+                 girdiler=None,
+                 iskonto_orani=0.08,
+                 ekonomik_omur=10,
+                 verbose=True,
+                 alt_adim_sayisi=1,
+                 ajan_frekanslari=None,
+                 piyasa_mekanizmasi="formul",
+                 tesis_kaynagi="temsili",
+                 tesis_tablosu=None,
+                 olay_tabanli=True):
+        """
+        Model başlatıcı.
+        
+        vektorel_tesisler=True ise tesisler ajan nesneleri yerine TesisDizisi
+        satırları olarak tutulur ve her yıl toplu olarak çalıştırılır
+        (büyük tesis sayıları için). vektorel_haneler=True hanehalklarını
+        aynı şekilde HaneDizisi'nde tutar. Aynı seed ile sonuçlar aynıdır.
+        
+        toplam_kontrolu=True her adım sonunda artımlı toplamları tam tarama
+        ile doğrular (hata ayıklama, yavaş).
+        
+        raporlayicilar: toplanacak sütun adları (None = hepsi). Örn. Monte
+        Carlo yalnızca MC_RAPORLAYICILARI'nı toplar.
+        
+        girdiler: SimulationInputs (None = süreç başına bir kez yüklenen
+        SimulationInputs.varsayilan()). Baseline, tesis/il tabloları, dispatch
+        şablonu ve I-O modeli her model için yeniden yüklenmez.
+        
+        iskonto_orani, ekonomik_omur: tesislerin MAC önlemi NPV hesabında
+        kullanılan iskonto oranı ve yatırım ömrü (yıl).
+        
+        verbose=False kurulum ve ETS aşaması mesajlarını kapatır (Monte Carlo
+        işçileri, toplu koşular). Mesajlar 'tr_zero' logger'ına INFO
+        seviyesinde gider.
+        
+        alt_adim_sayisi: yıl başına tik sayısı (1, 4 veya 12). step() bir tik
+        ilerler; piyasa ve haneler AJAN_FREKANSLARI'na göre aylık, bankalar
+        çeyreklik, diğer ajanlar yıllık çalışır. ajan_frekanslari bu
+        varsayılanları {ajan_tipi: yılda çalışma sayısı} ile değiştirir.
+        Veri toplama ve ekonomik etki yıllıktır.
+        
+        piyasa_mekanizmasi: karbon fiyatının belirlenmesi (PIYASA_MEKANIZMALARI).
+        "formul" emisyon/cap oranı kuralı, "emir_defteri" tesis alış/satış
+        emirleriyle her piyasa tikinde çift taraflı açık artırmadır (tam
+        uygulamada öncesinde cap'in %30'u birincil açık artırmayla satılır).
+        "denge" tesislerin MAC tepkisiyle azaltım sonrası emisyonu cap'e
+        eşitleyen fiyatı ikili aramayla çözer.
+        
+        tesis_kaynagi: "temsili" n_enerji/n_sanayi/n_tarim/n_ihracatci rastgele
+        temsili tesis üretir. "tablo" tesisler tablosunun ETS kapsamındaki her
+        satırı için gerçek kapasite, emisyon faktörü, il ve yıllık emisyonla
+        bir tesis oluşturur (tesis sayısı parametreleri, n_ihracatci dahil,
+        kullanılmaz; ihracatçı olarak çekilen satırlar IhracatciAjani olur).
+        tesis_tablosu bu tabloyu bir DataFrame ile değiştirir (örn.
+        tesis_tablosunu_genislet çıktısı); None ise tesis_tablosu_yukle.
+        
+        olay_tabanli=False Aktif olmayan tesisleri uyutmaz, her yıl çalıştırır
+        (olay tabanlı etkinleştirmenin sonuçlarını doğrulamak için). Uyuyan
+        tesisler karıştırmaya girmediğinden bayrak aynı seed'in sonuçlarını
+        değiştirir; False bit düzeyinde bir referans değildir. İki mod yalnızca
+        ortak bir etkinleştirme sırasıyla (_ortak_sira) aynı sonucu verir.
+        """
+        self.verbose = verbose
+        if ekonomik_omur < 1:
+            raise ValueError(f"❌ Geçersiz ekonomik_omur: {ekonomik_omur}. En az 1 yıl olmalı.")
+        frekanslar = {**self.AJAN_FREKANSLARI, **(ajan_frekanslari or {})}
+        bilinmeyen = set(frekanslar) - set(self.AJAN_FREKANSLARI)
+        if bilinmeyen:
+            raise ValueError(
+                f"❌ Yıl içi frekans verilemeyen ajan tipi: {sorted(bilinmeyen)}. "
+                f"Geçerli seçenekler: {list(self.AJAN_FREKANSLARI)}"
+            )
+        self.zamanlayici = CokOranliZamanlayici(alt_adim_sayisi, frekanslar)
+        if piyasa_mekanizmasi not in self.PIYASA_MEKANIZMALARI:
+            raise ValueError(
+                f"❌ Geçersiz piyasa_mekanizmasi: {piyasa_mekanizmasi}. "
+                f"Geçerli seçenekler: {list(self.PIYASA_MEKANIZMALARI)}"
+            )
+        self.piyasa_mekanizmasi = piyasa_mekanizmasi
+        if tesis_kaynagi not in self.TESIS_KAYNAKLARI:
+            raise ValueError(
+                f"❌ Geçersiz tesis_kaynagi: {tesis_kaynagi}. "
+                f"Geçerli seçenekler: {list(self.TESIS_KAYNAKLARI)}"
+            )
+        self.tesis_kaynagi = tesis_kaynagi
+        self.alt_adim = 0  # yıl içi tik (0 = yıl başı)
         
         # Random seed
         if random_seed is None:
             random_seed = int(datetime.now().timestamp() * 1000) % 100000
         super().__init__(seed=random_seed)
-        random.seed(random_seed)
-        np.random.seed(random_seed)
+        self._akislari_olustur(random_seed)
+        
+        # --- AJAN KAYIT DEFTERİ (tip/durum bazlı canlı görünümler) ---
+        self.kayit = AjanKayitDefteri()
+        
+        # --- VEKTÖREL TESİS / HANE MOTORU ---
+        # Adım sırası: ajanlar ve dizi satırları oluşturulma sırasıyla
+        # (shuffle_do ile aynı karıştırma permütasyonu için), kod = satir*3 + tur
+        self._adim_sirasi = []
+        self._sira_ajanlari = []
+        
+        # --- OLAY TABANLI ETKİNLEŞTİRME ---
+        # Kapali/Donusum/Temiz tesisler etkin kümeden çıkarılır (adım kodu
+        # bazında uyku maskesi); yatırım tamamlanmaları yıl anahtarlı öncelik
+        # kuyruğundan gelir. CBAM'a tabi ihracatçılar (fiyat aboneleri) CBAM'ı
+        # adım anındaki fiyatla hesapladığından uyutulmaz.
+        self.olay_tabanli = olay_tabanli
+        self._uyuyan = np.zeros(0, dtype=bool)
+        self._uyuyan_sayisi = 0
+        self._uyanis_olaylari = []   # heap: (uyanış yılı, adım kodları listesi)
+        # TopluSenaryoModeli'nin tik başına verdiği ortak karıştırma (adım
+        # sırası konumlarının permütasyonu); None ise self.random.shuffle
+        self._ortak_sira = None
+        self.iskonto_orani = iskonto_orani
+        self.ekonomik_omur = ekonomik_omur
+        self.tesis_dizisi = (
+            TesisDizisi(n_enerji + n_sanayi + n_tarim + n_ihracatci
+                        if tesis_kaynagi == "temsili" else 0,
+                        iskonto_orani=iskonto_orani, ekonomik_omur=ekonomik_omur)
+            if vektorel_tesisler else None
+        )
+        self.hane_dizisi = None
+        self.toplam_kontrolu = toplam_kontrolu
+        
+        # --- PAYLAŞILAN GİRDİLER (baseline, tablolar, modüller) ---
+        if girdiler is None:
+            girdiler = SimulationInputs.varsayilan()
+        self.girdiler = girdiler
+        if tesis_kaynagi == "tablo":
+            if tesis_tablosu is None:
+                tesis_tablosu = tesis_tablosu_yukle(girdiler)
+            tesis_verisi = tesis_sutunlari(tesis_tablosu)
         
         # --- AI BASELINE KALİBRASYONU (V4.5) ---
-        baseline = load_ai_baseline()
+        baseline = girdiler.baseline
         if baseline:
             # AI tahmininden başlangıç değerlerini al
             suggested_cap = baseline['simulation_params']['suggested_ets_cap_2026']
             baslangic_cap = suggested_cap  # AI'nın önerdiği Cap ile başla
-            print(f"✅ AI Baseline entegre edildi: Başlangıç Cap = {baslangic_cap:.1f} Mt")
+            self._bilgi(f"✅ AI Baseline entegre edildi: Başlangıç Cap = {baslangic_cap:.1f} Mt")
 
         # --- TEMEL PARAMETRELER ---
         self.yil = 2025
@@ -2312,25 +4768,16 @@ class TurkiyeETSModel(Model):
         
         # --- VERİTABANI ENTEGRASYİYONU ---
         self.il_katsayilari = {}
-        if veritabani_kullan: 
-            self._veritabani_yukle()
+        if veritabani_kullan and girdiler.il_katsayilari:
+            self.il_katsayilari = dict(girdiler.il_katsayilari)
+            self._bilgi(f"✅ Veritabanı yüklendi: {len(self.il_katsayilari)} bölge")
         
         # --- MODÜL BAŞLATMA (V4.5) ---
         if MODULES_AVAILABLE:
-            # Enerji Dispatch Modülü - Santraller veritabanından veya dummy
-            import sqlite3
-            try:
-                conn = sqlite3.connect(DB_PATH)
-                df_plants = pd.read_sql("SELECT * FROM tesisler", conn)
-                conn.close()
-            except:
-                df_plants = pd.DataFrame([
-                    {"Tesis_Adi": "Ornek_Santral", "Kapasite_MW": 1000, "Yakit_Tipi": "Linyit"}
-                ])
-            
-            self.dispatch_modulu = EnerjiDispatchModulu(df_plants, karbon_fiyati=0)
-            self.ekonomi_modulu = InputOutputModel()
-            print("🚀 Dispatch ve Ekonomi modülleri başlatıldı.")
+            # Dispatch: paylaşılan merit-order şablonunun kopyası (yıllık güncellenir)
+            self.dispatch_modulu = girdiler.dispatch_kopyasi()
+            self.ekonomi_modulu = girdiler.io_model
+            self._bilgi("🚀 Dispatch ve Ekonomi modülleri başlatıldı.")
         else:
             self.dispatch_modulu = None
             self.ekonomi_modulu = None
@@ -2341,6 +4788,15 @@ class TurkiyeETSModel(Model):
             "Gaziantep", "Konya", "Antalya", "Mersin", "Kayseri", "Eskisehir",
             "Sakarya", "Denizli", "Manisa", "Zonguldak", "Hatay", "Samsun"
         ]
+        if tesis_kaynagi == "tablo":
+            # Tablodaki listede olmayan iller il bazlı toplamlara eklenir
+            bilinen = set(self.iller)
+            self.iller += [il for il in pd.unique(tesis_verisi["il"]) if il not in bilinen]
+        
+        # --- ARTIMLI TOPLAMLAR (emisyon/durum deltaları) ---
+        self.toplamlar = EmisyonToplamlari(self.iller)
+        if self.tesis_dizisi is not None:
+            self.tesis_dizisi.toplamlar = self.toplamlar
         
         # --- 1. PİYASA OPERATÖRÜ (DÜZELTİLMİŞ) ---
         self.piyasa_operatoru = PiyasaOperatoru(self, baslangic_cap, cap_azalma_orani)
@@ -2352,27 +4808,37 @@ class TurkiyeETSModel(Model):
         self.agents.add(self.mrv_merkezi)  # ✅ AGENTS LİSTESİNE EKLENDİ
         
         # --- 3. TESİSLER (İl bazlı dağıtım) ---
-        for _ in range(n_enerji):
-            city = random.choice(self. iller)
-            EndustriyelTesis(self, "Enerji", city=city)
-        
-        for _ in range(n_sanayi):
-            city = random. choice(self.iller)
-            EndustriyelTesis(self, "Sanayi", city=city)
-        
-        for _ in range(n_tarim):
-            city = random.choice(self.iller)
-            EndustriyelTesis(self, "Tarim", city=city)
+        if tesis_kaynagi == "tablo":
+            self._tablo_tesisleri_ekle(tesis_verisi)
+        else:
+            for _ in range(n_enerji):
+                city = self.il_sec()
+                self._tesis_ekle(EndustriyelTesis, "Enerji", city)
+            
+            for _ in range(n_sanayi):
+                city = self.il_sec()
+                self._tesis_ekle(EndustriyelTesis, "Sanayi", city)
+            
+            for _ in range(n_tarim):
+                city = self.il_sec()
+                self._tesis_ekle(EndustriyelTesis, "Tarim", city)
+            
+            # --- 4. İHRACATÇI AJANLAR ---
+            for _ in range(n_ihracatci):
+                city = self.il_sec()
+                self._tesis_ekle(IhracatciAjani, "Sanayi", city)
         
-        # --- 4. İHRACATÇI AJANLAR ---
-        for _ in range(n_ihracatci):
-            city = random.choice(self.iller)
-            IhracatciAjani(self, "Sanayi", city=city)
+        if self.tesis_dizisi is not None:
+            self.tesis_dizisi.tamamla()
         
         # --- 5. HANEHALKİ AJANLARI ---
-        for _ in range(n_hanehalki):
-            city = random.choice(self.iller)
-            Hanehalki(self, city=city)
+        if vektorel_haneler:
+            self.hane_dizisi = HaneDizisi(self, n_hanehalki)
+            self._adim_sirasi.extend((np.arange(n_hanehalki) * 3 + SLOT_HANE).tolist())
+        else:
+            for _ in range(n_hanehalki):
+                city = self.il_sec()
+                Hanehalki(self, city=city)
 
         # --- 5. 1 ULAŞIM AJANLARI (YENİ EKLENEN - v2.2) ---
         """
@@ -2395,7 +4861,7 @@ class TurkiyeETSModel(Model):
             )
             self.agents.add(ulasim_ajani)
         
-        print(f"✅ Ulaşım ajanları oluşturuldu: {len(ulasim_tipleri)} mod")
+        self._bilgi(f"✅ Ulaşım ajanları oluşturuldu: {len(ulasim_tipleri)} mod")
         
         # --- 6. YATIRIMCILAR ---
         for _ in range(n_yatirimci):
@@ -2405,7 +4871,7 @@ class TurkiyeETSModel(Model):
         # Şebeke Operatörü (TSO)
         self.sebeke_operatoru = SebekeOperatoru(self, bolge="Ulusal")
         self.agents.add(self.sebeke_operatoru)
-        print("✅ Şebeke Operatörü oluşturuldu")
+        self._bilgi("✅ Şebeke Operatörü oluşturuldu")
         
         # Finans Kurumları (3 tip banka)
         self.finans_kurumlari = []
@@ -2413,7 +4879,7 @@ class TurkiyeETSModel(Model):
             banka = FinansKurumu(self, banka_tipi=banka_tipi)
             self.finans_kurumlari.append(banka)
             self.agents.add(banka)
-        print(f"✅ Finans kurumları oluşturuldu: {len(self.finans_kurumlari)} banka")
+        self._bilgi(f"✅ Finans kurumları oluşturuldu: {len(self.finans_kurumlari)} banka")
         
         # Belediyeler (büyükşehirler)
         self.belediyeler = []
@@ -2423,161 +4889,360 @@ class TurkiyeETSModel(Model):
             belediye = Belediye(self, city=city)
             self.belediyeler.append(belediye)
             self.agents.add(belediye)
-        print(f"✅ Belediyeler oluşturuldu: {len(self.belediyeler)} belediye")
+        self._bilgi(f"✅ Belediyeler oluşturuldu: {len(self.belediyeler)} belediye")
         
         # Ekonomik Etki Modülü
         self.ekonomik_etki = EkonomikEtkiModulu(self)
-        print("✅ Ekonomik Etki Modülü oluşturuldu")
+        self._bilgi("✅ Ekonomik Etki Modülü oluşturuldu")
         
         # --- VERİ TOPLAMA ---
-        self.datacollector = DataCollector(
-            model_reporters={
-                "Yil": lambda m: m.yil,
-                "Karbon_Fiyati": lambda m: m. karbon_fiyati,
-                "Toplam_Emisyon": lambda m: self._toplam_emisyon(m),
-                "Aktif_Tesis": lambda m: self._tesis_sayisi(m, "Aktif"),
-                "Donusum_Tesis": lambda m: self._tesis_sayisi(m, "Donusum"),
-                "Temiz_Tesis": lambda m:  self._tesis_sayisi(m, "Temiz"),
-                "Kapali_Tesis": lambda m: self._tesis_sayisi(m, "Kapali"),
-                "Yenilenebilir_Kapasite_MW": lambda m: m.yenilenebilir_kapasite,
-                "Cap":  lambda m: m.piyasa_operatoru.cap,
-                "Senaryo": lambda m: m. senaryo_tipi,
-                "CBAM_Toplam_Maliyet": lambda m: self._cbam_toplam_maliyet(m),
-                "MRV_Toplam_Ceza": lambda m: m.mrv_merkezi.toplam_ceza,
-                "Ihracatci_Tesis": lambda m: self._ihracatci_sayisi(m),
-                "Hanehalki_Sayisi": lambda m: self._hanehalki_sayisi(m),
-                "Hanehalki_Emisyon": lambda m: self._hanehalki_emisyon(m),
-                # Ulaşım Metrikleri (YENİ EKLENEN - v2.2)
-                "Ulasim_Toplam_Emisyon": lambda m: sum([
-                    a.get_emisyon() 
-                    for a in m.agents 
-                    if hasattr(a, 'ajan_tipi') and a.ajan_tipi == "Ulasim"
-                ]),
-                "Karayolu_EV_Penetrasyon": lambda m: (
-                    [a.ev_pay for a in m.agents 
-                     if hasattr(a, 'ulasim_tipi') and a.ulasim_tipi == 'karayolu'][0] 
-                    if any(hasattr(a, 'ulasim_tipi') and a.ulasim_tipi == 'karayolu' 
-                           for a in m.agents) 
-                    else 0.0
-                ),
-                "Ulasim_Azaltim_Orani": lambda m: (
-                    sum([a.get_azaltim_orani() for a in m.agents 
-                         if hasattr(a, 'ajan_tipi') and a.ajan_tipi == "Ulasim"]) / 
-                    max(1, sum([1 for a in m.agents 
-                               if hasattr(a, 'ajan_tipi') and a.ajan_tipi == "Ulasim"]))
-                ),
-                # İl Bazlı Emisyonlar (YENİ - v2.2) - JSON formatında
-                "Il_Emisyonlari_JSON": lambda m: __import__('json').dumps(
-                    il_bazli_emisyon_hesapla(m)
-                ),
-                # İl bazlı toplam (hızlı erişim için)
-                "Istanbul_Emisyon": lambda m: sum([
-                    a.emisyon for a in m.agents
-                    if hasattr(a, 'city') and a.city == "Istanbul"
-                    and hasattr(a, 'emisyon') and getattr(a, 'durum', 'Aktif') != "Kapali"
-                ]),
-                "Ankara_Emisyon": lambda m: sum([
-                    a.emisyon for a in m.agents
-                    if hasattr(a, 'city') and a.city == "Ankara"
-                    and hasattr(a, 'emisyon') and getattr(a, 'durum', 'Aktif') != "Kapali"
-                ]),
-                "Izmir_Emisyon": lambda m: sum([
-                    a.emisyon for a in m.agents
-                    if hasattr(a, 'city') and a.city == "Izmir"
-                    and hasattr(a, 'emisyon') and getattr(a, 'durum', 'Aktif') != "Kapali"
-                ]),
-                # Grid Emisyon Faktörü (YENİ - v2.2)
-                "Grid_Emisyon_Faktoru": lambda m: (
-                    m.sebeke_operatoru.grid_emisyon_faktoru 
-                    if hasattr(m, 'sebeke_operatoru') else 0.442
-                ),
-                # Ekonomik Etkiler (YENİ - v2.2)
-                "GDP_Etkisi_USD": lambda m: (
-                    m.ekonomik_etki.gdp_etkisi 
-                    if hasattr(m, 'ekonomik_etki') else 0
-                ),
-                "Istihdam_Etkisi_Kisi": lambda m: (
-                    m.ekonomik_etki.istihdam_etkisi 
-                    if hasattr(m, 'ekonomik_etki') else 0
-                ),
-                # Belediye Toplam Transit Kapasitesi (YENİ - v2.2)
-                "Ortalama_Transit_Kapasite": lambda m: (
-                    sum([b.transit_capacity for b in m.belediyeler]) / len(m.belediyeler)
-                    if hasattr(m, 'belediyeler') and len(m.belediyeler) > 0 else 0
+        self.datacollector = SutunluVeriToplayici(
+            aktif=raporlayicilar,
+            model_reporters=self._model_raporlayicilari()
+        )
+
+    
+    def _model_raporlayicilari(self):
+        """Veri toplayıcının {sütun: fonksiyon(model)} raporlayıcıları."""
+        return {
+            "Yil": lambda m: m.yil,
+            "Karbon_Fiyati": lambda m: m. karbon_fiyati,
+            "Toplam_Emisyon": lambda m: self._toplam_emisyon(m),
+            "Aktif_Tesis": lambda m: self._tesis_sayisi(m, "Aktif"),
+            "Donusum_Tesis": lambda m: self._tesis_sayisi(m, "Donusum"),
+            "Temiz_Tesis": lambda m:  self._tesis_sayisi(m, "Temiz"),
+            "Kapali_Tesis": lambda m: self._tesis_sayisi(m, "Kapali"),
+            "Yenilenebilir_Kapasite_MW": lambda m: m.yenilenebilir_kapasite,
+            "Cap":  lambda m: m.piyasa_operatoru.cap,
+            "Senaryo": lambda m: m. senaryo_tipi,
+            "CBAM_Toplam_Maliyet": lambda m: self._cbam_toplam_maliyet(m),
+            "MRV_Toplam_Ceza": lambda m: m.mrv_merkezi.toplam_ceza,
+            "Ihracatci_Tesis": lambda m: self._ihracatci_sayisi(m),
+            "Hanehalki_Sayisi": lambda m: self._hanehalki_sayisi(m),
+            "Hanehalki_Emisyon": lambda m: self._hanehalki_emisyon(m),
+            # Ulaşım Metrikleri (YENİ EKLENEN - v2.2)
+            "Ulasim_Toplam_Emisyon": lambda m: sum([
+                a.get_emisyon() for a in m.kayit.tip("Ulasim")
+            ]),
+            "Karayolu_EV_Penetrasyon": lambda m: next(
+                (a.ev_pay for a in m.kayit.tip("Ulasim")
+                 if a.ulasim_tipi == 'karayolu'),
+                0.0
+            ),
+            "Ulasim_Azaltim_Orani": lambda m: (
+                sum([a.get_azaltim_orani() for a in m.kayit.tip("Ulasim")]) / 
+                max(1, m.kayit.sayi("Ulasim"))
+            ),
+            # İl Bazlı Emisyonlar (YENİ - v2.2) - yıl × il dizisi, DataFrame'de JSON
+            "Il_Emisyonlari_JSON": (lambda m: m.toplamlar.il_emisyon, self.iller),
+            # İl bazlı toplam (hızlı erişim için)
+            "Istanbul_Emisyon": lambda m: m._acik_emisyon(city="Istanbul"),
+            "Ankara_Emisyon": lambda m: m._acik_emisyon(city="Ankara"),
+            "Izmir_Emisyon": lambda m: m._acik_emisyon(city="Izmir"),
+            # Grid Emisyon Faktörü (YENİ - v2.2)
+            "Grid_Emisyon_Faktoru": lambda m: (
+                m.sebeke_operatoru.grid_emisyon_faktoru 
+                if hasattr(m, 'sebeke_operatoru') else 0.442
+            ),
+            # Ekonomik Etkiler (YENİ - v2.2)
+            "GDP_Etkisi_USD": lambda m: (
+                m.ekonomik_etki.gdp_etkisi 
+                if hasattr(m, 'ekonomik_etki') else 0
+            ),
+            "Istihdam_Etkisi_Kisi": lambda m: (
+                m.ekonomik_etki.istihdam_etkisi 
+                if hasattr(m, 'ekonomik_etki') else 0
+            ),
+            # Belediye Toplam Transit Kapasitesi (YENİ - v2.2)
+            "Ortalama_Transit_Kapasite": lambda m: (
+                sum([b.transit_capacity for b in m.belediyeler]) / len(m.belediyeler)
+                if hasattr(m, 'belediyeler') and len(m.belediyeler) > 0 else 0
+            )
+        }
+    
+    # Ajan gruplarının bağımsız rastgele sayı akışları (sıra sabittir:
+    # yeni grup eklemek mevcut akışları değiştirmez, sona eklenmelidir)
+    AKIS_GRUPLARI = ("konum", "tesis", "hanehalki", "mrv", "yatirimci", "belediye")
+    
+    def _akislari_olustur(self, seed):
+        """
+        Her ajan grubu için modelin seed'inden türetilmiş (SeedSequence.spawn)
+        bağımsız bir numpy Generator oluşturur. Küresel random/np.random
+        kullanılmaz; aynı süreçteki modeller birbirini etkilemez.
+        """
+        self.akislar = {
+            grup: np.random.default_rng(alt_seed)
+            for grup, alt_seed in zip(
+                self.AKIS_GRUPLARI,
+                np.random.SeedSequence(seed).spawn(len(self.AKIS_GRUPLARI))
+            )
+        }
+    
+    def il_sec(self):
+        """Ajan konumu için rastgele bir il (konum akışından)."""
+        return self.iller[int(self.akislar["konum"].random() * len(self.iller))]
+    
+    def il_indeksleri(self, n):
+        """n ardışık il_sec çağrısıyla aynı il indeksleri (tek toplu çekiliş)."""
+        return (self.akislar["konum"].random(n) * len(self.iller)).astype(np.int64)
+    
+    def _bilgi(self, mesaj):
+        """verbose açıksa model mesajını INFO seviyesinde loglar."""
+        if self.verbose:
+            logger.info(mesaj)
+    
+    def register_agent(self, agent):
+        """Mesa kaydına ek olarak ajanı tip koleksiyonlarına ekler."""
+        super().register_agent(agent)
+        self.kayit.ekle(agent)
+        self._adim_sirasi.append(len(self._sira_ajanlari) * 3 + SLOT_AJAN)
+        self._sira_ajanlari.append(agent)
+    
+    def deregister_agent(self, agent):
+        """Ajanı Mesa kaydından ve tip/durum koleksiyonlarından çıkarır."""
+        super().deregister_agent(agent)
+        self.kayit.cikar(agent)
+        i = self._sira_ajanlari.index(agent)
+        self._sira_ajanlari[i] = None
+        self._adim_sirasi.remove(i * 3 + SLOT_AJAN)
+    
+    def _tesis_ekle(self, sinif, sektor, city):
+        """
+        Tesis oluşturur: nesne modunda ajan, vektörel modda TesisDizisi satırı.
+        
+        Vektörel mod, EndustriyelTesis.__init__ ile aynı rastgele sayıları
+        aynı sırayla çeker.
+        """
+        if self.tesis_dizisi is None:
+            return sinif(self, sektor, city=city)
+        
+        profil = SEKTOR_PROFILLERI.get(sektor, SEKTOR_PROFILLERI["Sanayi"])
+        il_katsayi = self.il_katsayilari.get(city, {}).get(sektor.lower(), 1.0)
+        akis = self.akislar["tesis"]
+        emisyon = profil["baz_emisyon"] * akis.uniform(0.7, 1.3) * il_katsayi
+        ihracatci = akis.random() < profil["ihracat_orani"]
+        satir = self.tesis_dizisi.ekle(
+            sektor, self.toplamlar.il_kodu(city), emisyon, ihracatci,
+            ihracatci_tesis=issubclass(sinif, IhracatciAjani)
+        )
+        self._adim_sirasi.append(satir * 3 + SLOT_TESIS)
+        return satir
+    
+    def _tablo_tesisleri_ekle(self, veri):
+        """
+        tesis_sutunlari çıktısındaki her satır için bir EndustriyelTesis
+        oluşturur; vektörel modda satırlar TesisDizisi'ne toplu eklenir.
+        
+        İhracatçı bayrakları sektörün ihracat oranıyla tek çekilişte belirlenir.
+        İhracatçı satırlar IhracatciAjani olur (n_ihracatci yerine): SKDM
+        kapsamlı sektörlerde CBAM maliyeti taşır ve Ihracatci_Tesis'e sayılır.
+        """
+        n = len(veri["emisyon"])
+        ihracat_orani = np.array([SEKTOR_PROFILLERI[s]["ihracat_orani"] for s in SEKTOR_LISTESI])
+        ihracatci = self.akislar["tesis"].random(n) < ihracat_orani[veri["sektor_kodu"]]
+        if self.tesis_dizisi is None:
+            for i in range(n):
+                sinif = IhracatciAjani if ihracatci[i] else EndustriyelTesis
+                sinif(
+                    self, SEKTOR_LISTESI[veri["sektor_kodu"][i]], city=veri["il"][i],
+                    emisyon=float(veri["emisyon"][i]), ihracatci=bool(ihracatci[i]),
+                    kapasite_mw=float(veri["kapasite_mw"][i]),
+                    emisyon_faktoru=float(veri["emisyon_faktoru"][i])
                 )
-            }
+            return
+        il_kodu = pd.Index(self.iller).get_indexer(veri["il"])
+        satirlar = self.tesis_dizisi.toplu_ekle(
+            veri["sektor_kodu"], il_kodu, veri["emisyon"], ihracatci,
+            veri["kapasite_mw"], veri["emisyon_faktoru"], ihracatci_tesis=ihracatci
         )
+        self._adim_sirasi.extend((satirlar * 3 + SLOT_TESIS).tolist())
     
-    def _veritabani_yukle(self):
-        """SQLite veritabanından il katsayılarını yükler."""
-        db_path = os.path.join(PROJECT_ROOT, "iklim_veritabani.sqlite")
+    def _tesis_emisyonlari(self):
+        """
+        Açık (kapalı olmayan) tesislerin il kodu, sektör kodu ve emisyon
+        dizileri, oluşturulma sırasıyla (tam tarama).
+        """
+        if self.tesis_dizisi is None:
+            acik = [a for a in self.kayit.tesisler() if a.durum != "Kapali"]
+            return (np.array([a.il_kodu for a in acik], dtype=np.int64),
+                    np.array([a.sektor_kodu for a in acik], dtype=np.int64),
+                    np.array([a.emisyon for a in acik], dtype=float))
+        td = self.tesis_dizisi
+        maske = td.acik()
+        return td.il_kodu[maske], td.sektor_kodu[maske], td.emisyon[maske]
+    
+    def tesis_alanlari(self, adlar):
+        """
+        Açık tesislerin istenen alanları (TesisDizisi.ALANLAR adlarıyla),
+        oluşturulma sırasıyla. durum DURUM_KODLARI indeksidir.
         
-        if os.path.exists(db_path):
-            try:
-                conn = sqlite3.connect(db_path)
-                df_il = pd.read_sql("SELECT * FROM il_katsayilari", conn)
-                
-                if not df_il.empty and 'Bolge' in df_il.columns:
-                    for _, row in df_il.iterrows():
-                        self.il_katsayilari[row['Bolge']] = {
-                            'enerji': row.get('Enerji_Katsayisi', 1.0),
-                            'sanayi': row.get('Sanayi_Katsayisi', 1.0),
-                            'tarim': row.get('Tarim_Katsayisi', 1.0)
-                        }
-                
-                conn.close()
-                print(f"✅ Veritabanı yüklendi: {len(self.il_katsayilari)} bölge")
-                
-            except Exception as e: 
-                print(f"⚠️ Veritabanı yüklenemedi: {e}")
+        Uyuyan tesislerin atlanan yılları önce işlenir (bankalar günceldir).
+        
+        Returns:
+        --------
+        (satirlar, alanlar) : izin_transferi'ne verilecek ajan listesi veya
+            satır indeksleri; {ad: dizi}
+        """
+        if self.tesis_dizisi is None:
+            acik = [a for a in self.kayit.tesisler() if a.durum != "Kapali"]
+            for a in acik:
+                a._yillari_yakala()
+            alanlar = {}
+            for ad in adlar:
+                if ad == "durum":
+                    alanlar[ad] = np.array([DURUM_KODLARI.index(a.durum) for a in acik], dtype=np.int8)
+                elif ad == "son_adim_yili":
+                    alanlar[ad] = np.array([a._son_adim_yili for a in acik], dtype=np.int16)
+                else:
+                    alanlar[ad] = np.array([getattr(a, ad) for a in acik])
+            return acik, alanlar
+        td = self.tesis_dizisi
+        idx = np.flatnonzero(td.acik())
+        td._yillari_yakala(idx, self.yil)
+        return idx, {ad: getattr(td, ad)[idx] for ad in adlar}
+    
+    def izin_transferi(self, satirlar, miktar, bankalandi=None):
+        """
+        Piyasa işlemlerini (Mt; + alış, - satış) tesis izin bankalarına yazar.
+        
+        bankalandi: bu yılın bankalamasını (adımını) yapmış satırlar. Bunlarda
+        alınan izin, bankalamadan önce alınmış gibi önce net_emisyon'u kapatır;
+        henüz adım atmamış tesisler bankadaki izni kendi bankalamalarında kullanır.
+        """
+        if bankalandi is None:
+            bankalandi = np.zeros(len(miktar), dtype=bool)
+        if self.tesis_dizisi is None:
+            for ajan, m, b in zip(satirlar, miktar.tolist(), bankalandi.tolist()):
+                if not m:
+                    continue
+                if b and m > 0:
+                    kapanan = min(m, ajan.net_emisyon)
+                    ajan.net_emisyon -= kapanan
+                    ajan.bankalanan -= kapanan
+                    m -= kapanan
+                ajan.izin_bankasi += m
+        else:
+            td = self.tesis_dizisi
+            kapanan = np.where(bankalandi,
+                               np.minimum(np.maximum(miktar, 0.0), td.net_emisyon[satirlar]), 0.0)
+            td.net_emisyon[satirlar] -= kapanan
+            td.bankalanan[satirlar] -= kapanan
+            td.izin_bankasi[satirlar] += miktar - kapanan
+    
+    def _hane_emisyonlari(self):
+        """Hanehalklarının il kodu ve emisyon dizileri, oluşturulma sırasıyla."""
+        if self.hane_dizisi is None:
+            acik = [a for a in self.kayit.tip("Hanehalki") if a.durum != "Kapali"]
+            return (np.array([a.il_kodu for a in acik], dtype=np.int64),
+                    np.array([a.emisyon for a in acik], dtype=float))
+        hd = self.hane_dizisi
+        return hd.il_kodu, hd.emisyon
+    
+    def _acik_tesis_emisyonu(self):
+        """Açık tesislerin toplam emisyonu (Mt CO₂)."""
+        return self.toplamlar.tesis_emisyon
+    
+    def _acik_emisyon(self, city=None):
+        """Açık tesis + hanehalkı emisyonu; city verilirse o il için."""
+        if city is None:
+            return self.toplamlar.toplam_emisyon
+        return self.toplamlar.il(city)
+    
+    def _donusum_yatirimlari(self):
+        """Dönüşümdeki tesisler için (sektör, yatırım bedeli) çiftleri."""
+        if self.tesis_dizisi is None:
+            return [(a.sektor, a.yatirim_bedeli) for a in self.kayit.durumda("Donusum")]
+        td = self.tesis_dizisi
+        return [
+            (SEKTOR_LISTESI[k], SEKTOR_PROFILLERI[SEKTOR_LISTESI[k]]["yatirim_bedeli"])
+            for k in td.sektor_kodu[td.durum == DONUSUM]
+        ]
     
     def _toplam_emisyon(self, model):
         """Toplam emisyonu hesaplar."""
-        return sum(
-            a.emisyon for a in model.agents
-            if hasattr(a, 'ajan_tipi') and a.ajan_tipi in ["Tesis", "IhracatciTesis", "Hanehalki"] 
-            and getattr(a, 'durum', 'Aktif') != "Kapali"
-        )
+        return model._acik_emisyon()
     
     def _tesis_sayisi(self, model, durum):
         """Belirli durumdaki tesis sayısını hesaplar."""
-        return sum(
-            1 for a in model.agents
-            if hasattr(a, 'ajan_tipi') and a.ajan_tipi in ["Tesis", "IhracatciTesis"] 
-            and a.durum == durum
-        )
+        return model.toplamlar.durum_sayisi(durum)
     
     def _cbam_toplam_maliyet(self, model):
         """Toplam CBAM maliyetini hesaplar."""
-        return sum(
-            a.cbam_maliyeti for a in model.agents
-            if hasattr(a, 'cbam_maliyeti')
-        )
+        return model.toplamlar.cbam_maliyeti
     
     def _ihracatci_sayisi(self, model):
         """İhracatçı tesis sayısını hesaplar."""
-        return sum(
-            1 for a in model.agents
-            if hasattr(a, 'ajan_tipi') and a.ajan_tipi == "IhracatciTesis"
-        )
+        if model.tesis_dizisi is not None:
+            return int(np.count_nonzero(model.tesis_dizisi.ihracatci_tesis))
+        return model.kayit.sayi("IhracatciTesis")
     
     def _hanehalki_sayisi(self, model):
         """Hanehalkı ajan sayısını hesaplar."""
-        return sum(
-            1 for a in model.agents
-            if hasattr(a, 'ajan_tipi') and a.ajan_tipi == "Hanehalki"
-        )
+        if model.hane_dizisi is not None:
+            return model.hane_dizisi.n
+        return model.kayit.sayi("Hanehalki")
     
     def _hanehalki_emisyon(self, model):
         """Hanehalkı toplam emisyonunu hesaplar."""
-        return sum(
-            a.emisyon for a in model.agents
-            if hasattr(a, 'ajan_tipi') and a.ajan_tipi == "Hanehalki"
-        )
+        return model.toplamlar.hane_emisyon
+    
+    def toplamlari_dogrula(self, rtol=1e-9, atol=1e-9):
+        """
+        Artımlı toplamları (EmisyonToplamlari) tam tarama ile karşılaştırır.
+        
+        Hata ayıklama amaçlıdır; toplam_kontrolu=True ile her adım sonunda
+        otomatik çağrılır. Uyuşmazlıkta RuntimeError fırlatır.
+        """
+        t = self.toplamlar
+        if self.tesis_dizisi is not None:
+            td = self.tesis_dizisi
+            taranan_cbam = _sirali_toplam(td.cbam_maliyeti[td.ihracatci_tesis])
+            taranan_durum = {d: td.durum_sayisi(d) for d in DURUM_KODLARI}
+        else:
+            taranan_cbam = sum(a.cbam_maliyeti for a in self.kayit.tip("IhracatciTesis"))
+            taranan_durum = {d: self.kayit.durum_sayisi(d) for d in DURUM_KODLARI}
+        
+        # Emisyonlar: tek geçişte il ve sektör bazında grupla (bincount)
+        il_t, sektor_t, emisyon_t = self._tesis_emisyonlari()
+        il_h, emisyon_h = self._hane_emisyonlari()
+        il_kodu = np.concatenate([il_t, il_h])
+        emisyon = np.concatenate([emisyon_t, emisyon_h])
+        gecerli = il_kodu >= 0
+        taranan_il = np.bincount(il_kodu[gecerli], weights=emisyon[gecerli],
+                                 minlength=len(self.iller))
+        taranan_sektor = np.bincount(sektor_t, weights=emisyon_t, minlength=len(SEKTOR_LISTESI))
+        
+        karsilastirmalar = [
+            ("tesis_emisyon", t.tesis_emisyon, _sirali_toplam(emisyon_t)),
+            ("hane_emisyon", t.hane_emisyon, _sirali_toplam(emisyon_h)),
+            ("cbam_maliyeti", t.cbam_maliyeti, taranan_cbam),
+        ]
+        karsilastirmalar += [
+            (f"durum[{d}]", t.durum_sayisi(d), n) for d, n in taranan_durum.items()
+        ]
+        karsilastirmalar += [
+            (f"sektor[{sektor}]", artimli, taranan)
+            for sektor, artimli, taranan in zip(SEKTOR_LISTESI, t.sektor_emisyon, taranan_sektor)
+        ]
+        karsilastirmalar += [
+            (f"il[{il}]", artimli, taranan)
+            for il, artimli, taranan in zip(t.iller, t.il_emisyon, taranan_il)
+        ]
+        
+        farklar = [
+            f"  {ad}: artımlı={artimli!r}, tarama={taranan!r}"
+            for ad, artimli, taranan in karsilastirmalar
+            if not np.isclose(artimli, taranan, rtol=rtol, atol=atol)
+        ]
+        if farklar:
+            raise RuntimeError(
+                f"❌ {self.yil}: Artımlı toplamlar tam taramayla uyuşmuyor:\n" + "\n".join(farklar)
+            )
+        return True
     
     def step(self):
         """
-        Model adımı (bir yıl) - Zaman Çizelgesi Mantığı. 
+        Model adımı (bir tik; alt_adim_sayisi=1 ise bir yıl) - Zaman Çizelgesi Mantığı. 
         
         2025-2035 Türkiye ETS Yol Haritası:
         - 2025: Hazırlık dönemi
@@ -2585,28 +5250,67 @@ class TurkiyeETSModel(Model):
         - 2028: Tam uygulama ve Açık Artırma
         - 2030: AB CBAM tam uygulama
         - 2035: Hedef yılı
+        
+        Yıl başı tikinde zaman çizelgesi, dispatch ve veri toplama yapılır ve
+        tüm ajanlar çalışır; diğer tiklerde yalnızca vadesi gelen yıl içi
+        gruplar (CokOranliZamanlayici) etkinleştirilir. Ekonomik etki yıl
+        sonu tikinde hesaplanır.
         """
+        if self.yil_basi:
+            self._yil_basi_guncelle()
+            
+            # --- TÜM AJANLARI ÇALIŞTIR ---
+            # Not: PiyasaOperatoru ve MRV artık agents listesinde, otomatik çağrılacak
+            self._olaylari_isle()
+            self._ajanlari_calistir()
+        else:
+            self._alt_adim_calistir()
+        
+        if self.toplam_kontrolu:
+            self.toplamlari_dogrula()
+        
+        if self.alt_adim < self.zamanlayici.alt_adim_sayisi - 1:
+            self.alt_adim += 1
+            return
+        
+        # --- EKONOMİK ETKİ HESABI (YENİ - v4.5) ---
+        # Her yıl ekonomik etkileri güncelle
+        if hasattr(self, 'ekonomik_etki'):
+            self.ekonomik_etki.hesapla_yillik_etki()
         
+        # --- YILI İLERLET ---
+        self.alt_adim = 0
+        self.yil += 1
+    
+    @property
+    def yil_basi(self):
+        """Şu anki tik yılın ilk tiki mi (yıllık ajanlar yalnızca burada çalışır)."""
+        return self.alt_adim == 0
+    
+    def adim_suresi(self, ajan_tipi):
+        """Bir ajan tipinin tek adımının kapsadığı süre (yıl)."""
+        return self.zamanlayici.sure(ajan_tipi)
+    
+    def _yil_basi_guncelle(self):
+        """Yıl başı: ETS zaman çizelgesi, dispatch güncellemesi ve veri toplama."""
         # --- ZAMAN ÇİZELGESİ MANTIĞI ---
         
         # 2026: Pilot ETS Başlangıcı
         if self.yil == 2026:
             if not self.ets_aktif:
                 self.ets_aktif = True
-                print(f"📢 {self.yil}:  Pilot ETS Başlatıldı - Karbon Fiyatı: ${self.karbon_fiyati}/ton")
+                self._bilgi(f"📢 {self.yil}:  Pilot ETS Başlatıldı - Karbon Fiyatı: ${self.karbon_fiyati}/ton")
         
         # 2028: Tam Uygulama ve Açık Artırma
         elif self.yil == 2028:
             if not self.acik_artirma_aktif:
                 self.acik_artirma_aktif = True
-                print(f"📢 {self.yil}:  Tam Uygulama ve Açık Artırma (Auction) Devreye Girdi")
+                self._bilgi(f"📢 {self.yil}:  Tam Uygulama ve Açık Artırma (Auction) Devreye Girdi")
         
         # --- ENERJİ DİSPATCH GÜNCELLEME (V4.5) ---
         if self.dispatch_modulu:
             # Karbon fiyatını güncelle ve dispatch hesapla
-            self.dispatch_modulu.karbon_fiyati = self.karbon_fiyati
-            self.dispatch_modulu._hesapla_marjinal_maliyetler()
-            self.dispatch_modulu._sirala_merit_order()
+            self.dispatch_modulu.karbon_fiyati_guncelle(self.karbon_fiyati)
             
             # Yıllık emisyonu hesapla ve model emisyonuna yansıt (örnek entegrasyon)
             dispatch_sonuc = self.dispatch_modulu.hesapla_yillik_etki(self.dispatch_modulu.yillik_talep_twh * 1e6) \
@@ -2614,84 +5318,573 @@ class TurkiyeETSModel(Model):
             
         # --- VERİ TOPLAMA ---
         self.datacollector.collect(self)
+    
+    def _alt_adim_calistir(self):
+        """
+        Yıl içi tik: yalnızca vadesi gelen grupların ajanları (ve dizi
+        satırları) karıştırılmış sırayla çalışır; yıllık gruplara dokunulmaz.
+        """
+        tipler = self.zamanlayici.vadesi_gelen_tipler(self.alt_adim)
+        if not tipler:
+            return
+        if self.tesis_dizisi is None and self.hane_dizisi is None and self._ortak_sira is None:
+            ajanlar = self.kayit.tip(*tipler)
+            self.random.shuffle(ajanlar)
+            for ajan in ajanlar:
+                ajan.step()
+            return
         
-        # --- TÜM AJANLARI ÇALIŞTIR ---
-        # Not: PiyasaOperatoru ve MRV artık agents listesinde, otomatik çağrılacak
-        self.agents.shuffle_do("step")
+        kodlar = np.asarray(self._adim_sirasi, dtype=np.int64)
+        tur, satir = kodlar % 3, kodlar // 3
+        maske = (tur == SLOT_HANE) if "Hanehalki" in tipler else np.zeros(len(kodlar), dtype=bool)
+        ajan_konumlari = np.flatnonzero(tur == SLOT_AJAN)
+        maske[ajan_konumlari] = [
+            self._sira_ajanlari[i].ajan_tipi in tipler for i in satir[ajan_konumlari]
+        ]
+        self._ajanlari_calistir(kodlar[maske].tolist())
+    
+    def _ajanlari_calistir(self, kodlar=None):
+        """
+        shuffle_do("step") karşılığı (etkin ajanlar için): aynı karıştırma,
+        dizi satırları toplu.
+        
+        Tesis ve hane satırları biriktirilir; dizilerin okuduğu ya da yazdığı
+        model durumunu değiştiren/okuyan bir ajandan (toplu_adim_siniri) hemen
+        önce tek seferde çalıştırılır. Satırlar birbirini etkilemediğinden sonuç
+        sıralı çalıştırma ile aynıdır. kodlar verilirse yalnızca bu adım
+        kodları (yıl içi tikte vadesi gelenler) çalıştırılır. Uyuyan tesisler
+        karıştırmaya girmez; maliyet nüfusla değil etkinlikle ölçeklenir.
+        
+        _ortak_sira verilmişse (TopluSenaryoModeli) karıştırma yerine kodlar
+        bu ortak permütasyondaki sırayla çalışır.
+        """
+        sira = self._adim_sirasi if kodlar is None else kodlar
+        if self._ortak_sira is not None:
+            sira = self._ortak_siraya_diz(np.asarray(sira, dtype=np.int64))
+        else:
+            if self._uyuyan_sayisi:
+                sira = np.asarray(sira, dtype=np.int64)
+                sira = sira[~self._uyku_maskesi(sira)].tolist()
+            else:
+                sira = list(sira)
+            self.random.shuffle(sira)
+            sira = np.asarray(sira, dtype=np.int64)
+        tur, satir = sira % 3, sira // 3
+        
+        baslangic = 0
+        for konum in np.flatnonzero(tur == SLOT_AJAN):
+            ajan = self._sira_ajanlari[satir[konum]]
+            if getattr(ajan, "toplu_adim_siniri", False):
+                self._satirlari_calistir(tur[baslangic:konum], satir[baslangic:konum])
+                baslangic = konum
+            ajan.step()
+            if isinstance(ajan, EndustriyelTesis) and ajan.durum != "Aktif":
+                self._uyku_planla(int(sira[konum]), DURUM_KODLARI.index(ajan.durum),
+                                  ajan.kalan_yatirim_suresi, ajan.fiyat_abonesi)
+        self._satirlari_calistir(tur[baslangic:], satir[baslangic:])
+    
+    def _ortak_siraya_diz(self, kodlar):
+        """
+        Uyanık kodları, adım sırasındaki konumlarının ortak permütasyondaki
+        sırasıyla döndürür. Konum (kod değil) karıştırıldığından nesne ve
+        vektörel modlar aynı sırayı alır.
+        """
+        tum = np.asarray(self._adim_sirasi, dtype=np.int64)
+        if not tum.size:
+            return tum
+        ortak = self._ortak_sira
+        tum = tum[ortak[ortak < len(tum)]]
+        secili = np.zeros(int(tum.max()) + 1, dtype=bool)
+        secili[kodlar] = True
+        if self._uyuyan_sayisi:
+            n = min(len(self._uyuyan), len(secili))
+            secili[:n] &= ~self._uyuyan[:n]
+        return tum[secili[tum]]
+    
+    # --- OLAY TABANLI ETKİNLEŞTİRME ---
+    
+    def _uyku_maskesi(self, kodlar):
+        """Adım kodları için uyku maskesi (maske gerekirse büyütülür)."""
+        if kodlar.size and kodlar.max() >= len(self._uyuyan):
+            yeni = np.zeros(int(kodlar.max()) + 1, dtype=bool)
+            yeni[:len(self._uyuyan)] = self._uyuyan
+            self._uyuyan = yeni
+        return self._uyuyan[kodlar]
+    
+    def _uyku_planla(self, kod, durum, kalan_sure, fiyat_abonesi):
+        """
+        Adımını bitiren, Aktif olmayan tesisi uyutur.
         
-        # --- EKONOMİK ETKİ HESABI (YENİ - v4.5) ---
-        # Her yıl ekonomik etkileri güncelle
-        if hasattr(self, 'ekonomik_etki'):
-            self.ekonomik_etki.hesapla_yillik_etki()
+        Kapali: kalıcı. Donusum: tamamlanma yılında (yil + kalan_sure)
+        kuyruktan uyanır. Temiz: hiç uyanmaz. Bu durumlar Aktif'e
+        dönmediğinden Aktif tesisler hep uyanıktır.
         
-        # --- YILI İLERLET ---
-        self.yil += 1
+        Kapali olmayan fiyat aboneleri uyutulmaz: CBAM'ları adım sırasındaki
+        konumlarında geçerli fiyatla (piyasa operatöründen önce veya sonra)
+        hesaplanır; uyurken yeniden hesaplamak bu sırayı koruyamaz.
+        """
+        if not self.olay_tabanli or (fiyat_abonesi and durum != KAPALI):
+            return
+        self._uyku_maskesi(np.array([kod]))
+        if not self._uyuyan[kod]:
+            self._uyuyan[kod] = True
+            self._uyuyan_sayisi += 1
+        if durum == KAPALI:
+            return
+        if durum == DONUSUM and kalan_sure > 0:
+            heapq.heappush(self._uyanis_olaylari, (self.yil + int(kalan_sure), [kod]))
+    
+    def _uyku_planla_toplu(self, kodlar, durum, kalan_sure, fiyat_abonesi):
+        """
+        _uyku_planla'nın dizi karşılığı (vektörel satırlar). Kodlar verilen
+        sırayla işlenir; aynı yılda uyanacaklar kuyruğa tek olay olarak girer.
+        """
+        if not self.olay_tabanli:
+            return
+        uyuyacak = ~fiyat_abonesi | (durum == KAPALI)
+        kodlar, durum, kalan_sure = kodlar[uyuyacak], durum[uyuyacak], kalan_sure[uyuyacak]
+        yeni = ~self._uyku_maskesi(kodlar)
+        self._uyuyan[kodlar] = True
+        self._uyuyan_sayisi += int(np.count_nonzero(yeni))
+        donusum = (durum == DONUSUM) & (kalan_sure > 0)
+        if donusum.any():
+            uyanislar = self.yil + kalan_sure[donusum].astype(np.int64)
+            donusen = kodlar[donusum]
+            for yil in np.unique(uyanislar).tolist():
+                heapq.heappush(self._uyanis_olaylari, (yil, donusen[uyanislar == yil].tolist()))
+    
+    def _uyandir(self, kodlar):
+        kodlar = np.unique(np.asarray(kodlar, dtype=np.int64))
+        kodlar = kodlar[self._uyuyan[kodlar]]
+        self._uyuyan[kodlar] = False
+        self._uyuyan_sayisi -= len(kodlar)
+    
+    def _olaylari_isle(self):
+        """Yıl başı: tamamlanma yılı gelen tesisleri kuyruktan uyandırır."""
+        olaylar = self._uyanis_olaylari
+        uyanan = []
+        while olaylar and olaylar[0][0] <= self.yil:
+            uyanan.extend(heapq.heappop(olaylar)[1])
+        self._uyandir(uyanan)
+    
+    def _satirlari_calistir(self, tur, satir):
+        """Bekleyen tesis ve hane satırlarını güncel model durumuyla çalıştırır."""
+        if self.tesis_dizisi is not None:
+            td = self.tesis_dizisi
+            calisan = satir[tur == SLOT_TESIS]
+            td.adim(calisan, self.karbon_fiyati, self.ab_skdm_fiyat, self.tesvik_miktari, self.yil)
+            uyuyacak = calisan[td.durum[calisan] != AKTIF]
+            if uyuyacak.size:
+                self._uyku_planla_toplu(uyuyacak * 3 + SLOT_TESIS, td.durum[uyuyacak],
+                                        td.kalan_yatirim_suresi[uyuyacak], td.abone_mi(uyuyacak))
+        if self.hane_dizisi is not None:
+            self.hane_dizisi.adim(
+                satir[tur == SLOT_HANE], self.karbon_fiyati, self.EMISYON_FAKTORU_TR
+            )
     
     def run_simulation(self, years=11):
-        """Simülasyonu çalıştırır."""
-        for _ in range(years):
+        """Simülasyonu çalıştırır (years yıl × alt_adim_sayisi tik)."""
+        self.datacollector.rezerve(years)
+        for _ in range(years * self.zamanlayici.alt_adim_sayisi):
             self.step()
         return self.datacollector.get_model_vars_dataframe()
+    
+    # --- ANLIK GÖRÜNTÜ / FORK ---
+    
+    # fork() ile değiştirilebilen parametreler (model kurulduktan sonra
+    # anlamı olanlar; ajan sayıları ve baslangic_cap gibi kurulum
+    # parametreleri değiştirilemez)
+    FORK_PARAMETRELERI = (
+        "cap_azalma_orani", "ab_skdm_fiyat", "tesvik_miktari", "vergi_artis_orani",
+        "senaryo_tipi", "iskonto_orani", "ekonomik_omur", "random_seed", "verbose",
+    )
+    
+    def __setstate__(self, durum):
+        self.__dict__.update(durum)
+        self.datacollector.raporlayicilari_bagla(self._model_raporlayicilari())
+    
+    def snapshot(self, yol=None):
+        """
+        Modelin şu anki tam durumunu ModelAnlikGoruntusu olarak döndürür.
+        
+        yol verilirse görüntü ayrıca diske yazılır. Model değişmez.
+        """
+        tampon = io.BytesIO()
+        _GirdiPickler(tampon, self.girdiler).dump(self)
+        goruntu = ModelAnlikGoruntusu(tampon.getvalue(), self.yil)
+        if yol is not None:
+            goruntu.kaydet(yol)
+        return goruntu
+    
+    def fork(self, **parametreler):
+        """
+        Bu modelin şu anki durumundan başlayan bağımsız bir kopya döndürür.
+        
+        parametreler FORK_PARAMETRELERI'nden olmalıdır (ör.
+        cap_azalma_orani=0.05, random_seed=7). Bkz. ModelAnlikGoruntusu.fork.
+        """
+        return self.snapshot().fork(girdiler=self.girdiler, **parametreler)
+    
+    def _parametreleri_uygula(self, parametreler):
+        """fork parametrelerini geri yüklenen modele uygular."""
+        bilinmeyen = set(parametreler) - set(self.FORK_PARAMETRELERI)
+        if bilinmeyen:
+            raise ValueError(
+                f"❌ fork ile değiştirilemeyen parametre: {sorted(bilinmeyen)}. "
+                f"Geçerli seçenekler: {list(self.FORK_PARAMETRELERI)}"
+            )
+        if parametreler.get("ekonomik_omur", 1) < 1:
+            raise ValueError(
+                f"❌ Geçersiz ekonomik_omur: {parametreler['ekonomik_omur']}. En az 1 yıl olmalı."
+            )
+        
+        for ad in ("ab_skdm_fiyat", "tesvik_miktari", "vergi_artis_orani", "verbose"):
+            if ad in parametreler:
+                setattr(self, ad, parametreler[ad])
+        if "cap_azalma_orani" in parametreler:
+            self.piyasa_operatoru.azalma_orani = parametreler["cap_azalma_orani"]
+        if "senaryo_tipi" in parametreler:
+            self.senaryo_tipi = parametreler["senaryo_tipi"]
+            self.rev_recycling = REVENUE_SCENARIOS.get(
+                self.senaryo_tipi, REVENUE_SCENARIOS["BAU"]
+            )
+        for ad in ("iskonto_orani", "ekonomik_omur"):
+            if ad in parametreler:
+                setattr(self, ad, parametreler[ad])
+                if self.tesis_dizisi is not None:
+                    setattr(self.tesis_dizisi, ad, parametreler[ad])
+        if "random_seed" in parametreler:
+            # Mesa üreteçleri yerinde yeniden tohumlanır (ajan kümeleri aynı
+            # nesneye başvurur); ajan grubu akışları yeni seed'den türetilir.
+            seed = parametreler["random_seed"]
+            self._seed = seed
+            self.random.seed(seed)
+            self.rng.bit_generator.state = np.random.default_rng(seed).bit_generator.state
+            self._akislari_olustur(seed)
+
+
+class _GirdiPickler(pickle.Pickler):
+    """Paylaşılan SimulationInputs nesnelerini görüntüye yazmadan, ada göre işaretler."""
+    
+    ALANLAR = ("baseline", "tesisler", "il_katsayilari", "dispatch", "io_model")
+    
+    def __init__(self, dosya, girdiler):
+        super().__init__(dosya, protocol=pickle.HIGHEST_PROTOCOL)
+        self._paylasilan = {id(girdiler): "girdiler"}
+        for ad in self.ALANLAR:
+            nesne = getattr(girdiler, ad)
+            if nesne is not None:
+                self._paylasilan[id(nesne)] = ad
+    
+    def persistent_id(self, nesne):
+        return self._paylasilan.get(id(nesne))
+
+
+class _GirdiUnpickler(pickle.Unpickler):
+    """_GirdiPickler ile işaretlenen nesneleri verilen girdilere bağlar."""
+    
+    def __init__(self, dosya, girdiler):
+        super().__init__(dosya)
+        self._girdiler = girdiler
+    
+    def persistent_load(self, ad):
+        if ad == "girdiler":
+            return self._girdiler
+        return getattr(self._girdiler, ad)
+
+
+class ModelAnlikGoruntusu:
+    """
+    TurkiyeETSModel'in bir yıl sınırındaki tam durumu.
+    
+    Ajanlar, dizi motorları, piyasa/MRV durumu, veri toplayıcı ve hem Mesa
+    hem ajan grubu Generator akışlarının durumu tek bir pickle bayt
+    dizisinde tutulur. Paylaşılan SimulationInputs (baseline, tablolar,
+    dispatch şablonu, I-O modeli) görüntüye yazılmaz; fork sırasında verilen
+    girdilere yeniden bağlanır.
+    
+    Parametre değiştirmeden yapılan her fork, kesintisiz koşuyla aynı
+    sonucu verir. Senaryoların ancak belli bir yıldan sonra ayrıştığı
+    what-if taramalarında ortak ısınma yılları bir kez çalıştırılır.
+    
+    Örnek:
+    >>> model = TurkiyeETSModel(random_seed=42, verbose=False)
+    >>> for _ in range(3):
+    ...     model.step()                      # 2025-2027 ortak yıllar
+    >>> goruntu = model.snapshot()
+    >>> sonuclar = {
+    ...     oran: goruntu.fork(cap_azalma_orani=oran).run_simulation(years=8)
+    ...     for oran in (0.03, 0.05, 0.08)
+    ... }
+    """
+    
+    def __init__(self, veri, yil):
+        self.veri = veri
+        self.yil = yil
+    
+    @property
+    def boyut(self):
+        """Görüntünün bayt cinsinden boyutu."""
+        return len(self.veri)
+    
+    def fork(self, girdiler=None, **parametreler):
+        """
+        Görüntüden yeni bir model oluşturur ve parametreleri uygular.
+        
+        girdiler: bağlanacak SimulationInputs (None = süreç varsayılanı).
+        parametreler: TurkiyeETSModel.FORK_PARAMETRELERI'nden değişiklikler.
+        """
+        if girdiler is None:
+            girdiler = SimulationInputs.varsayilan()
+        model = _GirdiUnpickler(io.BytesIO(self.veri), girdiler).load()
+        model._parametreleri_uygula(parametreler)
+        return model
+    
+    def kaydet(self, yol):
+        """Görüntüyü diske yazar (geçici dosya + os.replace ile atomik)."""
+        gecici = yol + ".tmp"
+        with open(gecici, 'wb') as f:
+            pickle.dump({'yil': self.yil, 'veri': self.veri}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(gecici, yol)
+    
+    @classmethod
+    def yukle(cls, yol):
+        """kaydet ile yazılmış görüntüyü okur (pickle: yalnızca güvenilen dosyalar)."""
+        with open(yol, 'rb') as f:
+            icerik = pickle.load(f)
+        return cls(icerik['veri'], icerik['yil'])
 
 
 # =============================================================================
-# SENARYO KARŞILAŞTIRMASI
+# BELLEK RAPORU
 # =============================================================================
 
-def senaryo_karsilastirmasi():
-    """Farklı politika senaryolarını karşılaştırır."""
-    print("=" * 70)
-    print("TR-ZERO:  AJAN TABANLI KARBON PİYASASI SİMÜLASYONU")
-    print("v2.1 - Düzeltilmiş Versiyon")
-    print("=" * 70)
-    print(f"Tarih: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print("-" * 70)
-    
-    # Senaryolar (DÜZELTİLMİŞ CAP DEĞERLERİ)
-    senaryolar = {
-        "BAU": {
-            "baslangic_cap": 9999,
-            "cap_azalma_orani": 0,
-            "tesvik_miktari": 0,
-            "ab_skdm_fiyat": 0,
-            "renk": "#94a3b8"
-        },
-        "Yumusak_ETS": {
-            "baslangic_cap": 75,
-            "cap_azalma_orani": 0.02,
-            "tesvik_miktari": 30000,
-            "ab_skdm_fiyat": 60,
-            "renk": "#3b82f6"
-        },
-        "Siki_ETS": {
-            "baslangic_cap":  60,
-            "cap_azalma_orani": 0.04,
-            "tesvik_miktari": 50000,
-            "ab_skdm_fiyat": 90,
-            "renk":  "#22c55e"
-        },
-        "ETS_Tesvik": {
-            "baslangic_cap": 60,
-            "cap_azalma_orani": 0.04,
-            "tesvik_miktari": 150000,
-            "ab_skdm_fiyat": 90,
-            "renk": "#8b5cf6"
-        }
-    }
+def ajan_bellek_raporu(model):
+    """
+    Ajan tipi başına ortalama nesne boyutunu raporlar (bayt/ajan).
     
-    sonuclar = {}
+    Nesne_Bayt: örnek + (varsa) __dict__ kabı - __slots__ ile küçülen kısım.
+    Dizi motorlarında (TesisDizisi, HaneDizisi) satır başına dizi baytı verilir.
+    Adım sırası ve Mesa kayıt defteri gibi ajan başına ortak maliyetler dahil
+    değildir.
+    
+    Returns:
+    --------
+    pd.DataFrame : Tip, Depolama ('__slots__', '__dict__', 'dizi'), Sayi, Nesne_Bayt
+    """
+    import sys
+    
+    satirlar = {}
+    for ajan in model.agents:
+        sinif = type(ajan)
+        boyut = sys.getsizeof(ajan)
+        if hasattr(ajan, '__dict__'):
+            boyut += sys.getsizeof(ajan.__dict__)
+        sayi, toplam = satirlar.get(sinif, (0, 0))
+        satirlar[sinif] = (sayi + 1, toplam + boyut)
+    
+    rapor = [
+        {'Tip': sinif.__name__,
+         'Depolama': '__slots__' if '__slots__' in vars(sinif) else '__dict__',
+         'Sayi': sayi, 'Nesne_Bayt': toplam / sayi}
+        for sinif, (sayi, toplam) in satirlar.items()
+    ]
+    
+    for ad, dizi in (("TesisDizisi", model.tesis_dizisi), ("HaneDizisi", model.hane_dizisi)):
+        if dizi is None or dizi.n == 0:
+            continue
+        bayt = sum(v.nbytes for v in vars(dizi).values()
+                   if isinstance(v, np.ndarray) and len(v) == dizi.n)
+        rapor.append({'Tip': ad, 'Depolama': 'dizi', 'Sayi': dizi.n, 'Nesne_Bayt': bayt / dizi.n})
+    
+    return pd.DataFrame(rapor)
+
+
+# =============================================================================
+# TOPLU SENARYO MOTORU
+# =============================================================================
+
+class TopluSenaryoModeli:
+    """
+    Birden çok politika senaryosunu tek döngüde, ortak rastgele sayılarla
+    (common random numbers) ilerleten toplu motor.
+    
+    Senaryolar yalnızca birkaç skaler parametrede ayrışır (SENARYO_EKSENI).
+    Her senaryo aynı seed ve aynı ortak parametrelerle kurulur; tesis ve
+    hane nüfusu ile ajan grubu akışları başlangıçta tüm senaryolarda
+    aynıdır. Her tikte adım sırasının tek bir permütasyonu çekilir ve
+    tüm senaryolar ajanlarını bu ortak sırayla çalıştırır (her senaryo
+    kendi uyuyan tesislerini atlar). Böylece senaryo farkları örnekleme
+    gürültüsünden değil politikadan gelir [cite: Law 2015, Simulation
+    Modeling and Analysis, Bölüm 11.2].
+    
+    Nüfusla ölçeklenen karıştırma (büyük vektörel koşularda adım süresinin
+    yaklaşık yarısı) senaryo başına değil tik başına bir kez yapılır.
+    Sonuçlar tek başına koşularla aynı dağılımdandır, ancak karıştırma
+    akışı farklı olduğundan bit düzeyinde aynı değildir.
+    
+    Örnek:
+    >>> toplu = TopluSenaryoModeli(random_seed=42, vektorel_tesisler=True, verbose=False)
+    >>> sonuclar = toplu.run_simulation(years=11)   # {senaryo: DataFrame}
+    """
+    
+    # Senaryodan senaryoya değişebilen model parametreleri
+    SENARYO_EKSENI = ("baslangic_cap", "cap_azalma_orani", "tesvik_miktari",
+                      "ab_skdm_fiyat", "vergi_artis_orani", "senaryo_tipi")
     
-    for senaryo_adi, params in senaryolar.items():
-        print(f"\n🔄 {senaryo_adi} senaryosu çalıştırılıyor...")
+    def __init__(self, senaryolar=None, random_seed=None, **ortak_parametreler):
+        """
+        senaryolar: {senaryo_adi: {parametre: değer}} (None = SENARYO_KONFIG,
+        senaryo_tipi senaryo adıdır). SENARYO_EKSENI dışındaki anahtarlar
+        (aciklama, renk, ...) kullanılmaz.
         
-        model = TurkiyeETSModel(
-            baslangic_cap=params["baslangic_cap"],
-            cap_azalma_orani=params["cap_azalma_orani"],
-            tesvik_miktari=params["tesvik_miktari"],
-            ab_skdm_fiyat=params["ab_skdm_fiyat"]
-        )
+        ortak_parametreler: tüm senaryolara aynen geçen TurkiyeETSModel
+        parametreleri (ajan sayıları, vektorel_tesisler, alt_adim_sayisi, ...).
+        """
+        cakisan = set(ortak_parametreler) & set(self.SENARYO_EKSENI)
+        if cakisan:
+            raise ValueError(
+                f"❌ Senaryo ekseni parametresi ortak verilemez: {sorted(cakisan)}. "
+                f"Senaryo sözlüklerinde verin."
+            )
+        if senaryolar is None:
+            senaryolar = {ad: {**p, "senaryo_tipi": ad} for ad, p in SENARYO_KONFIG.items()}
+        if random_seed is None:
+            random_seed = int(datetime.now().timestamp() * 1000) % 100000
+        self.random_seed = random_seed
         
-        df = model.run_simulation(years=11)
+        self.modeller = {
+            ad: TurkiyeETSModel(
+                random_seed=random_seed, **ortak_parametreler,
+                **{k: v for k, v in parametreler.items() if k in self.SENARYO_EKSENI}
+            )
+            for ad, parametreler in senaryolar.items()
+        }
+        # Ortak karıştırma akışı, modellerin ajan grubu akışlarından bağımsız
+        self._sira_akisi = np.random.default_rng(np.random.SeedSequence(
+            random_seed, spawn_key=(len(TurkiyeETSModel.AKIS_GRUPLARI),)
+        ))
+    
+    def step(self):
+        """Tüm senaryoları ortak karıştırmayla bir tik ilerletir."""
+        ilk = next(iter(self.modeller.values()))
+        ortak = None
+        if ilk.yil_basi or ilk.zamanlayici.vadesi_gelen_tipler(ilk.alt_adim):
+            n_konum = max(len(model._adim_sirasi) for model in self.modeller.values())
+            ortak = self._sira_akisi.permutation(n_konum)
+        for model in self.modeller.values():
+            model._ortak_sira = ortak
+            try:
+                model.step()
+            finally:
+                model._ortak_sira = None
+    
+    def run_simulation(self, years=11):
+        """Tüm senaryoları years yıl çalıştırır; {senaryo: DataFrame} döndürür."""
+        ilk = next(iter(self.modeller.values()))
+        for model in self.modeller.values():
+            model.datacollector.rezerve(years)
+        for _ in range(years * ilk.zamanlayici.alt_adim_sayisi):
+            self.step()
+        return {
+            ad: model.datacollector.get_model_vars_dataframe()
+            for ad, model in self.modeller.items()
+        }
+
+
+# =============================================================================
+# SENARYO KARŞILAŞTIRMASI
+# =============================================================================
+
+def _senaryo_kosusu(senaryo_adi, params, random_seed):
+    """Tek bir karşılaştırma senaryosunu çalıştırır (süreç havuzu işçisi)."""
+    logger.info(f"\n🔄 {senaryo_adi} senaryosu çalıştırılıyor...")
+    
+    model = TurkiyeETSModel(
+        baslangic_cap=params["baslangic_cap"],
+        cap_azalma_orani=params["cap_azalma_orani"],
+        tesvik_miktari=params["tesvik_miktari"],
+        ab_skdm_fiyat=params["ab_skdm_fiyat"],
+        senaryo_tipi=params["senaryo_tipi"],
+        random_seed=random_seed
+    )
+    
+    return senaryo_adi, model.run_simulation(years=11)
+
+
+def _senaryolari_calistir(senaryolar, random_seed, workers=1):
+    """
+    Senaryoları sırayla veya süreç havuzunda (senaryo başına bir görev)
+    çalıştırır ve tamamlandıkça (senaryo_adi, df) çiftlerini üretir.
+    
+    Her senaryo yalnızca kendi parametreleri ve seed'iyle kurulduğundan
+    sonuçlar işçi sayısından bağımsızdır; yalnızca tamamlanma sırası değişir.
+    """
+    if workers <= 1:
+        for senaryo_adi, params in senaryolar.items():
+            yield _senaryo_kosusu(senaryo_adi, params, random_seed)
+        return
+    
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    # Mesa içe aktarılırken başlatma yöntemini "spawn" yapar; spawn ile her
+    # işçi modülü yeniden yükler (~2 s), bu da senaryo koşusundan uzundur.
+    # Destekleyen platformlarda fork kullanılır: işçiler yüklü modülü ve
+    # önceden hazırlanan ortak girdileri devralır.
+    baglam = (multiprocessing.get_context("fork")
+              if "fork" in multiprocessing.get_all_start_methods() else None)
+    SimulationInputs.varsayilan()
+    with ProcessPoolExecutor(max_workers=min(workers, len(senaryolar)), mp_context=baglam) as havuz:
+        gelecekler = [
+            havuz.submit(_senaryo_kosusu, senaryo_adi, params, random_seed)
+            for senaryo_adi, params in senaryolar.items()
+        ]
+        for gelecek in as_completed(gelecekler):
+            yield gelecek.result()
+
+
+def senaryo_karsilastirmasi(toplu=False, workers=1, random_seed=None, kaydet=False):
+    """
+    Farklı politika senaryolarını karşılaştırır.
+    
+    toplu=True senaryoları TopluSenaryoModeli ile tek döngüde, ortak
+    rastgele sayılarla çalıştırır.
+    
+    workers > 1 her senaryoyu ayrı bir süreçte çalıştırır; aynı
+    random_seed ile sonuçlar sıralı koşuyla bit düzeyinde aynıdır.
+    random_seed verilmezse zaman damgasından bir kez seçilir ve tüm
+    senaryolarda kullanılır.
+    
+    kaydet=True her senaryonun CSV'sini (bkz. csv_kaydet) koşusu biter
+    bitmez yazar; disk yazımı kalan senaryoların hesabıyla örtüşür.
+    """
+    if toplu and workers > 1:
+        raise ValueError("❌ toplu=True ile workers > 1 birlikte kullanılamaz (toplu motor tek süreçtir)")
+    if random_seed is None:
+        random_seed = int(datetime.now().timestamp() * 1000) % 100000
+    
+    logger.info("=" * 70)
+    logger.info("TR-ZERO:  AJAN TABANLI KARBON PİYASASI SİMÜLASYONU")
+    logger.info("v2.1 - Düzeltilmiş Versiyon")
+    logger.info("=" * 70)
+    logger.info(f"Tarih: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    logger.info(f"Seed: {random_seed}")
+    logger.info("-" * 70)
+    
+    # Senaryolar SENARYO_KONFIG'den; gelir geri dönüşümü senaryo adına göre
+    senaryolar = {ad: {**p, "senaryo_tipi": ad} for ad, p in SENARYO_KONFIG.items()}
+    
+    sonuclar = {}
+    
+    if toplu:
+        logger.info(f"\n🔄 {len(senaryolar)} senaryo toplu motorla çalıştırılıyor (ortak rastgele sayılar)...")
+        kosular = TopluSenaryoModeli(senaryolar, random_seed=random_seed).run_simulation(years=11).items()
+    else:
+        kosular = _senaryolari_calistir(senaryolar, random_seed, workers)
+    
+    for senaryo_adi, df in kosular:
         df["Senaryo"] = senaryo_adi
         sonuclar[senaryo_adi] = df
         
@@ -2700,12 +5893,16 @@ def senaryo_karsilastirmasi():
         son_fiyat = df['Karbon_Fiyati'].iloc[-1]
         temiz_tesis = df['Temiz_Tesis'].iloc[-1]
         
-        print(f"   ✅ Tamamlandı:")
-        print(f"      • 2035 Emisyon: {son_emisyon:.2f} Mt")
-        print(f"      • Karbon Fiyatı:  ${son_fiyat:.0f}/ton")
-        print(f"      • Temiz Tesis:  {temiz_tesis:.0f}")
+        logger.info(f"   ✅ Tamamlandı:")
+        logger.info(f"      • 2035 Emisyon: {son_emisyon:.2f} Mt")
+        logger.info(f"      • Karbon Fiyatı:  ${son_fiyat:.0f}/ton")
+        logger.info(f"      • Temiz Tesis:  {temiz_tesis:.0f}")
+        
+        if kaydet:
+            _senaryo_csv_kaydet(senaryo_adi, df)
     
-    # Özet tablo
+    # Özet tablo (senaryo sırasıyla; paralel koşular tamamlanma sırasıyla gelir)
+    sonuclar = {senaryo_adi: sonuclar[senaryo_adi] for senaryo_adi in senaryolar}
     _ozet_tablo_yazdir(sonuclar)
     
     return sonuclar
@@ -2713,11 +5910,11 @@ def senaryo_karsilastirmasi():
 
 def _ozet_tablo_yazdir(sonuclar):
     """Özet tablo yazdırır."""
-    print("\n" + "=" * 80)
-    print("SENARYO KARŞILAŞTIRMA TABLOSU (2035)")
-    print("=" * 80)
-    print(f"{'Senaryo':<18} {'Emisyon (Mt)':<14} {'Azaltım (%)':<14} {'Fiyat ($/t)':<14} {'Temiz Tesis':<14}")
-    print("-" * 80)
+    logger.info("\n" + "=" * 80)
+    logger.info("SENARYO KARŞILAŞTIRMA TABLOSU (2035)")
+    logger.info("=" * 80)
+    logger.info(f"{'Senaryo':<18} {'Emisyon (Mt)':<14} {'Azaltım (%)':<14} {'Fiyat ($/t)':<14} {'Temiz Tesis':<14}")
+    logger.info("-" * 80)
     
     bau_emisyon = sonuclar["BAU"]["Toplam_Emisyon"].iloc[-1]
     
@@ -2727,9 +5924,9 @@ def _ozet_tablo_yazdir(sonuclar):
         fiyat = df["Karbon_Fiyati"].iloc[-1]
         temiz = df["Temiz_Tesis"].iloc[-1]
         
-        print(f"{senaryo_adi:<18} {emisyon: <14.2f} {azaltim: <14.1f} {fiyat:<14.0f} {int(temiz):<14}")
+        logger.info(f"{senaryo_adi:<18} {emisyon: <14.2f} {azaltim: <14.1f} {fiyat:<14.0f} {int(temiz):<14}")
     
-    print("=" * 80)
+    logger.info("=" * 80)
 
 
 # =============================================================================
@@ -2738,6 +5935,12 @@ def _ozet_tablo_yazdir(sonuclar):
 
 def csv_kaydet(sonuclar):
     """Dashboard'un beklediği formatta CSV'leri kaydeder."""
+    for senaryo_adi, df in sonuclar.items():
+        _senaryo_csv_kaydet(senaryo_adi, df)
+
+
+def _senaryo_csv_kaydet(senaryo_adi, df):
+    """Tek bir senaryonun sonuçlarını output/senaryo_<ad>.csv'ye yazar."""
     isim_eslesme = {
         "BAU": "bau",
         "Yumusak_ETS": "yumusak_ets",
@@ -2745,11 +5948,10 @@ def csv_kaydet(sonuclar):
         "ETS_Tesvik": "ets_tesvik"
     }
     
-    for senaryo_adi, df in sonuclar.items():
-        dosya_adi = isim_eslesme.get(senaryo_adi, senaryo_adi. lower())
-        csv_path = os.path.join(OUTPUT_DIR, f"senaryo_{dosya_adi}.csv")
-        df.to_csv(csv_path, index=False)
-        print(f"   📄 {csv_path}")
+    dosya_adi = isim_eslesme.get(senaryo_adi, senaryo_adi. lower())
+    csv_path = os.path.join(OUTPUT_DIR, f"senaryo_{dosya_adi}.csv")
+    df.to_csv(csv_path, index=False)
+    logger.info(f"   📄 {csv_path}")
 
 
 # =============================================================================
@@ -2819,14 +6021,14 @@ def main_senaryo_calistir(senaryo_tipi, n_yil=11):
     pd.DataFrame : Simülasyon sonuçları
     """
     if senaryo_tipi not in SENARYO_KONFIG:
-        print(f"❌ Geçersiz senaryo: {senaryo_tipi}")
-        print(f"   Geçerli seçenekler: {list(SENARYO_KONFIG.keys())}")
+        logger.error(f"❌ Geçersiz senaryo: {senaryo_tipi}")
+        logger.error(f"   Geçerli seçenekler: {list(SENARYO_KONFIG.keys())}")
         return None
     
     params = SENARYO_KONFIG[senaryo_tipi]
     
-    print(f"\n🔄 {senaryo_tipi} senaryosu çalıştırılıyor...")
-    print(f"   Açıklama: {params['aciklama']}")
+    logger.info(f"\n🔄 {senaryo_tipi} senaryosu çalıştırılıyor...")
+    logger.info(f"   Açıklama: {params['aciklama']}")
     
     model = TurkiyeETSModel(
         baslangic_cap=params["baslangic_cap"],
@@ -2855,9 +6057,9 @@ def main_senaryo_calistir(senaryo_tipi, n_yil=11):
     csv_path = os.path.join(OUTPUT_DIR, f"senaryo_{dosya_adi}.csv")
     df.to_csv(csv_path, index=False)
     
-    print(f"   ✅ Tamamlandı: {csv_path}")
-    print(f"      • 2035 Emisyon: {df['Toplam_Emisyon'].iloc[-1]:.2f} Mt")
-    print(f"      • Karbon Fiyatı: ${df['Karbon_Fiyati'].iloc[-1]:.0f}/ton")
+    logger.info(f"   ✅ Tamamlandı: {csv_path}")
+    logger.info(f"      • 2035 Emisyon: {df['Toplam_Emisyon'].iloc[-1]:.2f} Mt")
+    logger.info(f"      • Karbon Fiyatı: ${df['Karbon_Fiyati'].iloc[-1]:.0f}/ton")
     
     return df
 
@@ -2871,13 +6073,35 @@ def monte_carlo_sonuclari_kaydet(df_results, percentiles, stats):
     # CSV kaydet
     csv_path = os.path.join(OUTPUT_DIR, "monte_carlo_results.csv")
     df_results.to_csv(csv_path, index=False)
-    print(f"📄 Monte Carlo sonuçları: {csv_path}")
+    logger.info(f"📄 Monte Carlo sonuçları: {csv_path}")
+    
+    # Başarısız koşular (parametre vektörleriyle)
+    df_hatalar = df_results.attrs.get('hatalar')
+    if df_hatalar is not None and len(df_hatalar) > 0:
+        hata_path = os.path.join(OUTPUT_DIR, "monte_carlo_hatalar.csv")
+        df_hatalar.to_csv(hata_path, index=False)
+        logger.warning(f"⚠️ Başarısız koşular: {hata_path}")
+    
+    # Yörünge yüzdelikleri (fan grafiği için, yörünge kaydı açıksa)
+    depo_dizini = df_results.attrs.get('depo_dizini')
+    if depo_dizini and os.path.exists(os.path.join(depo_dizini, "yorungeler.npy")):
+        _, meta = mc_yorungeleri_ac(depo_dizini)
+        fan = pd.concat({
+            degisken: mc_yorunge_yuzdelikleri(depo_dizini, degisken)
+            for degisken in meta['yorunge_degiskenleri']
+        }, names=['degisken', 'q'])
+        fan_path = os.path.join(OUTPUT_DIR, "monte_carlo_yorunge_yuzdelikleri.csv")
+        fan.to_csv(fan_path)
+        logger.info(f"📄 Monte Carlo yörünge yüzdelikleri: {fan_path}")
     
     # İstatistikleri JSON olarak kaydet
     json_path = os.path.join(OUTPUT_DIR, "monte_carlo_stats.json")
+    # Uyarlamalı modda durma nedeni ve parti bazlı hassasiyet geçmişi de yazılır
+    uyarlamali = df_results.attrs.get('uyarlamali')
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump({
             'n_runs': len(df_results),
+            **({'uyarlamali': uyarlamali} if uyarlamali else {}),
             'final_emission': {
                 'mean': float(stats['final_emission']['mean']),
                 'std': float(stats['final_emission']['std']),
@@ -2892,7 +6116,7 @@ def monte_carlo_sonuclari_kaydet(df_results, percentiles, stats):
                 'std': float(stats['final_price']['std'])
             }
         }, f, indent=2, ensure_ascii=False)
-    print(f"📄 Monte Carlo istatistikleri: {json_path}")
+    logger.info(f"📄 Monte Carlo istatistikleri: {json_path}")
     
     # Görselleştirme (matplotlib varsa)
     try:
@@ -2930,11 +6154,11 @@ def monte_carlo_sonuclari_kaydet(df_results, percentiles, stats):
         
         fig_path = os.path.join(OUTPUT_DIR, "monte_carlo_histogram.png")
         plt.savefig(fig_path, dpi=300, bbox_inches='tight')
-        print(f"📊 Monte Carlo grafiği: {fig_path}")
+        logger.info(f"📊 Monte Carlo grafiği: {fig_path}")
         plt.close()
         
     except ImportError:
-        print("⚠️ matplotlib yüklü değil, grafik oluşturulamadı.")
+        logger.warning("⚠️ matplotlib yüklü değil, grafik oluşturulamadı.")
 
 
 # =============================================================================
@@ -2953,6 +6177,12 @@ if __name__ == "__main__":
   # Tüm senaryoları çalıştır (varsayılan)
   python ajan_tabanli_simulasyon.py
   
+  # Tüm senaryoları paralel çalıştır (senaryo başına bir süreç, sabit seed)
+  python ajan_tabanli_simulasyon.py --workers 4 --seed 7
+  
+  # Tüm senaryoları tek döngüde, ortak rastgele sayılarla çalıştır
+  python ajan_tabanli_simulasyon.py --toplu
+  
   # Tek senaryo çalıştır
   python ajan_tabanli_simulasyon.py --mode single --senaryo Siki_ETS
   
@@ -2961,6 +6191,19 @@ if __name__ == "__main__":
   
   # Monte Carlo analizi (500 iterasyon, farklı seed)
   python ajan_tabanli_simulasyon.py --mode monte_carlo --n_runs 500 --seed 123
+  
+  # Monte Carlo analizi (10000 iterasyon, 8 paralel süreç)
+  python ajan_tabanli_simulasyon.py --mode monte_carlo --n_runs 10000 --workers 8
+  
+  # Yarıda kalan Monte Carlo analizine devam et (aynı n_runs ve seed)
+  python ajan_tabanli_simulasyon.py --mode monte_carlo --n_runs 10000 --workers 8 --resume
+  
+  # Yıllık yörüngeleri de kaydet (fan grafikleri, yol bağımlı istatistikler)
+  python ajan_tabanli_simulasyon.py --mode monte_carlo --n_runs 1000 --yorunge Karbon_Fiyati Toplam_Emisyon
+  
+  # Uyarlamalı Monte Carlo: 2035 emisyon yüzdelikleri ±1 Mt, fiyat ±2 $/ton hassasiyete
+  # ulaşınca dur (en çok 5000 koşu, 100'lük partiler)
+  python ajan_tabanli_simulasyon.py --mode monte_carlo --n_runs 5000 --hedef_emisyon 1 --hedef_fiyat 2 --parti_boyutu 100
         """
     )
     
@@ -2988,8 +6231,74 @@ if __name__ == "__main__":
     parser.add_argument(
         "--seed", 
         type=int, 
-        default=42,
-        help="Rastgele sayı seed'i (tekrarlanabilirlik için)"
+        default=None,
+        help="Rastgele sayı seed'i (tekrarlanabilirlik için; Monte Carlo varsayılanı: 42, "
+             "tüm senaryolar modunda verilmezse zaman damgasından seçilir)"
+    )
+    
+    parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=1,
+        help="Paralel süreç sayısı: Monte Carlo koşuları veya tüm senaryolar modunda senaryo "
+             "başına bir süreç (varsayılan: 1; sonuçlar işçi sayısından bağımsız)"
+    )
+    
+    parser.add_argument(
+        "--resume", 
+        action="store_true",
+        help="Monte Carlo deposunda tamamlanmış koşuları atlayarak kaldığı yerden devam et"
+    )
+    
+    parser.add_argument(
+        "--mc_dizini", 
+        default=None,
+        help="Monte Carlo sonuç deposu dizini (varsayılan: output/monte_carlo_depo)"
+    )
+    
+    parser.add_argument(
+        "--yorunge", 
+        nargs="*",
+        default=None,
+        metavar="RAPORLAYICI",
+        help="Monte Carlo'da yıllık yörüngeleri kaydet (isim verilmezse: "
+             + ", ".join(MC_RAPORLAYICILARI) + ")"
+    )
+    
+    parser.add_argument(
+        "--hedef_emisyon", 
+        type=float, 
+        default=None,
+        help="Uyarlamalı Monte Carlo: 2035 emisyon yüzdeliklerinin (P5/P50/P95) hedef güven "
+             "aralığı yarı genişliği, Mt (verilirse --n_runs üst bütçe olur)"
+    )
+    
+    parser.add_argument(
+        "--hedef_fiyat", 
+        type=float, 
+        default=None,
+        help="Uyarlamalı Monte Carlo: 2035 karbon fiyatı yüzdeliklerinin hedef güven aralığı "
+             "yarı genişliği, $/ton"
+    )
+    
+    parser.add_argument(
+        "--parti_boyutu", 
+        type=int, 
+        default=None,
+        help="Uyarlamalı Monte Carlo'da hassasiyet kontrolleri arasındaki koşu sayısı "
+             "(varsayılan: min(n_runs, 50))"
+    )
+    
+    parser.add_argument(
+        "--quiet", 
+        action="store_true",
+        help="Yalnızca uyarı ve hataları yazdır (ilerleme ve banner çıktısı kapalı)"
+    )
+    
+    parser.add_argument(
+        "--toplu", 
+        action="store_true",
+        help="Tüm senaryolar modunda senaryoları tek döngüde, ortak rastgele sayılarla çalıştır"
     )
     
     parser.add_argument(
@@ -3001,56 +6310,78 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    print("\n" + "=" * 70)
-    print("🌱 TR-ZERO: AJAN TABANLI KARBON PİYASASI SİMÜLASYONU")
-    print("   Türkiye Emisyon Ticaret Sistemi (2025-2035)")
-    print("   v4.5 - Geliştirilmiş Versiyon")
-    print("=" * 70)
-    print(f"Tarih: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print(f"Mod: {args.mode.upper()}")
-    print("-" * 70)
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="%(message)s")
+    
+    logger.info("\n" + "=" * 70)
+    logger.info("🌱 TR-ZERO: AJAN TABANLI KARBON PİYASASI SİMÜLASYONU")
+    logger.info("   Türkiye Emisyon Ticaret Sistemi (2025-2035)")
+    logger.info("   v4.5 - Geliştirilmiş Versiyon")
+    logger.info("=" * 70)
+    logger.info(f"Tarih: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    logger.info(f"Mod: {args.mode.upper()}")
+    logger.info("-" * 70)
     
     if args.mode == "monte_carlo":
         # ============== MONTE CARLO MODU ==============
-        print(f"\n🎲 Monte Carlo Modu Başlatılıyor...")
-        print(f"   İterasyon sayısı: {args.n_runs}")
-        print(f"   Seed: {args.seed}")
+        logger.info(f"\n🎲 Monte Carlo Modu Başlatılıyor...")
+        logger.info(f"   İterasyon sayısı: {args.n_runs}")
+        if args.seed is None:
+            args.seed = 42
+        logger.info(f"   Seed: {args.seed}")
+        logger.info(f"   Paralel süreç: {args.workers}")
+        if args.resume:
+            logger.info(f"   Devam modu: tamamlanmış koşular atlanacak")
+        hedefler = {
+            degisken: hedef
+            for degisken, hedef in (('final_emission', args.hedef_emisyon),
+                                    ('final_price', args.hedef_fiyat))
+            if hedef is not None
+        }
+        if hedefler:
+            logger.info(f"   Uyarlamalı mod: {args.n_runs} koşu üst bütçe")
         
         df_results, percentiles, stats = monte_carlo_analizi(
             n_runs=args.n_runs, 
-            seed=args.seed
+            seed=args.seed,
+            workers=args.workers,
+            depo_dizini=args.mc_dizini,
+            devam=args.resume,
+            yorunge_degiskenleri=(
+                () if args.yorunge is None else (args.yorunge or MC_RAPORLAYICILARI)
+            ),
+            hedef_yari_genislik=hedefler or None,
+            parti_boyutu=args.parti_boyutu
         )
         
         if df_results is not None:
             monte_carlo_sonuclari_kaydet(df_results, percentiles, stats)
-            print(f"\n✅ Monte Carlo analizi tamamlandı!")
+            logger.info(f"\n✅ Monte Carlo analizi tamamlandı!")
         else:
-            print(f"\n❌ Monte Carlo analizi başarısız!")
+            logger.error(f"\n❌ Monte Carlo analizi başarısız!")
     
     elif args.mode == "single":
         # ============== TEK SENARYO MODU ==============
-        print(f"\n▶ Tek Senaryo Modu: {args.senaryo}")
+        logger.info(f"\n▶ Tek Senaryo Modu: {args.senaryo}")
         
         df = main_senaryo_calistir(args.senaryo, n_yil=args.n_yil)
         
         if df is not None:
-            print(f"\n✅ Senaryo tamamlandı!")
+            logger.info(f"\n✅ Senaryo tamamlandı!")
     
     else:
         # ============== TÜM SENARYOLAR MODU (VARSAYILAN) ==============
-        print(f"\n📊 Tüm Senaryolar Modu")
-        
-        sonuclar = senaryo_karsilastirmasi()
-        
-        # CSV kaydet
-        print("\n📁 CSV dosyaları kaydediliyor...")
-        csv_kaydet(sonuclar)
-    
-    print(f"\n✅ Tüm sonuçlar '{OUTPUT_DIR}' klasörüne kaydedildi.")
-    print("\n🎉 Simülasyon tamamlandı!")
-    print("\n💡 Kullanım İpuçları:")
-    print("   - Dashboard'u çalıştırmak için: streamlit run src/dashboard_v4.py")
-    print("   - Monte Carlo analizi için: python src/ajan_tabanli_simulasyon.py --mode monte_carlo")
-    print("   - Yardım için: python src/ajan_tabanli_simulasyon.py --help")
+        logger.info(f"\n📊 Tüm Senaryolar Modu")
+        
+        # CSV'ler her senaryo tamamlandıkça kaydedilir
+        senaryo_karsilastirmasi(toplu=args.toplu, workers=args.workers,
+                                random_seed=args.seed, kaydet=True)
+    
+    logger.info(f"\n✅ Tüm sonuçlar '{OUTPUT_DIR}' klasörüne kaydedildi.")
+    logger.info("\n🎉 Simülasyon tamamlandı!")
+    logger.info("\n💡 Kullanım İpuçları:")
+    logger.info("   - Dashboard'u çalıştırmak için: streamlit run src/dashboard_v4.py")
+    logger.info("   - Monte Carlo analizi için: python src/ajan_tabanli_simulasyon.py --mode monte_carlo")
+    logger.info("   - Yardım için: python src/ajan_tabanli_simulasyon.py --help")
 
 
@@ -1770,7 +1770,9 @@ with tab4:
                         # Simülasyonu çalıştır
                         result = subprocess.run(
                             [sys.executable, os.path.join(SCRIPT_DIR, "ajan_tabanli_simulasyon.py"),
-                             "--mode", "all"],
+                             "--mode", "all",
+                             # Senaryo başına bir süreç (CSV'ler tamamlandıkça yazılır)
+                             "--workers", str(min(4, os.cpu_count() or 1))],
                             capture_output=True,
                             text=True,
                             cwd=PROJECT_ROOT,
@@ -216,7 +216,44 @@ class EnerjiDispatchModulu:
         self.santraller = self.santraller.sort_values(
             'Marjinal_Maliyet', ascending=True
         ).reset_index(drop=True)
-    
+
+    def karbon_fiyati_guncelle(self, karbon_fiyati: float):
+        """
+        Karbon fiyatını günceller ve merit-order'ı yeniden sıralar.
+
+        Yakıt, emisyon faktörü ve O&M sütunları yakıt tipine bağlı sabitler
+        olduğundan yeniden hesaplanmaz; yalnızca karbon maliyeti ve toplam
+        marjinal maliyet güncellenir (`_hesapla_marjinal_maliyetler` ile
+        aynı değerler).
+
+        Parameters
+        ----------
+        karbon_fiyati : float
+            Yeni karbon fiyatı ($/tCO2)
+        """
+        self.karbon_fiyati = karbon_fiyati
+        self.santraller['Karbon_Maliyet'] = (
+            self.santraller['Emisyon_Faktor'] * karbon_fiyati
+        )
+        self.santraller['Marjinal_Maliyet'] = (
+            self.santraller['Yakit_Maliyet'] +
+            self.santraller['Karbon_Maliyet'] +
+            self.santraller['OM_Maliyet']
+        )
+        self._sirala_merit_order()
+
+    def kopya(self) -> "EnerjiDispatchModulu":
+        """
+        Hazır maliyet tablosuyla bağımsız bir kopya döndürür.
+
+        Marjinal maliyetler yeniden hesaplanmaz; paylaşılan bir şablondan
+        her model için ucuz kopya almak için kullanılır.
+        """
+        yeni = object.__new__(EnerjiDispatchModulu)
+        yeni.__dict__.update(self.__dict__)
+        yeni.santraller = self.santraller.copy()
+        return yeni
+
     def optimize_dispatch(self, talep_mwh: float) -> Dict:
         """
         Verilen talep için optimal üretim karışımını belirle.
@@ -0,0 +1,5 @@
+"""Testler src/ altındaki modülleri doğrudan içe aktarır."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,33 @@
+"""Aynı süreçteki modellerin rastgele sayı akışlarının bağımsızlığı."""
+import pandas as pd
+import pytest
+
+from ajan_tabanli_simulasyon import TurkiyeETSModel
+
+YIL = 11
+
+
+def model_kur(seed, **parametreler):
+    return TurkiyeETSModel(verbose=False, random_seed=seed, **parametreler)
+
+
+@pytest.mark.parametrize("parametreler", [{}, {"vektorel_tesisler": True, "vektorel_haneler": True}])
+def test_ic_ice_adimlanan_modeller_tek_basina_kosuyla_ayni(parametreler):
+    tek = {seed: model_kur(seed, **parametreler).run_simulation(years=YIL) for seed in (1, 2)}
+
+    # İkinci model birinci birkaç yıl ilerledikten sonra kurulur; adımlar sırayla karışır
+    a = model_kur(1, **parametreler)
+    a.datacollector.rezerve(YIL)
+    for _ in range(3):
+        a.step()
+    b = model_kur(2, **parametreler)
+    b.datacollector.rezerve(YIL)
+    for yil in range(YIL):
+        b.step()
+        if yil + 3 < YIL:
+            a.step()
+
+    for seed, model in ((1, a), (2, b)):
+        pd.testing.assert_frame_equal(model.datacollector.get_model_vars_dataframe(), tek[seed],
+                                      check_exact=True)
+    assert not tek[1]["Toplam_Emisyon"].equals(tek[2]["Toplam_Emisyon"])
@@ -0,0 +1,79 @@
+"""Anlık görüntü (snapshot) ve fork: kesintisiz koşuyla aynılık, parametre değişiklikleri."""
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ajan_tabanli_simulasyon import ModelAnlikGoruntusu, TurkiyeETSModel
+
+ISINMA = 3
+YIL = 11
+
+
+def isinmis_model(**parametreler):
+    model = TurkiyeETSModel(verbose=False, random_seed=42, **parametreler)
+    model.run_simulation(years=ISINMA)
+    return model
+
+
+@pytest.mark.parametrize("parametreler", [
+    {}, {"olay_tabanli": False}, {"vektorel_tesisler": True, "vektorel_haneler": True},
+])
+def test_fork_kesintisiz_kosuyla_ayni(parametreler):
+    kesintisiz = TurkiyeETSModel(verbose=False, random_seed=42, **parametreler)
+    beklenen = kesintisiz.run_simulation(years=YIL)
+
+    kopya = isinmis_model(**parametreler).snapshot().fork()
+    sonuc = kopya.run_simulation(years=YIL - ISINMA)
+    pd.testing.assert_frame_equal(sonuc, beklenen, check_exact=True)
+
+
+def test_fork_modeli_degistirmez():
+    model = isinmis_model()
+    model.fork(cap_azalma_orani=0.08).run_simulation(years=2)
+    beklenen = TurkiyeETSModel(verbose=False, random_seed=42).run_simulation(years=YIL)
+    pd.testing.assert_frame_equal(model.run_simulation(years=YIL - ISINMA), beklenen,
+                                  check_exact=True)
+
+
+def test_fork_random_seed_tum_akislari_yeniden_tohumlar():
+    goruntu = isinmis_model().snapshot()
+    kopya = goruntu.fork(random_seed=7)
+
+    assert kopya.random.getstate() == random.Random(7).getstate()
+    assert kopya.rng.bit_generator.state == np.random.default_rng(7).bit_generator.state
+    alt_seedler = np.random.SeedSequence(7).spawn(len(TurkiyeETSModel.AKIS_GRUPLARI))
+    for grup, alt_seed in zip(TurkiyeETSModel.AKIS_GRUPLARI, alt_seedler):
+        assert kopya.akislar[grup].bit_generator.state == \
+            np.random.default_rng(alt_seed).bit_generator.state
+
+    ayni = goruntu.fork(random_seed=7).run_simulation(years=YIL - ISINMA)
+    pd.testing.assert_frame_equal(kopya.run_simulation(years=YIL - ISINMA), ayni,
+                                  check_exact=True)
+    farkli = goruntu.fork(random_seed=8).run_simulation(years=YIL - ISINMA)
+    assert not farkli["Toplam_Emisyon"].equals(ayni["Toplam_Emisyon"])
+
+
+@pytest.mark.parametrize("parametreler, mesaj", [
+    ({"n_enerji": 5}, "değiştirilemeyen"),
+    ({"yok": 1}, "değiştirilemeyen"),
+    ({"ekonomik_omur": 0}, "ekonomik_omur"),
+])
+def test_gecersiz_fork_parametresi_reddedilir(parametreler, mesaj):
+    goruntu = isinmis_model().snapshot()
+    with pytest.raises(ValueError, match=mesaj):
+        goruntu.fork(**parametreler)
+
+
+def test_kaydet_yukle_diskten_ayni_modeli_verir(tmp_path):
+    model = isinmis_model()
+    yol = str(tmp_path / "goruntu.pkl")
+    goruntu = model.snapshot(yol)
+
+    yuklenen = ModelAnlikGoruntusu.yukle(yol)
+    assert yuklenen.yil == goruntu.yil == model.yil
+    assert yuklenen.veri == goruntu.veri
+    pd.testing.assert_frame_equal(yuklenen.fork().run_simulation(years=YIL - ISINMA),
+                                  goruntu.fork().run_simulation(years=YIL - ISINMA),
+                                  check_exact=True)
@@ -0,0 +1,56 @@
+"""Paylaşılan SimulationInputs'un salt okunurluğu ve modeller arası yalıtımı."""
+import pandas as pd
+import pytest
+
+from ajan_tabanli_simulasyon import SimulationInputs, TurkiyeETSModel, tesis_tablosu_yukle
+
+
+@pytest.fixture
+def girdiler():
+    varsayilan = SimulationInputs.varsayilan()
+    return SimulationInputs(
+        baseline=varsayilan.baseline, tesisler=tesis_tablosu_yukle(),
+        dispatch=varsayilan.dispatch.kopya() if varsayilan.dispatch is not None else None,
+        io_model=varsayilan.io_model,
+    )
+
+
+def test_alanlar_yeniden_atanamaz(girdiler):
+    with pytest.raises(AttributeError, match="salt okunur"):
+        girdiler.tesisler = pd.DataFrame()
+    with pytest.raises(AttributeError, match="salt okunur"):
+        girdiler.yeni_alan = 1
+
+
+def test_tablo_ve_diziler_yerinde_yazilamaz(girdiler):
+    tablo = girdiler.tesisler
+    with pytest.raises(ValueError, match="read-only"):
+        tablo.loc[0, "Kapasite_MW"] = 0.0
+    with pytest.raises(ValueError, match="read-only"):
+        tablo.iloc[0, tablo.columns.get_loc("Yillik_Emisyon_tCO2")] = 0.0
+    with pytest.raises(ValueError, match="read-only"):
+        tablo["Kapasite_Faktor"].to_numpy()[0] = 0.0
+    if girdiler.dispatch is not None:
+        with pytest.raises(ValueError, match="read-only"):
+            girdiler.dispatch.santraller.loc[0, "Marjinal_Maliyet"] = 0.0
+    if girdiler.io_model is not None:
+        for dizi in (girdiler.io_model.A, girdiler.io_model.L):
+            with pytest.raises(ValueError, match="read-only"):
+                dizi[0, 0] = 0.0
+
+
+def test_ayni_girdilerden_kurulan_modeller_birbirini_etkilemez(girdiler):
+    tablo = girdiler.tesisler.copy()
+    santraller = girdiler.dispatch.santraller.copy() if girdiler.dispatch is not None else None
+
+    def kosu(seed, **parametreler):
+        model = TurkiyeETSModel(verbose=False, random_seed=seed, girdiler=girdiler,
+                                tesis_kaynagi="tablo", **parametreler)
+        return model.run_simulation(years=11)
+
+    ilk = kosu(1)
+    kosu(2, ab_skdm_fiyat=150, cap_azalma_orani=0.1)
+    pd.testing.assert_frame_equal(kosu(1), ilk, check_exact=True)
+    pd.testing.assert_frame_equal(girdiler.tesisler, tablo, check_exact=True)
+    if santraller is not None:
+        pd.testing.assert_frame_equal(girdiler.dispatch.santraller, santraller, check_exact=True)
@@ -0,0 +1,54 @@
+"""MAC geçiş fiyatı tablosunun (ikili arama) kaba kuvvet önlem döngüsüyle eşdeğerliği."""
+from bisect import bisect_left
+
+import numpy as np
+import pytest
+
+from ajan_tabanli_simulasyon import (
+    ETS_PARAMS, SEKTOR_LISTESI, SEKTOR_PROFILLERI, mac_gecis_tablosu, npv_hesapla,
+)
+
+
+def onlem_npv(onlem, p, r, omur):
+    """EndustriyelTesis._karar_ver'in önlem NPV'si (1 Mt emisyon için)."""
+    yillik_azaltim = onlem["potansiyel"]
+    yatirim = yillik_azaltim * onlem["mac"] * 1e6 if onlem["mac"] > 0 else 0
+    return npv_hesapla(yatirim, yillik_azaltim * p * 1e6, r, omur)
+
+
+def kaba_kuvvet(onlemler, p, r, omur):
+    """Tablodan önceki döngü: mac < p olan önlemlerden NPV'si en büyük (eşitlikte ilk)."""
+    en_iyi, en_iyi_npv = -1, -9999
+    for j, onlem in enumerate(onlemler):
+        if onlem["mac"] >= p:
+            continue
+        npv = onlem_npv(onlem, p, r, omur)
+        if npv > en_iyi_npv:
+            en_iyi, en_iyi_npv = j, npv
+    return en_iyi
+
+
+@pytest.mark.parametrize("r, omur", [(0.08, 10), (0.15, 5), (0.03, 25)])
+@pytest.mark.parametrize("sektor", SEKTOR_LISTESI)
+def test_gecis_tablosu_kaba_kuvvetle_ayni(sektor, r, omur):
+    onlemler = list(SEKTOR_PROFILLERI[sektor].get("mac_onlemler", {}).values())
+    kirilimlar, kazananlar = mac_gecis_tablosu(sektor, r, omur)
+    fiyatlar = np.concatenate((
+        kirilimlar, np.nextafter(kirilimlar, np.inf), np.nextafter(kirilimlar, -np.inf),
+        [ETS_PARAMS["TABAN_FIYAT"], ETS_PARAMS["TAVAN_FIYAT"], 0.0],
+        np.linspace(0, 2 * ETS_PARAMS["TAVAN_FIYAT"], 201),
+    ))
+    # Efektif fiyat negatif olmaz; p < 0'da döngü -9999 altındaki NPV'leri de eler
+    fiyatlar = fiyatlar[fiyatlar >= 0]
+    for p in fiyatlar.tolist():
+        tablo = int(kazananlar[bisect_left(kirilimlar, p)])
+        kaba = kaba_kuvvet(onlemler, p, r, omur)
+        if kaba < 0:
+            assert tablo == -1, p
+            continue
+        # Kesişim kırılımında iki önlemin NPV'si eşittir; seçilen NPV aynı olmalı
+        assert tablo >= 0 and onlemler[tablo]["mac"] < p, p
+        assert onlem_npv(onlemler[tablo], p, r, omur) == pytest.approx(
+            onlem_npv(onlemler[kaba], p, r, omur), rel=1e-9), p
+        if tablo != kaba:
+            assert p in kirilimlar
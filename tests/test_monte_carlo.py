@@ -0,0 +1,142 @@
+"""Monte Carlo çalıştırıcısı ve deposu testleri (paralel, devam, yörüngeler)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import ajan_tabanli_simulasyon as sim
+
+N_RUNS = 8
+
+
+def mc(dizin, **parametreler):
+    parametreler = {"n_runs": N_RUNS, "seed": 7, **parametreler}
+    return sim.monte_carlo_analizi(depo_dizini=str(dizin), **parametreler)
+
+
+def test_kosu_seedi_yalnizca_seed_ve_kosuya_bagli():
+    assert sim.mc_kosu_seed(7, 3) == sim.mc_kosu_seed(7, 3)
+    assert len({sim.mc_kosu_seed(7, run) for run in range(100)}) == 100
+
+
+def test_isci_sayisindan_bagimsiz(tmp_path):
+    sirali, yuzdelik, _ = mc(tmp_path / "sirali", workers=1)
+    paralel, yuzdelik_p, _ = mc(tmp_path / "paralel", workers=2)
+    assert list(sirali["run"]) == list(range(N_RUNS))
+    pd.testing.assert_frame_equal(sirali, paralel, check_exact=True)
+    pd.testing.assert_frame_equal(yuzdelik, yuzdelik_p, check_exact=True)
+
+
+class KosuKesildi(Exception):
+    pass
+
+
+def test_kesilen_kosu_devamla_ayni(tmp_path, monkeypatch):
+    """Parça ortasında kesilip devam eden depo, kesintisiz koşuyla bit düzeyinde aynıdır."""
+    yorunge = ("Toplam_Emisyon", "Karbon_Fiyati")
+    referans, yuzdelik, _ = mc(tmp_path / "referans", yorunge_degiskenleri=yorunge)
+    
+    gercek = sim._mc_parca_calistir
+    cagri = []
+    
+    def ikinciyi_kes(parca, yorunge_degiskenleri=()):
+        cagri.append(parca)
+        if len(cagri) == 2:
+            raise KosuKesildi
+        return gercek(parca, yorunge_degiskenleri)
+    
+    dizin = tmp_path / "devam"
+    monkeypatch.setattr(sim, "_mc_parca_calistir", ikinciyi_kes)
+    with pytest.raises(KosuKesildi):
+        mc(dizin, yorunge_degiskenleri=yorunge)
+    monkeypatch.undo()
+    
+    depo = sim.MonteCarloDeposu(str(dizin), 7, N_RUNS, devam=True, yorunge_degiskenleri=yorunge)
+    assert 0 < len(depo.tamamlanan) < N_RUNS
+    # Manifest'e girmemiş yarım satır (çökme anında) okunurken ayıklanır
+    with open(depo.kosu_yolu, "a", encoding="utf-8") as f:
+        f.write(f"{N_RUNS - 1},123,0.0")
+    
+    devam, yuzdelik_d, _ = mc(dizin, yorunge_degiskenleri=yorunge, devam=True)
+    pd.testing.assert_frame_equal(referans, devam, check_exact=True)
+    pd.testing.assert_frame_equal(yuzdelik, yuzdelik_d, check_exact=True)
+    
+    dizi, meta = sim.mc_yorungeleri_ac(str(dizin))
+    dizi_ref, _ = sim.mc_yorungeleri_ac(str(tmp_path / "referans"))
+    assert meta["tamamlanan"] == list(range(N_RUNS))
+    np.testing.assert_array_equal(dizi, dizi_ref)
+    assert not np.isnan(dizi).any()
+
+
+def test_farkli_parametrelerle_devam_reddedilir(tmp_path):
+    mc(tmp_path)
+    with pytest.raises(ValueError, match="Devam edilemiyor"):
+        mc(tmp_path, seed=8, devam=True)
+
+
+def test_bootstrap_araligi_tahmini_kapsar_ve_daralir():
+    rng = np.random.default_rng(3)
+    kucuk, buyuk = rng.normal(size=50), rng.normal(size=5000)
+    tahmin, alt, ust = sim.bootstrap_yuzdelik_araligi(kucuk, rng=1)
+    np.testing.assert_array_equal(tahmin, np.quantile(kucuk, sim.MC_YUZDELIKLERI))
+    assert (alt <= tahmin).all() and (tahmin <= ust).all()
+    _, alt_b, ust_b = sim.bootstrap_yuzdelik_araligi(buyuk, rng=1)
+    assert ((ust_b - alt_b) < (ust - alt)).all()
+
+
+def uyarlamali(dizin, hedef, **parametreler):
+    df, _, _ = mc(dizin, n_runs=12, parti_boyutu=4,
+                  hedef_yari_genislik={"final_emission": hedef}, **parametreler)
+    return df, df.attrs["uyarlamali"]
+
+
+def test_uyarlamali_durma_kurali(tmp_path):
+    df, butce = uyarlamali(tmp_path / "butce", 0.0)
+    assert butce["durma_nedeni"] == "butce"
+    assert list(df["run"]) == list(range(12))
+    assert [g["n"] for g in butce["gecmis"]] == [4, 8, 12]
+    
+    df, bilgi = uyarlamali(tmp_path / "genis", 1e9)
+    assert bilgi["durma_nedeni"] == "hedef"
+    assert list(df["run"]) == list(range(4))
+    assert len(bilgi["gecmis"]) == 1
+    
+    # Aynı seed'le partiler ve kontroller aynıdır: hedef, bütçe koşusunun
+    # geçmişinde aralığın ilk kez hedefe indiği partide durdurur
+    genislikler = [g["final_emission"] for g in butce["gecmis"]]
+    hedef = genislikler[1]
+    beklenen = next(i for i, g in enumerate(genislikler) if g <= hedef)
+    df, bilgi = uyarlamali(tmp_path / "ara", hedef)
+    assert bilgi["durma_nedeni"] == "hedef"
+    assert bilgi["gecmis"] == butce["gecmis"][:beklenen + 1]
+    assert len(df) == 4 * (beklenen + 1)
+
+
+def test_gecersiz_hedef_degiskeni_reddedilir(tmp_path):
+    with pytest.raises(ValueError, match="Geçersiz hedef"):
+        mc(tmp_path, hedef_yari_genislik={"yok": 1.0})
+
+
+def test_yorunge_ozetleri_bellekteki_diziyle_ayni(tmp_path):
+    degiskenler = ("Toplam_Emisyon", "Karbon_Fiyati")
+    mc(tmp_path, yorunge_degiskenleri=degiskenler)
+    dizi, meta = sim.mc_yorungeleri_ac(str(tmp_path))
+    tam = np.array(dizi, dtype=np.float64)
+    yillar = meta["yillar"]
+    
+    for v, degisken in enumerate(degiskenler):
+        yuzdelik = sim.mc_yorunge_yuzdelikleri(str(tmp_path), degisken, q=(0.1, 0.5, 0.9))
+        np.testing.assert_array_equal(
+            yuzdelik.to_numpy(), np.quantile(tam[:, :, v], (0.1, 0.5, 0.9), axis=0))
+        assert list(yuzdelik.columns) == yillar
+    
+    # Eşik: koşuların yarısının en yüksek emisyonu; bir kısmı hiç ulaşmaz
+    emisyon = tam[:, :, 0]
+    for esik, hic_ulasmayan in ((np.median(emisyon.max(axis=1)), N_RUNS // 2),
+                                (emisyon.max() + 1, N_RUNS), (emisyon.min(), 0)):
+        beklenen = [next((yillar[t] for t in range(len(yillar)) if emisyon[run, t] >= esik), np.nan)
+                    for run in range(N_RUNS)]
+        assert np.isnan(beklenen).sum() == hic_ulasmayan
+        for blok in (3, N_RUNS, 4096):  # blok sınırı koşuların ortasında ve dışında
+            ilk = sim.mc_ilk_esik_yili(str(tmp_path), "Toplam_Emisyon", esik, blok=blok)
+            assert list(ilk.index) == list(range(N_RUNS))
+            np.testing.assert_array_equal(ilk.to_numpy(), beklenen)
@@ -0,0 +1,91 @@
+"""
+Olay tabanlı etkinleştirme (uyuyan tesisler) testleri.
+
+Uyku yalnızca bir performans değişikliğidir: aynı etkinleştirme sırasıyla
+(uyanık kodlar ortak bir permütasyondaki konumlarına göre) koşulan model,
+uykusu kapalı modelle her çıktı sütununda aynı sonucu vermelidir.
+Varsayılan karıştırma yolunda uyuyanlar karıştırmaya girmediğinden seed'li
+sonuçlar değişir; orada uyku ve uyanış kuralları doğrudan denetlenir.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ajan_tabanli_simulasyon import (
+    DURUM_KODLARI, SLOT_AJAN, SLOT_TESIS, TEMIZ, EndustriyelTesis, TurkiyeETSModel,
+)
+
+YIL = 11
+
+
+def sabit_sirali_kosu(olay_tabanli, sira_seed=99, **parametreler):
+    """Her tikte aynı ortak permütasyonla (TopluSenaryoModeli gibi) koşar."""
+    model = TurkiyeETSModel(verbose=False, olay_tabanli=olay_tabanli,
+                            toplam_kontrolu=True, **parametreler)
+    rng = np.random.default_rng(sira_seed)
+    model.datacollector.rezerve(YIL)
+    for _ in range(YIL):
+        model._ortak_sira = rng.permutation(len(model._adim_sirasi))
+        model.step()
+    model._ortak_sira = None
+    return model, model.datacollector.get_model_vars_dataframe()
+
+
+@pytest.mark.parametrize("vektorel", [False, True])
+@pytest.mark.parametrize("seed", [0, 3])
+def test_uyku_kapali_kosuyla_ayni(seed, vektorel):
+    model, uyku = sabit_sirali_kosu(True, random_seed=seed, vektorel_tesisler=vektorel)
+    _, uyanik = sabit_sirali_kosu(False, random_seed=seed, vektorel_tesisler=vektorel)
+    assert model._uyuyan_sayisi > 0
+    assert uyku["CBAM_Toplam_Maliyet"].iloc[-1] > 0
+    pd.testing.assert_frame_equal(uyku, uyanik, check_exact=True)
+
+
+@pytest.mark.parametrize("mekanizma", ["emir_defteri", "denge"])
+def test_uyku_piyasa_mekanizmalarinda_ayni(mekanizma):
+    _, uyku = sabit_sirali_kosu(True, random_seed=1, piyasa_mekanizmasi=mekanizma)
+    _, uyanik = sabit_sirali_kosu(False, random_seed=1, piyasa_mekanizmasi=mekanizma)
+    pd.testing.assert_frame_equal(uyku, uyanik, check_exact=True)
+
+
+
+def tesis_kodlari(model):
+    """Adım kodu → (son adım yılı, durum kodu) okuyucusu; karıştırma yoluyla aynı kodlar."""
+    okuyucular = {}
+    for kod in model._adim_sirasi:
+        tur, satir = kod % 3, kod // 3
+        if tur == SLOT_TESIS:
+            td = model.tesis_dizisi
+            okuyucular[kod] = lambda i=satir: (int(td.son_adim_yili[i]), int(td.durum[i]))
+        elif tur == SLOT_AJAN and isinstance(model._sira_ajanlari[satir], EndustriyelTesis):
+            a = model._sira_ajanlari[satir]
+            okuyucular[kod] = lambda a=a: (a._son_adim_yili, DURUM_KODLARI.index(a.durum))
+    return okuyucular
+
+
+@pytest.mark.parametrize("vektorel", [False, True])
+def test_karistirma_yolunda_uyuyanlar_calismaz_uyanislar_zamaninda(vektorel):
+    """Varsayılan yol: uyuyan tesis adım atmaz; kuyruktaki tesis tamamlanma yılında uyanır."""
+    model = TurkiyeETSModel(verbose=False, random_seed=42, vektorel_tesisler=vektorel)
+    okuyucular = tesis_kodlari(model)
+    toplam_uyuyan = toplam_uyanan = 0
+    for _ in range(YIL):
+        yil = model.yil
+        uyuyan = {kod for kod in okuyucular
+                  if kod < len(model._uyuyan) and model._uyuyan[kod]}
+        uyanacak = {kod for olay_yili, kodlar in model._uyanis_olaylari if olay_yili <= yil
+                    for kod in kodlar}
+        assert uyanacak <= uyuyan
+        model.step()
+        for kod, oku in okuyucular.items():
+            son_adim, durum = oku()
+            if kod in uyanacak:
+                # Tamamlanma yılında adım atar ve Temiz olur
+                assert son_adim == yil and durum == TEMIZ
+            elif kod in uyuyan:
+                assert son_adim < yil
+            else:
+                assert son_adim == yil
+        toplam_uyuyan += len(uyuyan - uyanacak)
+        toplam_uyanan += len(uyanacak)
+    assert toplam_uyuyan > 0 and toplam_uyanan > 0
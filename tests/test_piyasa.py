@@ -0,0 +1,226 @@
+"""Piyasa temizleme fonksiyonlarının değişmezleri (rastgele emir defterleri)."""
+import numpy as np
+import pytest
+
+from ajan_tabanli_simulasyon import (
+    ETS_PARAMS, YANIT_ALANLARI, EmisyonYaniti, TurkiyeETSModel,
+    birincil_acik_artirma, cift_acik_artirma, denge_fiyati,
+)
+
+SEEDLER = range(25)
+
+
+def rastgele_defter(rng, n_alis, n_satis):
+    """Eşit limitler de çıkması için tam sayı fiyatlı emirler."""
+    return (rng.integers(10, 60, n_alis).astype(float), rng.uniform(0.1, 5.0, n_alis),
+            rng.integers(10, 60, n_satis).astype(float), rng.uniform(0.1, 5.0, n_satis))
+
+
+@pytest.mark.parametrize("seed", SEEDLER)
+def test_cift_acik_artirma_degismezleri(seed):
+    rng = np.random.default_rng(seed)
+    alis_fiyat, alis_miktar, satis_fiyat, satis_miktar = rastgele_defter(
+        rng, rng.integers(1, 40), rng.integers(1, 40))
+    fiyat, hacim, alis_dolum, satis_dolum = cift_acik_artirma(
+        alis_fiyat, alis_miktar, satis_fiyat, satis_miktar)
+    
+    # Hacim, tüm limit fiyatlarında min(talep, arz)'ın en büyüğüdür
+    adaylar = np.unique(np.concatenate((alis_fiyat, satis_fiyat)))
+    en_buyuk = max(min(alis_miktar[alis_fiyat >= p].sum(), satis_miktar[satis_fiyat <= p].sum())
+                   for p in adaylar)
+    assert hacim == pytest.approx(en_buyuk)
+    if en_buyuk == 0:
+        assert fiyat is None
+        return
+    
+    # Dolumlar dengeli ve emir miktarıyla sınırlı
+    assert alis_dolum.sum() == pytest.approx(hacim)
+    assert satis_dolum.sum() == pytest.approx(hacim)
+    assert (alis_dolum >= 0).all() and (alis_dolum <= alis_miktar + 1e-12).all()
+    assert (satis_dolum >= 0).all() and (satis_dolum <= satis_miktar + 1e-12).all()
+    
+    # Bireysel rasyonellik: kimse limitinden kötü fiyatla işlem yapmaz
+    assert (alis_fiyat[alis_dolum > 0] >= fiyat).all()
+    assert (satis_fiyat[satis_dolum > 0] <= fiyat).all()
+    
+    # Fiyat önceliği: tam dolmayan alıştan yüksek limitli alışlar tam dolar
+    eksik_alis = alis_dolum < alis_miktar - 1e-12
+    if eksik_alis.any():
+        ustte = alis_fiyat > alis_fiyat[eksik_alis].max()
+        np.testing.assert_allclose(alis_dolum[ustte], alis_miktar[ustte])
+    eksik_satis = satis_dolum < satis_miktar - 1e-12
+    if eksik_satis.any():
+        altta = satis_fiyat < satis_fiyat[eksik_satis].min()
+        np.testing.assert_allclose(satis_dolum[altta], satis_miktar[altta])
+
+
+def test_cift_acik_artirma_kesisme_yoksa_islem_yok():
+    fiyat, hacim, alis_dolum, satis_dolum = cift_acik_artirma(
+        np.array([20.0, 25.0]), np.ones(2), np.array([30.0]), np.ones(1))
+    assert fiyat is None and hacim == 0.0
+    assert not alis_dolum.any() and not satis_dolum.any()
+
+
+def test_cift_acik_artirma_fazla_arzda_marjinal_satici_fiyati():
+    fiyat, hacim, _, satis_dolum = cift_acik_artirma(
+        np.array([50.0]), np.array([1.0]), np.array([10.0, 20.0]), np.array([0.5, 2.0]))
+    assert hacim == pytest.approx(1.0)
+    assert fiyat == pytest.approx(20.0)  # kısmen dolan satıcı aralığın iki ucunda
+    np.testing.assert_allclose(satis_dolum, [0.5, 0.5])
+
+
+@pytest.mark.parametrize("seed", SEEDLER)
+def test_birincil_acik_artirma_degismezleri(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 50))
+    teklif_fiyat = rng.integers(10, 60, n).astype(float)
+    teklif_miktar = rng.uniform(0.1, 5.0, n)
+    rezerv = 20.0
+    arz = float(rng.uniform(0.5, 1.2) * teklif_miktar.sum())
+    fiyat, dolum = birincil_acik_artirma(teklif_fiyat, teklif_miktar, arz, rezerv)
+    
+    gecerli = teklif_fiyat >= rezerv
+    if not gecerli.any():
+        assert fiyat is None and not dolum.any()
+        return
+    assert fiyat >= rezerv
+    assert not dolum[~gecerli].any()
+    assert (dolum <= teklif_miktar + 1e-12).all()
+    # Satılan = min(arz, geçerli talep); fazlası iptal edilir
+    assert dolum.sum() == pytest.approx(min(arz, teklif_miktar[gecerli].sum()))
+    # Fiyatın üstü tam, altı hiç dolmaz; fiyattakiler aynı oranda dolar
+    np.testing.assert_allclose(dolum[teklif_fiyat > fiyat], teklif_miktar[teklif_fiyat > fiyat])
+    assert not dolum[teklif_fiyat < fiyat].any()
+    esit = teklif_fiyat == fiyat
+    oran = dolum[esit] / teklif_miktar[esit]
+    np.testing.assert_allclose(oran, oran[0])
+    if teklif_miktar[gecerli].sum() < arz:
+        assert fiyat == teklif_fiyat[gecerli].min()
+
+
+def test_birincil_acik_artirma_tek_fiyat():
+    fiyat, dolum = birincil_acik_artirma(
+        np.array([40.0, 30.0, 30.0, 15.0]), np.array([1.0, 1.0, 3.0, 5.0]), 3.0, 20.0)
+    assert fiyat == 30.0
+    np.testing.assert_allclose(dolum, [1.0, 0.5, 1.5, 0.0])
+
+
+def basamakli_yanit(rng):
+    """Azalan basamak fonksiyonu E(p) (MAC eşiklerindeki sıçramalar gibi)."""
+    esikler = np.sort(rng.uniform(20, 150, 6))
+    dususler = rng.uniform(1, 10, 6)
+    return lambda p: 100.0 - float(dususler[esikler <= p].sum())
+
+
+@pytest.mark.parametrize("seed", SEEDLER)
+def test_denge_fiyati_en_dusuk_uygun_fiyat(seed):
+    rng = np.random.default_rng(seed)
+    yanit = basamakli_yanit(rng)
+    taban, tavan = 20.0, 150.0
+    cap = float(rng.uniform(yanit(tavan) - 2, yanit(taban) + 2))
+    fiyat = denge_fiyati(yanit, cap, taban, tavan)
+    assert taban <= fiyat <= tavan
+    if yanit(taban) <= cap:
+        assert fiyat == taban
+    elif yanit(tavan) > cap:
+        assert fiyat == tavan
+    else:
+        adim = (tavan - taban) * 2.0 ** -30
+        assert yanit(fiyat) <= cap
+        assert yanit(fiyat - adim) > cap
+
+
+def tesis_tepkisi(model, fiyat):
+    """Her açık tesis için _karar_ver kuralının fiyat p'deki emisyon sonucu (tam tarama)."""
+    toplam = 0.0
+    for a in model.kayit.tesisler():
+        if a.durum == "Kapali":
+            continue
+        if a.durum == "Temiz":
+            toplam += a.emisyon
+            continue
+        if a.durum == "Donusum":
+            toplam += a.emisyon * (1 - a.emisyon_azalma_potansiyeli)
+            continue
+        efektif = max(fiyat, model.ab_skdm_fiyat) if a.ihracatci and a.profil["skdm_kapsam"] else fiyat
+        a._yatirim_onlemi_kaydet = None
+        karar = a._karar_ver(efektif)
+        if karar == "kapat":
+            continue
+        if karar == "yatirim":
+            onlem = (a._yatirim_onlemi_kaydet[1] if a._yatirim_onlemi_kaydet else next(
+                (o for o in a.profil["mac_onlemler"].values() if o["mac"] < efektif), None))
+            toplam += a.emisyon * (1 - (onlem["potansiyel"] if onlem else 0.20))
+        else:
+            toplam += a.emisyon
+    return toplam
+
+
+@pytest.mark.parametrize("seed", [2, 8])
+def test_emisyon_yaniti_karar_kuraliyla_ayni(seed):
+    model = TurkiyeETSModel(verbose=False, random_seed=seed, n_ihracatci=20)
+    model.run_simulation(years=1)
+    _, alanlar = model.tesis_alanlari(YANIT_ALANLARI)
+    yanit = EmisyonYaniti(alanlar, model.ab_skdm_fiyat, model.tesvik_miktari,
+                          model.iskonto_orani, model.ekonomik_omur)
+    assert yanit(ETS_PARAMS["TAVAN_FIYAT"]) < yanit(ETS_PARAMS["TABAN_FIYAT"])
+    for fiyat in np.linspace(ETS_PARAMS["TABAN_FIYAT"], ETS_PARAMS["TAVAN_FIYAT"], 23):
+        assert yanit(fiyat) == pytest.approx(tesis_tepkisi(model, fiyat), rel=1e-12)
+
+
+def test_denge_modu_fiyati_cap_ile_tutarli():
+    model = TurkiyeETSModel(verbose=False, random_seed=5, piyasa_mekanizmasi="denge")
+    df = model.run_simulation(years=11)
+    taban, tavan = ETS_PARAMS["TABAN_FIYAT"], ETS_PARAMS["TAVAN_FIYAT"]
+    etkin = df["Yil"] >= ETS_PARAMS["PILOT_BASLANGIC"] + 1
+    assert df.loc[etkin, "Karbon_Fiyati"].between(taban, tavan).all()
+
+
+def bankala(model, secim):
+    """Seçili açık tesislerin bu yılki adımının bankalama kısmı (operatörden önce adım)."""
+    yil = model.yil
+    if model.tesis_dizisi is None:
+        tesisler = [a for a in model.kayit.tesisler() if a.durum != "Kapali"]
+        for a in np.asarray(tesisler, dtype=object)[secim]:
+            a._uykuyu_yakala()
+            a._bankala(yil)
+    else:
+        td = model.tesis_dizisi
+        idx = np.flatnonzero(td.acik())[secim]
+        td._uykuyu_yakala(idx, yil)
+        td._bankala(idx, yil)
+
+
+@pytest.mark.parametrize("vektorel", [False, True])
+@pytest.mark.parametrize("yillar", [3, 6])  # tam uygulamanın ilk yılı ve sonrası
+def test_emir_defteri_operatorun_sirasindan_bagimsiz(vektorel, yillar):
+    """Tesislerin bir kısmı operatörden önce bankalamış olsa da temizleme ve yıl sonu aynıdır."""
+    model = TurkiyeETSModel(verbose=False, random_seed=5, piyasa_mekanizmasi="emir_defteri",
+                            vektorel_tesisler=vektorel)
+    model.run_simulation(years=yillar)
+    # İkincil piyasada satıcı olsun diye her beşinci tesise bir yıllık emisyonu kadar izin
+    satirlar, alanlar = model.tesis_alanlari(("emisyon",))
+    ek = np.where(np.arange(len(satirlar)) % 5 == 0, alanlar["emisyon"], 0.0)
+    model.izin_transferi(satirlar, ek)
+    goruntu = model.snapshot()
+    
+    sonuclar = []
+    for pay in (0.0, 0.5, 1.0):
+        kopya = goruntu.fork()
+        n = np.count_nonzero(kopya.tesis_alanlari(("durum",))[1]["durum"] != 3)
+        once = np.random.default_rng(1).random(n) < pay
+        bankala(kopya, once)
+        operator = kopya.piyasa_operatoru
+        fiyat = operator._emir_defteri_temizle()
+        bankala(kopya, ~once)
+        _, alanlar = kopya.tesis_alanlari(("izin_bankasi", "net_emisyon"))
+        sonuclar.append((fiyat, operator.islem_hacmi, operator.acik_artirma_geliri, alanlar))
+    
+    (fiyat, hacim, gelir, alanlar), *digerleri = sonuclar
+    assert gelir > 0 and hacim > 0
+    for f, h, g, a in digerleri:
+        assert f == pytest.approx(fiyat, rel=1e-12)
+        assert h == pytest.approx(hacim, rel=1e-12)
+        assert g == pytest.approx(gelir, rel=1e-12)
+        for ad in alanlar:
+            np.testing.assert_allclose(a[ad], alanlar[ad], rtol=1e-12, atol=1e-12)
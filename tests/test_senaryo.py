@@ -0,0 +1,70 @@
+"""Senaryo karşılaştırması: paralel koşular ve toplu (ortak rastgele sayılı) motor."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import ajan_tabanli_simulasyon as sim
+
+SENARYOLAR = {ad: {**p, "senaryo_tipi": ad} for ad, p in sim.SENARYO_KONFIG.items()
+              if ad != "Yumusak_ETS"}
+
+TESIS_ALANLARI = ("sektor_kodu", "il_kodu", "ihracatci", "emisyon", "durum")
+
+
+def test_paralel_senaryolar_sirali_ile_ayni():
+    sirali = dict(sim._senaryolari_calistir(SENARYOLAR, random_seed=11, workers=1))
+    paralel = dict(sim._senaryolari_calistir(SENARYOLAR, random_seed=11, workers=2))
+    assert list(sirali) == list(SENARYOLAR)
+    assert set(paralel) == set(SENARYOLAR)
+    for ad in SENARYOLAR:
+        pd.testing.assert_frame_equal(sirali[ad], paralel[ad], check_exact=True)
+
+
+def baslangic_durumu(model):
+    _, tesisler = model.tesis_alanlari(TESIS_ALANLARI)
+    il_kodu, emisyon = model._hane_emisyonlari()
+    akislar = {grup: akis.bit_generator.state for grup, akis in model.akislar.items()}
+    return tesisler, (il_kodu, emisyon), akislar, model.random.getstate()
+
+
+@pytest.mark.parametrize("vektorel", [False, True])
+def test_toplu_senaryolar_ayni_nufusla_baslar(vektorel):
+    toplu = sim.TopluSenaryoModeli(random_seed=3, verbose=False, vektorel_tesisler=vektorel)
+    assert list(toplu.modeller) == list(sim.SENARYO_KONFIG)
+    for ad, model in toplu.modeller.items():
+        assert model.senaryo_tipi == ad
+
+    tek = sim.TurkiyeETSModel(random_seed=3, verbose=False, vektorel_tesisler=vektorel)
+    (tesisler, haneler, akislar, mesa), *digerleri = [
+        baslangic_durumu(m) for m in [tek, *toplu.modeller.values()]
+    ]
+    for t, h, a, m in digerleri:
+        for ad in TESIS_ALANLARI:
+            np.testing.assert_array_equal(t[ad], tesisler[ad])
+        np.testing.assert_array_equal(h[0], haneler[0])
+        np.testing.assert_array_equal(h[1], haneler[1])
+        assert a == akislar
+        assert m == mesa
+
+
+def test_tek_senaryolu_toplu_tek_basina_kosuyla_ayni_dagilimda():
+    """Yalnızca karıştırma akışı farklıdır: seed'ler üzerinden ortalamalar örtüşür."""
+    senaryo = {"Siki_ETS": SENARYOLAR["Siki_ETS"]}
+    parametreler = {k: v for k, v in senaryo["Siki_ETS"].items()
+                    if k in sim.TopluSenaryoModeli.SENARYO_EKSENI}
+    toplu, tek = [], []
+    for seed in range(16):
+        df = sim.TopluSenaryoModeli(senaryo, random_seed=seed, verbose=False).run_simulation(11)
+        toplu.append(df["Siki_ETS"]["Toplam_Emisyon"].iloc[-1])
+        model = sim.TurkiyeETSModel(random_seed=seed, verbose=False, **parametreler)
+        tek.append(model.run_simulation(years=11)["Toplam_Emisyon"].iloc[-1])
+    toplu, tek = np.array(toplu), np.array(tek)
+    assert not np.array_equal(toplu, tek)
+    standart_hata = np.sqrt(toplu.var(ddof=1) / len(toplu) + tek.var(ddof=1) / len(tek))
+    assert abs(toplu.mean() - tek.mean()) < 3 * standart_hata
+
+
+@pytest.mark.parametrize("ad", sim.TopluSenaryoModeli.SENARYO_EKSENI)
+def test_senaryo_ekseni_ortak_verilemez(ad):
+    with pytest.raises(ValueError, match="ortak verilemez"):
+        sim.TopluSenaryoModeli(random_seed=1, verbose=False, **{ad: 1})
@@ -0,0 +1,52 @@
+"""tesis_kaynagi="tablo" (tesisler tablosundan tesis ajanları) testleri."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ajan_tabanli_simulasyon import (
+    SEKTOR_KODLARI, TurkiyeETSModel, tesis_sutunlari, tesis_tablosu_yukle,
+    tesis_tablosunu_genislet,
+)
+from yardimci import sonuclar_yakin
+
+
+def tablo_kosusu(**parametreler):
+    model = TurkiyeETSModel(verbose=False, tesis_kaynagi="tablo", toplam_kontrolu=True,
+                            **parametreler)
+    return model, model.run_simulation(years=11)
+
+
+@pytest.mark.parametrize("vektorel", [False, True])
+def test_ihracatci_satirlar_cbam_tasir(vektorel):
+    model, df = tablo_kosusu(random_seed=3, ab_skdm_fiyat=90, vektorel_tesisler=vektorel)
+    assert (df["Ihracatci_Tesis"] > 0).all()
+    assert df["CBAM_Toplam_Maliyet"].iloc[-1] > 0
+    # n_ihracatci tablo modunda kullanılmaz
+    _, df_n = tablo_kosusu(random_seed=3, ab_skdm_fiyat=90, vektorel_tesisler=vektorel,
+                           n_ihracatci=0)
+    pd.testing.assert_frame_equal(df, df_n)
+
+
+def test_nesne_ve_vektorel_ayni():
+    _, nesne = tablo_kosusu(random_seed=5)
+    _, vektorel = tablo_kosusu(random_seed=5, vektorel_tesisler=True)
+    sonuclar_yakin(nesne, vektorel)
+
+
+def test_genislet_ozgun_satirlari_korur():
+    tablo = tesis_tablosu_yukle()
+    genis = tesis_tablosunu_genislet(tablo, 3 * len(tablo), seed=1)
+    assert len(genis) == 3 * len(tablo)
+    pd.testing.assert_frame_equal(genis.iloc[:len(tablo)], tablo, check_dtype=False)
+    assert genis["Tesis_ID"].is_unique
+    veri = tesis_sutunlari(genis)
+    assert np.isin(veri["sektor_kodu"], list(SEKTOR_KODLARI.values())).all()
+    assert (veri["emisyon"] > 0).all()
+
+
+def test_genislet_sifir_kapasite_faktorunde_sonlu():
+    tablo = tesis_tablosu_yukle().iloc[:4].copy()
+    tablo["Kapasite_Faktor"] = [0.0, 0.5, 0.0, 0.8]
+    genis = tesis_tablosunu_genislet(tablo, 40, seed=2)
+    assert np.isfinite(genis["Yillik_Emisyon_tCO2"]).all()
+    assert np.isfinite(genis["Kapasite_Faktor"]).all()
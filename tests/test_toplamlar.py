@@ -0,0 +1,41 @@
+"""Artımlı emisyon/durum toplamları (EmisyonToplamlari) testleri."""
+import pytest
+
+from ajan_tabanli_simulasyon import TurkiyeETSModel
+
+MODLAR = [
+    {},
+    {"vektorel_tesisler": True},
+    {"vektorel_haneler": True},
+    {"vektorel_tesisler": True, "vektorel_haneler": True, "alt_adim_sayisi": 12},
+    {"piyasa_mekanizmasi": "emir_defteri"},
+    {"tesis_kaynagi": "tablo", "vektorel_tesisler": True},
+]
+
+
+@pytest.mark.parametrize("parametreler", MODLAR)
+def test_her_adimda_tam_taramayla_ayni(parametreler):
+    """toplam_kontrolu=True her tikten sonra toplamlari_dogrula çağırır."""
+    model = TurkiyeETSModel(verbose=False, random_seed=11, toplam_kontrolu=True,
+                            **parametreler)
+    model.run_simulation(years=11)
+    assert model.toplamlari_dogrula()
+    assert model.toplamlar.durum_sayisi("Temiz") > 0
+
+
+@pytest.mark.parametrize("bozulma", [
+    lambda t: setattr(t, "cbam_maliyeti", t.cbam_maliyeti + 1.0),
+    lambda t: setattr(t, "hane_emisyon", t.hane_emisyon + 1.0),
+    lambda t: t.durum_sayilari.__setitem__("Temiz", t.durum_sayilari["Temiz"] + 1),
+    lambda t: t._il_emisyon.__setitem__(0, t._il_emisyon[0] + 1.0),
+    lambda t: t._sektor_emisyon.__setitem__(1, t._sektor_emisyon[1] + 1.0),
+])
+@pytest.mark.parametrize("vektorel", [False, True])
+def test_uyusmazlik_yakalanir(bozulma, vektorel):
+    model = TurkiyeETSModel(verbose=False, random_seed=11, vektorel_tesisler=vektorel)
+    model.run_simulation(years=6)
+    assert model.toplamlari_dogrula()
+    bozulma(model.toplamlar)
+    model.toplamlar._surum += 1  # il_emisyon önbelleğini geçersiz kıl
+    with pytest.raises(RuntimeError, match="uyuşmuyor"):
+        model.toplamlari_dogrula()
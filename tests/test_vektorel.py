@@ -0,0 +1,32 @@
+"""Vektörel tesis/hane motorlarının nesne moduyla eşdeğerliği."""
+import pytest
+
+from ajan_tabanli_simulasyon import TurkiyeETSModel
+from yardimci import sonuclar_yakin
+
+
+def kosu(**parametreler):
+    model = TurkiyeETSModel(verbose=False, **parametreler)
+    return model.run_simulation(years=11)
+
+
+@pytest.mark.parametrize("seed", [1, 42])
+@pytest.mark.parametrize("vektorel", [
+    {"vektorel_tesisler": True},
+    {"vektorel_haneler": True},
+    {"vektorel_tesisler": True, "vektorel_haneler": True},
+])
+def test_nesne_moduyla_ayni(seed, vektorel):
+    sonuclar_yakin(kosu(random_seed=seed), kosu(random_seed=seed, **vektorel))
+
+
+@pytest.mark.parametrize("mekanizma", ["emir_defteri", "denge"])
+def test_piyasa_mekanizmalarinda_nesne_moduyla_ayni(mekanizma):
+    sonuclar_yakin(kosu(random_seed=4, piyasa_mekanizmasi=mekanizma),
+                   kosu(random_seed=4, piyasa_mekanizmasi=mekanizma, vektorel_tesisler=True))
+
+
+def test_yil_ici_tiklerde_nesne_moduyla_ayni():
+    sonuclar_yakin(kosu(random_seed=9, alt_adim_sayisi=12),
+                   kosu(random_seed=9, alt_adim_sayisi=12,
+                        vektorel_tesisler=True, vektorel_haneler=True))
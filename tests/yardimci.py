@@ -0,0 +1,22 @@
+"""Testlerde ortak karşılaştırma yardımcıları."""
+import json
+
+import numpy as np
+import pandas as pd
+
+JSON_SUTUNLARI = ("Il_Emisyonlari_JSON",)
+
+
+def sonuclar_yakin(a, b, rtol=1e-9, atol=1e-9):
+    """
+    İki model çıktısını toplama sırası farkı (kayan nokta yuvarlama)
+    toleransıyla karşılaştırır; JSON sütunları çözülerek karşılaştırılır.
+    """
+    json_sutunlari = [s for s in JSON_SUTUNLARI if s in a.columns]
+    pd.testing.assert_frame_equal(a.drop(columns=json_sutunlari), b.drop(columns=json_sutunlari),
+                                  check_exact=False, rtol=rtol, atol=atol)
+    for sutun in json_sutunlari:
+        for x, y in zip(a[sutun], b[sutun]):
+            x, y = json.loads(x), json.loads(y)
+            assert list(x) == list(y)
+            np.testing.assert_allclose(list(x.values()), list(y.values()), rtol=rtol, atol=atol)